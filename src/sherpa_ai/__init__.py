@@ -1 +1,5 @@
+from sherpa_ai.resources import warmup
+
 __version__ = "0.1.0"
+
+__all__ = ["warmup"]
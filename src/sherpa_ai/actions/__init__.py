@@ -20,13 +20,31 @@ Example:
     >>> # Use the actions as needed
 """
 
-from sherpa_ai.actions.arxiv_search import ArxivSearch
-from sherpa_ai.actions.deliberation import Deliberation
-from sherpa_ai.actions.empty import EmptyAction
-from sherpa_ai.actions.google_search import GoogleSearch
-from sherpa_ai.actions.mock import MockAction
-from sherpa_ai.actions.planning import TaskPlanning
-from sherpa_ai.actions.synthesize import SynthesizeOutput
+from typing import TYPE_CHECKING
+
+from sherpa_ai.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from sherpa_ai.actions.arxiv_search import ArxivSearch
+    from sherpa_ai.actions.deliberation import Deliberation
+    from sherpa_ai.actions.empty import EmptyAction
+    from sherpa_ai.actions.google_search import GoogleSearch
+    from sherpa_ai.actions.mock import MockAction
+    from sherpa_ai.actions.planning import TaskPlanning
+    from sherpa_ai.actions.synthesize import SynthesizeOutput
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ArxivSearch": "sherpa_ai.actions.arxiv_search",
+        "Deliberation": "sherpa_ai.actions.deliberation",
+        "EmptyAction": "sherpa_ai.actions.empty",
+        "GoogleSearch": "sherpa_ai.actions.google_search",
+        "MockAction": "sherpa_ai.actions.mock",
+        "TaskPlanning": "sherpa_ai.actions.planning",
+        "SynthesizeOutput": "sherpa_ai.actions.synthesize",
+    },
+)
 
 __all__ = [
     "Deliberation",
@@ -6,11 +6,14 @@ from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
 
 import numpy as np
-from nltk import tokenize
+from loguru import logger
 from numpy.typing import ArrayLike
 from pydantic import BaseModel
 from langchain_core.language_models.base import BaseLanguageModel
 
+from sherpa_ai.resources import ensure_punkt
+from sherpa_ai.utils import json_from_text
+
 
 SEARCH_SUMMARY_DESCRIPTION = """Question：{question} 
 Relevant Answer:
@@ -28,6 +31,22 @@ Potential relevant sentences to the question:
 Review answer and return only bullet point number which are related to the question, separated by comma. E,g. 2,3,4
 """
 
+SEARCH_SUMMARY_DESCRIPTION_MULTI = """Question：{question}
+Relevant Answers:
+{answers}
+
+
+Review each numbered relevant answer and extract its most relevant sentences.
+Need to follows rules:
+1. The output sentences should only picked from the original relevant answer.
+2. Use 'not relevant.' for a relevant answer that is not relevant to the question asked.
+3. Return a JSON object mapping the number of each relevant answer to its output, e.g. {{"1": "...", "2": "not relevant."}}"""
+
+
+def _response_text(response: Any) -> str:
+    # Chat models return a message object; completion models return a str.
+    return response if isinstance(response, str) else response.text
+
 
 class BaseRefinement(ABC, BaseModel):
     """Abstract base class for refinement actions.
@@ -39,26 +58,57 @@ class BaseRefinement(ABC, BaseModel):
         llm (Any): Language model used for refinement.
         description (str): Description of the refinement action.
         k (int): Number of results to return.
+        max_concurrency (int): Maximum number of LLM calls made at the same time.
+        single_call (bool): Whether to refine all documents with one LLM call.
     
     Example:
         >>> from sherpa_ai.actions.utils import RefinementByQuery
         >>> refinement = RefinementByQuery(llm=my_llm)
         >>> results = refinement.refinement(documents, query)
     """
+    max_concurrency: int = 5
+    single_call: bool = False
+
     @abstractmethod
     def refinement(self, documents: list[str], **kwargs) -> str:
         pass
 
+    async def arefinement(self, documents: list[str], **kwargs) -> list[str]:
+        """Asynchronously refine the documents.
+
+        Args:
+            documents (list[str]): The documents to refine.
+            **kwargs: Arguments of :meth:`refinement`.
+
+        Returns:
+            list[str]: The refined documents.
+        """
+        return self.refinement(documents, **kwargs)
+
+    def _batch(self, prompts: list[str]) -> list[str]:
+        responses = self.llm.batch(
+            prompts, config={"max_concurrency": self.max_concurrency}
+        )
+        return [_response_text(response) for response in responses]
+
+    async def _abatch(self, prompts: list[str]) -> list[str]:
+        responses = await self.llm.abatch(
+            prompts, config={"max_concurrency": self.max_concurrency}
+        )
+        return [_response_text(response) for response in responses]
+
 
 class RefinementByQuery(BaseRefinement):
     """Refinement action that refines search results based on a query.
     
     This class provides a refinement action that refines search results based on a query.
     It uses an LLM to refine the search results and return the most relevant sentences.
+    Documents are refined concurrently, or all in one prompt if ``single_call`` is set.
     
     Attributes:
         llm (Any): Language model used for refinement.
         description (str): Description of the refinement action.
+        multi_description (str): Prompt used to refine all documents in one call.
         k (int): Number of results to return.
     
     Example:
@@ -68,6 +118,7 @@ class RefinementByQuery(BaseRefinement):
     """
     llm: Optional[BaseLanguageModel] = None 
     description: str = SEARCH_SUMMARY_DESCRIPTION
+    multi_description: str = SEARCH_SUMMARY_DESCRIPTION_MULTI
     k: int = 3
 
     def refinement(self, documents: list[str], query: str) -> list[str]:
@@ -83,14 +134,60 @@ class RefinementByQuery(BaseRefinement):
         Raises:
             SherpaActionExecutionException: If the action fails to execute.
         """
-        refined_result = []
-        for doc in documents:
-            res = self.llm.invoke(
-                self.description.format(question=query, answer=doc, k=self.k)
+        if self.single_call and len(documents) > 1:
+            response = _response_text(
+                self.llm.invoke(self._multi_prompt(documents, query))
             )
-            if res.lower() != "not relevant.":
-                refined_result.append(res)
-        return refined_result
+            refined_result = self._parse_multi(response, len(documents))
+            if refined_result is not None:
+                return refined_result
+
+        return self._filter(self._batch(self._prompts(documents, query)))
+
+    async def arefinement(self, documents: list[str], query: str) -> list[str]:
+        """Asynchronously refine the search results based on the query.
+
+        Args:
+            documents (list[str]): The documents to refine.
+            query (str): The query to refine the documents.
+
+        Returns:
+            list[str]: The refined search results.
+        """
+        if self.single_call and len(documents) > 1:
+            response = _response_text(
+                await self.llm.ainvoke(self._multi_prompt(documents, query))
+            )
+            refined_result = self._parse_multi(response, len(documents))
+            if refined_result is not None:
+                return refined_result
+
+        return self._filter(await self._abatch(self._prompts(documents, query)))
+
+    def _prompts(self, documents: list[str], query: str) -> list[str]:
+        return [
+            self.description.format(question=query, answer=doc, k=self.k)
+            for doc in documents
+        ]
+
+    def _multi_prompt(self, documents: list[str], query: str) -> str:
+        answers = "\n\n".join(
+            f"{i + 1}. {doc}" for i, doc in enumerate(documents)
+        )
+        return self.multi_description.format(question=query, answers=answers, k=self.k)
+
+    def _parse_multi(self, response: str, num_documents: int) -> Optional[list[str]]:
+        results = json_from_text(response)
+        outputs = [results.get(str(i + 1)) for i in range(num_documents)]
+        if not all(isinstance(output, str) for output in outputs):
+            logger.warning(
+                "Unable to parse single call refinement, refining documents separately"
+            )
+            return None
+        return self._filter(outputs)
+
+    def _filter(self, responses: list[str]) -> list[str]:
+        return [res for res in responses if res.lower() != "not relevant."]
 
 
 class RefinementBySentence(BaseRefinement):
@@ -98,6 +195,7 @@ class RefinementBySentence(BaseRefinement):
     
     This class provides a refinement action that refines search results based on a sentence.
     It uses an LLM to refine the search results and return the most relevant sentences.
+    Documents are refined concurrently, or all in one prompt if ``single_call`` is set.
     
     Attributes:
         llm (Any): Language model used for refinement.
@@ -125,20 +223,91 @@ class RefinementBySentence(BaseRefinement):
         Raises:
             SherpaActionExecutionException: If the action fails to execute.
         """
-        refined_result = []
-        for doc in documents:
-            ans_value = tokenize.sent_tokenize(doc)
-            ans_key = range(0, len(ans_value))
-            ans_bullet = dict(zip(ans_key, ans_value))
-            answer_bullet = ""
-            for key, value in ans_bullet.items():
-                answer_bullet += str(key) + ". " + value + "\n"
-            res = self.llm.invoke(
-                self.description.format(question=query, answer=answer_bullet)
+        from nltk import tokenize
+
+        ensure_punkt()
+        sentences = [tokenize.sent_tokenize(doc) for doc in documents]
+        if self.single_call and len(documents) > 1:
+            response = _response_text(
+                self.llm.invoke(self._multi_prompt(sentences, query))
+            )
+            refined_result = self._parse_multi(response, sentences)
+            if refined_result is not None:
+                return refined_result
+
+        responses = self._batch(
+            [self._prompt(doc_sentences, query) for doc_sentences in sentences]
+        )
+        return self._parse(responses, sentences)
+
+    async def arefinement(self, documents: list[str], query: str) -> list[str]:
+        """Asynchronously refine the search results based on the sentence.
+
+        Args:
+            documents (list[str]): The documents to refine.
+            query (str): The query to refine the documents.
+
+        Returns:
+            list[str]: The refined search results.
+        """
+        from nltk import tokenize
+
+        ensure_punkt()
+        sentences = [tokenize.sent_tokenize(doc) for doc in documents]
+        if self.single_call and len(documents) > 1:
+            response = _response_text(
+                await self.llm.ainvoke(self._multi_prompt(sentences, query))
             )
+            refined_result = self._parse_multi(response, sentences)
+            if refined_result is not None:
+                return refined_result
+
+        responses = await self._abatch(
+            [self._prompt(doc_sentences, query) for doc_sentences in sentences]
+        )
+        return self._parse(responses, sentences)
+
+    def _prompt(self, sentences: list[str], query: str) -> str:
+        answer_bullet = ""
+        for key, value in enumerate(sentences):
+            answer_bullet += str(key) + ". " + value + "\n"
+        return self.description.format(question=query, answer=answer_bullet)
+
+    def _multi_prompt(self, sentences: list[list[str]], query: str) -> str:
+        # Sentences are numbered across all documents so one answer covers them all
+        all_sentences = [value for doc_sentences in sentences for value in doc_sentences]
+        return self._prompt(all_sentences, query)
+
+    def _parse(self, responses: list[str], sentences: list[list[str]]) -> list[str]:
+        refined_result = []
+        for res, ans_value in zip(responses, sentences):
             list_res = res.split(",")
             list_check = [i.isdigit() for i in list_res]
             if all(list_check):
-                refined_res = " ".join([ans_bullet[int(i)] for i in list_res])
+                refined_res = " ".join([ans_value[int(i)] for i in list_res])
                 refined_result.append(refined_res)
         return refined_result
+
+    def _parse_multi(
+        self, response: str, sentences: list[list[str]]
+    ) -> Optional[list[str]]:
+        list_res = [i.strip() for i in response.split(",")]
+        if not all(i.isdigit() for i in list_res):
+            logger.warning(
+                "Unable to parse single call refinement, refining documents separately"
+            )
+            return None
+
+        selected = {int(i) for i in list_res}
+        refined_result = []
+        offset = 0
+        for doc_sentences in sentences:
+            kept = [
+                value
+                for key, value in enumerate(doc_sentences)
+                if key + offset in selected
+            ]
+            if kept:
+                refined_result.append(" ".join(kept))
+            offset += len(doc_sentences)
+        return refined_result
@@ -2,12 +2,15 @@
 Different methods for reranking the results of a search query.
 """
 
+import hashlib
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Callable
+from collections import OrderedDict
+from typing import Any, Callable, Optional
 
 import numpy as np
 from numpy.typing import ArrayLike
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 
 def cosine_similarity(v1: ArrayLike, v2: ArrayLike) -> float:
@@ -26,6 +29,22 @@ def cosine_similarity(v1: ArrayLike, v2: ArrayLike) -> float:
     return np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2))
 
 
+def normalize_rows(vectors: ArrayLike) -> np.ndarray:
+    """Scale each row of a matrix to unit length.
+
+    Rows of zeros are left as they are, so their cosine similarity to any vector is 0.
+
+    Args:
+        vectors (ArrayLike): Matrix with one vector per row.
+
+    Returns:
+        np.ndarray: The normalized vectors, as float arrays.
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
 class BaseReranking(ABC, BaseModel):
     """Abstract base class for reranking actions.
     
@@ -53,9 +72,15 @@ class RerankingByQuery(BaseReranking):
     It uses an embeddings object to embed the query and documents, and then calculates
     the cosine similarity between the query and each document.
 
+    Document embeddings are cached by the hash of the document content, so
+    documents seen in earlier calls are not embedded again. With the default
+    ``cosine_similarity`` metric all scores are computed in one matrix-vector product.
+
     Attributes:
         embeddings (Any): The embeddings object used for reranking.
         distance_metric (Callable[[ArrayLike, ArrayLike], float]): The distance metric used for reranking.
+        top_k (Optional[int]): Number of documents to return. Defaults to all of them.
+        cache_size (int): Maximum number of document embeddings kept in the cache.
     
     Example:
         >>> from sherpa_ai.actions.utils import RerankingByQuery
@@ -64,10 +89,17 @@ class RerankingByQuery(BaseReranking):
     """
     embeddings: Any = None  # takes an Embedding Object from LangChain, use Any since it is not compatible with Pydantic 2 yet
     distance_metric: Callable[[ArrayLike, ArrayLike], float] = cosine_similarity
+    top_k: Optional[int] = None
+    cache_size: int = 10000
 
-    def rerank(self, documents: list[str], query: str) -> str:
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def rerank(self, documents: list[str], query: str) -> list[str]:
         """Rerank the documents based on the query.
 
+        Documents with the same score keep their original order.
+
         Args:
             documents (list[str]): The documents to rerank.
             query (str): The query to rerank the documents.
@@ -78,18 +110,66 @@ class RerankingByQuery(BaseReranking):
         Raises:
             SherpaActionExecutionException: If the action fails to execute.
         """
+        if len(documents) == 0:
+            return []
+
         query_embedding = self.embeddings.embed_query(query)
-        document_embeddings = self.embeddings.embed_documents(documents)
+        document_embeddings = self.embed_documents(documents)
+
+        if self.distance_metric is cosine_similarity:
+            scores = document_embeddings @ normalize_rows(query_embedding)
+        else:
+            scores = np.array(
+                [
+                    self.distance_metric(query_embedding, doc_embedding)
+                    for doc_embedding in document_embeddings
+                ]
+            )
+
+        return [documents[i] for i in self._top_indices(scores)]
 
-        # Calculate the similarity between the query and each document
-        similarities = [
-            self.distance_metric(query_embedding, doc_embedding)
-            for doc_embedding in document_embeddings
-        ]
+    def embed_documents(self, documents: list[str]) -> np.ndarray:
+        """Get the embeddings of documents, embedding only unseen ones.
 
-        # Sort the documents by similarity
-        sorted_documents = [
-            doc for _, doc in sorted(zip(similarities, documents), reverse=True)
-        ]
+        Embeddings are normalized when the distance metric is ``cosine_similarity``.
 
-        return sorted_documents
+        Args:
+            documents (list[str]): The documents to embed.
+
+        Returns:
+            np.ndarray: Matrix with the embedding of each document per row.
+        """
+        keys = [hashlib.sha256(doc.encode("utf-8")).hexdigest() for doc in documents]
+        with self._lock:
+            cached = {key: self._cache.get(key) for key in keys}
+
+        missing = {}
+        for key, doc in zip(keys, documents):
+            if cached[key] is None:
+                missing.setdefault(key, doc)
+
+        if missing:
+            new_embeddings = self.embeddings.embed_documents(list(missing.values()))
+            if self.distance_metric is cosine_similarity:
+                new_embeddings = normalize_rows(new_embeddings)
+            else:
+                new_embeddings = np.asarray(new_embeddings, dtype=float)
+            cached.update(zip(missing, new_embeddings))
+
+        with self._lock:
+            for key in keys:
+                self._cache[key] = cached[key]
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return np.stack([cached[key] for key in keys])
+
+    def _top_indices(self, scores: np.ndarray) -> np.ndarray:
+        # Negate so higher scores come first; a stable sort keeps ties in order
+        order = -scores
+        if self.top_k is not None and self.top_k < len(scores):
+            candidates = np.argpartition(order, self.top_k - 1)[: self.top_k]
+            candidates.sort()
+            return candidates[np.argsort(order[candidates], kind="stable")]
+        return np.argsort(order, kind="stable")
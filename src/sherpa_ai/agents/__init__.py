@@ -1,13 +1,28 @@
-from sherpa_ai.agents.agent_pool import AgentPool
-from sherpa_ai.agents.ml_engineer import MLEngineer
-from sherpa_ai.agents.physicist import Physicist
-from sherpa_ai.agents.qa_agent import QAAgent
-from sherpa_ai.agents.user import UserAgent
+from typing import TYPE_CHECKING
+
+from sherpa_ai.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from sherpa_ai.agents.agent_pool import AgentPool
+    from sherpa_ai.agents.ml_engineer import MLEngineer
+    from sherpa_ai.agents.physicist import Physicist
+    from sherpa_ai.agents.qa_agent import QAAgent
+    from sherpa_ai.agents.user import UserAgent
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "AgentPool": "sherpa_ai.agents.agent_pool",
+        "MLEngineer": "sherpa_ai.agents.ml_engineer",
+        "Physicist": "sherpa_ai.agents.physicist",
+        "QAAgent": "sherpa_ai.agents.qa_agent",
+        "UserAgent": "sherpa_ai.agents.user",
+    },
+)
 
 __all__ = [
     "AgentPool",
     "Physicist",
-    "Programmer",
     "MLEngineer",
     "UserAgent",
     "QAAgent",
@@ -331,7 +331,9 @@ class BaseAgent(ABC, BaseModel):
             My answer
         """
         if len(self.validations) > 0:
-            result = self.validate_output()
+            # Validation and regeneration are synchronous, run them in a thread so
+            # they do not block other agents sharing the event loop
+            result = await asyncio.to_thread(self.validate_output)
 
         logger.debug(f"```🤖{self.name} wrote: {result}```")
 
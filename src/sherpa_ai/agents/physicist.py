@@ -5,6 +5,7 @@ from sherpa_ai.actions.base import BaseAction
 from sherpa_ai.agents.base import BaseAgent
 from sherpa_ai.memory.belief import Belief
 from sherpa_ai.policies import ReactPolicy
+from sherpa_ai.token_counter import get_llm_token_counter
 
 class Physicist(BaseAgent):
     """A specialized agent for answering questions about physics topics.
@@ -117,10 +118,11 @@ class Physicist(BaseAgent):
         synthesize_action = SynthesizeOutput(
             role_description=self.description, llm=self.llm
         )
+        token_counter = get_llm_token_counter(self.llm)
         result = synthesize_action.execute(
             self.belief.current_task.content,
-            self.belief.get_context(self.llm.get_num_tokens),
-            self.belief.get_internal_history(self.llm.get_num_tokens),
+            self.belief.get_context(token_counter),
+            self.belief.get_internal_history(token_counter),
         )
 
         return result
@@ -7,6 +7,7 @@ from sherpa_ai.config import AgentConfig
 from sherpa_ai.memory import Belief
 from sherpa_ai.output_parsers.citation_validation import CitationValidation
 from sherpa_ai.policies import ReactPolicy
+from sherpa_ai.token_counter import get_llm_token_counter
 
 # TODO: QA Agent only contains partial implementation from the original
 # task agent, more investigation is needed to add more content to it.
@@ -186,9 +187,10 @@ class QAAgent(BaseAgent):
             llm=self.llm,
             add_citation=self.citation_enabled,
         )
+        token_counter = get_llm_token_counter(self.llm)
         result = synthesize_action.execute(
             self.belief.current_task.content,
-            self.belief.get_context(self.llm.get_num_tokens),
-            self.belief.get_internal_history(self.llm.get_num_tokens),
+            self.belief.get_context(token_counter),
+            self.belief.get_internal_history(token_counter),
         )
         return result
@@ -22,115 +22,78 @@ To add, remove, or change variables, ...
 4. Update corresponding secrets in Github and deployment environments
 """
 
+import importlib
 import sys
-from os import environ
+from typing import Optional
 
-from dotenv import find_dotenv, load_dotenv
 from loguru import logger
 
 from sherpa_ai.config.task_config import AgentConfig
 
-env_path = find_dotenv(usecwd=True)
-load_dotenv(env_path)
+# Loguru handler replaced by configure_logging, starting with the default one
+_log_handler_id = 0
 
 
-# Logging configuration. For local development, typically use DEBUG or INFO.
-LOG_LEVEL = environ.get("LOG_LEVEL", "INFO").upper()
+def load_settings():
+    """Load the settings, reading the .env file the first time it is called.
 
-# Flask debug mode. Optional. Useful for local development.
-# Never enable debug mode in production, as doing so creates security risks.
-FLASK_DEBUG = environ.get("FLASK_DEBUG", False) == "True"
+    Settings are also loaded automatically the first time one of them is read from
+    this module, so calling this function is only needed to load them early.
 
-# Language model settings
-OPENAI_API_KEY = environ.get("OPENAI_API_KEY")
-DAILY_TOKEN_LIMIT = float(environ.get("DAILY_TOKEN_LIMIT") or 20000)
-DAILY_LIMIT_REACHED_MESSAGE = (
-    environ.get("DAILY_LIMIT_REACHED_MESSAGE")
-    or "Sorry for the inconvenience, but it seems that you have exceeded your daily token limit. As a result, you will need to try again after 24 hours. Thank you for your understanding."
-)
-LIMIT_TIME_SIZE_IN_HOURS = environ.get("LIMIT_TIME_SIZE_IN_HOURS") or "24"
-FILE_SIZE_LIMIT = environ.get("FILE_SIZE_LIMIT") or 2097152
-FILE_TOKEN_LIMIT = environ.get("FILE_TOKEN_LIMIT") or 20000
-DB_NAME = environ.get("DB_NAME") or "token_counter.db"
-DB_URL = environ.get("DB_URL") or "sqlite:///token_counter.db"
+    Returns:
+        module: The module holding the settings.
 
-# Enhanced cost tracking settings
-ENABLE_COST_TRACKING = environ.get("ENABLE_COST_TRACKING", "true").lower() == "true"
-DAILY_COST_LIMIT = float(environ.get("DAILY_COST_LIMIT") or 10.0)  # $10 default
-COST_ALERT_THRESHOLD = float(environ.get("COST_ALERT_THRESHOLD") or 0.8)  # 80% of limit
-
-# Usage tracking logging settings
-USAGE_LOG_TO_S3 = environ.get("USAGE_LOG_TO_S3", "false").lower() == "true"
-USAGE_LOG_TO_FILE = environ.get("USAGE_LOG_TO_FILE", "true").lower() == "true"
-USAGE_LOG_FILE_PATH = environ.get("USAGE_LOG_FILE_PATH", "./usage_logs.txt")
-
-# Pricing configuration
-MODEL_PRICING_CONFIG_PATH = environ.get("MODEL_PRICING_CONFIG_PATH")  # Path to JSON pricing config file
-MODEL_PRICING_JSON = environ.get("MODEL_PRICING_JSON")  # JSON string with pricing data
-
-# Vector database settings, for embeddings. Uses Chroma.
-# If none is configured, Sherpa uses an in-memory version of Chroma. If you're running
-# Sherpa via docker-compose, Docker settings are used instead of these values.
-
-INDEX_NAME_FILE_STORAGE = environ.get("INDEX_NAME_FILE_STORAGE", "sherpa_db")
-
-# Chroma. Optional. Enables local, docker or cloud based storage of vector embeddings.
-CHROMA_HOST = environ.get("CHROMA_HOST")
-CHROMA_PORT = environ.get("CHROMA_PORT")
-CHROMA_INDEX = environ.get("CHROMA_INDEX")
-
-# Serper.dev. Optional. Enables Google web search capability in Sherpa.
-SERPER_API_KEY = environ.get("SERPER_API_KEY")
-
-# Github auth for extracting readme files from GitHub repositories. Optional.
-GITHUB_AUTH_TOKEN = environ.get("GITHUB_AUTH_TOKEN")
-
-
-# Configure logger. To get JSON serialization, set serialize=True.
-# See https://loguru.readthedocs.io/en/stable/ for info on Loguru features.
-logger.remove(0)  # remove the default handler configuration
-logger.add(sys.stderr, level=LOG_LEVEL, serialize=False)
+    Example:
+        >>> from sherpa_ai.config import load_settings
+        >>> settings = load_settings()
+        >>> print(settings.LOG_LEVEL)
+        INFO
+    """
+    return importlib.import_module("sherpa_ai.config.settings")
 
 
-# `this` is a pointer to the module object instance itself.
-this = sys.modules[__name__]
+def configure_logging(level: Optional[str] = None):
+    """Configure the logger with the ``LOG_LEVEL`` setting.
 
+    This is done automatically when the settings are loaded, call it again to
+    change the level later on.
 
-def check_vectordb_setting():
-    """Determine which vector database to use based on environment variables.
+    To get JSON serialization, set serialize=True.
+    See https://loguru.readthedocs.io/en/stable/ for info on Loguru features.
 
-    This function checks the environment variables for Chroma settings and
-    sets the VECTORDB variable accordingly. If not configured, it defaults
-    to an in-memory Chroma database.
+    Args:
+        level (Optional[str]): Minimum level of logged messages. Defaults to the
+            ``LOG_LEVEL`` setting.
 
     Example:
-        >>> from sherpa_ai.config import check_vectordb_setting
-        >>> check_vectordb_setting()
-        >>> print(VECTORDB)
-        in-memory
+        >>> from sherpa_ai.config import configure_logging
+        >>> configure_logging()
     """
-    if this.CHROMA_HOST and this.CHROMA_PORT and this.CHROMA_INDEX:
-        logger.info(
-            "Config: Chroma environment variables are set. Using Chroma database."
-        )
-        this.VECTORDB = "chroma"
-    else:
-        logger.warning(
-            "Config: No vector database environment variables are set. "
-            "Using in-memory Chroma database. This may not be what you intended."
-        )
-        this.VECTORDB = "in-memory"
-
-
-# Ensure all mandatory environment variables are set, otherwise exit
-
-if this.OPENAI_API_KEY is None:
-    logger.warning("Config: OpenAI environment variables not set")
-else:
-    logger.info("Config: OpenAI environment variables are set")
+    global _log_handler_id
+    try:
+        # remove the default handler configuration, or the one added by a previous call
+        logger.remove(_log_handler_id)
+    except ValueError:
+        pass
+    if level is None:
+        level = load_settings().LOG_LEVEL
+    _log_handler_id = logger.add(sys.stderr, level=level, serialize=False)
+
+
+def __getattr__(name: str):
+    # Settings are loaded lazily, the first time one of them is read
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        return getattr(load_settings(), name)
+    except AttributeError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
 
-check_vectordb_setting()
 
 __all__ = [
     "AgentConfig",
+    "configure_logging",
+    "load_settings",
 ]
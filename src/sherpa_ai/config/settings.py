@@ -0,0 +1,125 @@
+"""Settings loaded from environment variables or a .env file.
+
+This module is imported the first time a setting is read from
+:mod:`sherpa_ai.config`, so the .env file is only looked up when a setting is
+needed, not when Sherpa AI is imported.
+"""
+
+import sys
+from os import environ
+
+from dotenv import find_dotenv, load_dotenv
+from loguru import logger
+
+from sherpa_ai.config import configure_logging
+
+env_path = find_dotenv(usecwd=True)
+load_dotenv(env_path)
+
+
+# Logging configuration. For local development, typically use DEBUG or INFO.
+LOG_LEVEL = environ.get("LOG_LEVEL", "INFO").upper()
+
+# Apply the level before the settings below log anything
+configure_logging(LOG_LEVEL)
+
+# Flask debug mode. Optional. Useful for local development.
+# Never enable debug mode in production, as doing so creates security risks.
+FLASK_DEBUG = environ.get("FLASK_DEBUG", False) == "True"
+
+# Language model settings
+OPENAI_API_KEY = environ.get("OPENAI_API_KEY")
+DAILY_TOKEN_LIMIT = float(environ.get("DAILY_TOKEN_LIMIT") or 20000)
+DAILY_LIMIT_REACHED_MESSAGE = (
+    environ.get("DAILY_LIMIT_REACHED_MESSAGE")
+    or "Sorry for the inconvenience, but it seems that you have exceeded your daily token limit. As a result, you will need to try again after 24 hours. Thank you for your understanding."
+)
+LIMIT_TIME_SIZE_IN_HOURS = environ.get("LIMIT_TIME_SIZE_IN_HOURS") or "24"
+FILE_SIZE_LIMIT = environ.get("FILE_SIZE_LIMIT") or 2097152
+FILE_TOKEN_LIMIT = environ.get("FILE_TOKEN_LIMIT") or 20000
+DB_NAME = environ.get("DB_NAME") or "token_counter.db"
+DB_URL = environ.get("DB_URL") or "sqlite:///token_counter.db"
+
+# Enhanced cost tracking settings
+ENABLE_COST_TRACKING = environ.get("ENABLE_COST_TRACKING", "true").lower() == "true"
+DAILY_COST_LIMIT = float(environ.get("DAILY_COST_LIMIT") or 10.0)  # $10 default
+COST_ALERT_THRESHOLD = float(environ.get("COST_ALERT_THRESHOLD") or 0.8)  # 80% of limit
+
+# Usage tracking logging settings
+USAGE_LOG_TO_S3 = environ.get("USAGE_LOG_TO_S3", "false").lower() == "true"
+USAGE_LOG_TO_FILE = environ.get("USAGE_LOG_TO_FILE", "true").lower() == "true"
+USAGE_LOG_FILE_PATH = environ.get("USAGE_LOG_FILE_PATH", "./usage_logs.txt")
+
+# Batched usage writer settings. Usage from LLM calls is queued and written in
+# batches of up to this many records, at most this many seconds after it is recorded.
+USAGE_WRITER_BATCH_SIZE = int(environ.get("USAGE_WRITER_BATCH_SIZE") or 100)
+USAGE_WRITER_FLUSH_INTERVAL = float(environ.get("USAGE_WRITER_FLUSH_INTERVAL") or 1.0)
+
+# Pricing configuration
+MODEL_PRICING_CONFIG_PATH = environ.get("MODEL_PRICING_CONFIG_PATH")  # Path to JSON pricing config file
+MODEL_PRICING_JSON = environ.get("MODEL_PRICING_JSON")  # JSON string with pricing data
+
+# Vector database settings, for embeddings. Uses Chroma.
+# If none is configured, Sherpa uses an in-memory version of Chroma. If you're running
+# Sherpa via docker-compose, Docker settings are used instead of these values.
+
+INDEX_NAME_FILE_STORAGE = environ.get("INDEX_NAME_FILE_STORAGE", "sherpa_db")
+
+# Folder where embeddings are cached between runs, so unchanged text is not embedded
+# again. Optional. If not set, embeddings are only cached in memory.
+EMBEDDING_CACHE_DIR = environ.get("EMBEDDING_CACHE_DIR")
+
+# Folder where the local index of the `files` folder is kept, so only changed files
+# are indexed again on startup. Optional. If not set, the index is kept in memory.
+LOCAL_INDEX_DIR = environ.get("LOCAL_INDEX_DIR")
+
+# Chroma. Optional. Enables local, docker or cloud based storage of vector embeddings.
+CHROMA_HOST = environ.get("CHROMA_HOST")
+CHROMA_PORT = environ.get("CHROMA_PORT")
+CHROMA_INDEX = environ.get("CHROMA_INDEX")
+
+# Serper.dev. Optional. Enables Google web search capability in Sherpa.
+SERPER_API_KEY = environ.get("SERPER_API_KEY")
+
+# Github auth for extracting readme files from GitHub repositories. Optional.
+GITHUB_AUTH_TOKEN = environ.get("GITHUB_AUTH_TOKEN")
+
+
+# `this` is a pointer to the module object instance itself.
+this = sys.modules[__name__]
+
+
+def check_vectordb_setting():
+    """Determine which vector database to use based on environment variables.
+
+    This function checks the environment variables for Chroma settings and
+    sets the VECTORDB variable accordingly. If not configured, it defaults
+    to an in-memory Chroma database.
+
+    Example:
+        >>> from sherpa_ai.config import check_vectordb_setting
+        >>> check_vectordb_setting()
+        >>> print(VECTORDB)
+        in-memory
+    """
+    if this.CHROMA_HOST and this.CHROMA_PORT and this.CHROMA_INDEX:
+        logger.info(
+            "Config: Chroma environment variables are set. Using Chroma database."
+        )
+        this.VECTORDB = "chroma"
+    else:
+        logger.warning(
+            "Config: No vector database environment variables are set. "
+            "Using in-memory Chroma database. This may not be what you intended."
+        )
+        this.VECTORDB = "in-memory"
+
+
+# Ensure all mandatory environment variables are set, otherwise exit
+
+if this.OPENAI_API_KEY is None:
+    logger.warning("Config: OpenAI environment variables not set")
+else:
+    logger.info("Config: OpenAI environment variables are set")
+
+check_vectordb_setting()
@@ -1,13 +1,15 @@
 import uuid
 from typing import Any, List, Optional
 
-import chromadb
-from chromadb.utils import embedding_functions
 from langchain_core.documents import Document
 from pydantic import Field
 
 import sherpa_ai.config as cfg
 from sherpa_ai.connectors.base import BaseVectorDB
+from sherpa_ai.connectors.embedding_cache import (
+    embedding_model_name,
+    get_embedding_store,
+)
 
 
 class ChromaVectorStore(BaseVectorDB):
@@ -42,7 +44,7 @@ class ChromaVectorStore(BaseVectorDB):
         """Create a ChromaVectorStore from a list of texts.
 
         This method creates a new ChromaDB collection, embeds the texts, and adds them
-        to the collection.
+        to the collection. Embeddings are reused from the shared embedding cache.
 
         Args:
             texts: List of text documents to embed and store.
@@ -60,6 +62,9 @@ class ChromaVectorStore(BaseVectorDB):
             >>> print(vector_store.db.count())
             2
         """
+        import chromadb
+        from chromadb.utils import embedding_functions
+
         # Use OpenAIEmbeddingFunction as default embedding function, this cannot be in
         # the method signature for mocking purposes
         if embedding is None:
@@ -67,7 +72,10 @@ class ChromaVectorStore(BaseVectorDB):
                 model_name="text-embedding-ada-002"
             )
 
-        embeded_data = embedding(texts)
+        # Only texts that were never embedded by this model are sent to it
+        embeded_data = get_embedding_store().embed(
+            embedding_model_name(embedding), texts, embedding
+        )
         meta_datas = [] if meta_datas is None else meta_datas
         client = chromadb.PersistentClient(path=path)
         db = client.get_or_create_collection(
@@ -106,6 +114,9 @@ class ChromaVectorStore(BaseVectorDB):
             >>> vector_store = ChromaVectorStore.chroma_from_existing()
             >>> results = vector_store.similarity_search("query", number_of_results=5)
         """
+        import chromadb
+        from chromadb.utils import embedding_functions
+
         # Use OpenAIEmbeddingFunction as default embedding function, this cannot be in
         # the method signature for mocking purposes
         if embedding is None:
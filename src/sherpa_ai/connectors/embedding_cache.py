@@ -0,0 +1,362 @@
+"""Content-addressed embedding cache for Sherpa AI.
+
+Embeddings are cached by the model that computed them and the SHA-256 of the
+embedded text, so unchanged text is never embedded twice. The cache can be kept in
+memory or persisted locally in memory-mapped float32 files indexed by SQLite.
+
+Example:
+    >>> from langchain_openai import OpenAIEmbeddings
+    >>> from sherpa_ai.connectors.embedding_cache import CachedEmbeddings
+    >>> embeddings = CachedEmbeddings(OpenAIEmbeddings())
+    >>> vectors = embeddings.embed_documents(["hello", "world"])
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+import sherpa_ai.config as cfg
+
+# Maximum number of keys looked up in a single SQLite query
+LOOKUP_BATCH_SIZE = 500
+
+# Default number of embeddings kept by an InMemoryEmbeddingStore
+DEFAULT_MAX_SIZE = 10000
+
+# Attributes of embedding objects that change the embeddings computed by a model
+EMBEDDING_SETTINGS = ("dimensions",)
+
+
+@contextmanager
+def _interprocess_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock on a file, shared with other processes."""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def text_key(text: str) -> str:
+    """Get the content address of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def embedding_model_name(embedding: Any) -> str:
+    """Get a name identifying the model of an embedding object.
+
+    Args:
+        embedding (Any): A LangChain ``Embeddings`` or a Chroma embedding function.
+
+    Returns:
+        str: The model name of the embedding, or its class or function name if it
+            has none. Settings changing the embeddings of a model, such as the
+            number of dimensions, are part of the name.
+    """
+    for attribute in ("model", "model_name", "_model_name"):
+        name = getattr(embedding, attribute, None)
+        if isinstance(name, str) and name:
+            for setting in EMBEDDING_SETTINGS:
+                value = getattr(embedding, setting, None)
+                if value is not None:
+                    name += f";{setting}={value}"
+            return f"{type(embedding).__name__}:{name}"
+    qualname = getattr(embedding, "__qualname__", None)
+    if isinstance(qualname, str):
+        # Plain functions share a type, so they are told apart by their own name
+        return f"{getattr(embedding, '__module__', '')}.{qualname}"
+    return type(embedding).__name__
+
+
+class BaseEmbeddingStore(ABC):
+    """Abstract base class for stores of cached embeddings.
+
+    Subclasses only need to look up and save embeddings by key. Deduplication and
+    filling of missing embeddings is done by :meth:`embed`.
+
+    Example:
+        >>> store = InMemoryEmbeddingStore()
+        >>> vectors = store.embed("my-model", ["hello"], embeddings.embed_documents)
+    """
+
+    @abstractmethod
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Get the cached embeddings of some keys.
+
+        Args:
+            model (str): Name of the model that computed the embeddings.
+            keys (Sequence[str]): Content addresses of the texts.
+
+        Returns:
+            Dict[str, List[float]]: Embedding of each key found in the store.
+        """
+        pass
+
+    @abstractmethod
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        """Save embeddings in the store.
+
+        Args:
+            model (str): Name of the model that computed the embeddings.
+            embeddings (Dict[str, List[float]]): Embedding of each content address.
+        """
+        pass
+
+    def embed(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embed_fn: Callable[[List[str]], List[List[float]]],
+    ) -> List[List[float]]:
+        """Get the embeddings of texts, computing only the missing ones.
+
+        Missing texts are deduplicated and embedded with a single call of
+        ``embed_fn``.
+
+        Args:
+            model (str): Name of the model computing the embeddings.
+            texts (Sequence[str]): Texts to embed.
+            embed_fn (Callable[[List[str]], List[List[float]]]): Embeds a list of texts.
+
+        Returns:
+            List[List[float]]: Embedding of each text, in the same order.
+        """
+        keys = [text_key(text) for text in texts]
+        found = self.get_many(model, list(dict.fromkeys(keys)))
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            new_embeddings = embed_fn(list(missing.values()))
+            new_embeddings = {
+                key: [float(value) for value in embedding]
+                for key, embedding in zip(missing, new_embeddings)
+            }
+            self.put_many(model, new_embeddings)
+            found.update(new_embeddings)
+
+        return [found[key] for key in keys]
+
+
+class InMemoryEmbeddingStore(BaseEmbeddingStore):
+    """Embedding store kept in memory for the lifetime of the process.
+
+    Once the store is full, the least recently used embeddings are evicted first.
+
+    Attributes:
+        max_size (Optional[int]): Maximum number of embeddings kept, unbounded if
+            None.
+
+    Example:
+        >>> store = InMemoryEmbeddingStore(max_size=1000)
+        >>> store.put_many("my-model", {text_key("hello"): [0.1, 0.2]})
+    """
+
+    def __init__(self, max_size: Optional[int] = DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self._embeddings: OrderedDict[tuple, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                embedding = self._embeddings.get((model, key))
+                if embedding is not None:
+                    self._embeddings.move_to_end((model, key))
+                    found[key] = embedding
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        with self._lock:
+            for key, embedding in embeddings.items():
+                self._embeddings[(model, key)] = embedding
+                self._embeddings.move_to_end((model, key))
+            if self.max_size is not None:
+                while len(self._embeddings) > self.max_size:
+                    self._embeddings.popitem(last=False)
+
+
+class LocalEmbeddingStore(BaseEmbeddingStore):
+    """Embedding store persisted in a local folder.
+
+    Vectors are appended to one float32 file per dimension and read back through a
+    memory map. An SQLite database indexes the row of each (model, key) pair.
+    Writes hold a lock file, so processes can share the folder.
+
+    Attributes:
+        path (str): Folder containing the vector files and the index.
+
+    Example:
+        >>> store = LocalEmbeddingStore("./embedding_cache")
+        >>> vectors = store.embed("my-model", ["hello"], embeddings.embed_documents)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps: Dict[int, np.memmap] = {}
+        self._conn = sqlite3.connect(
+            os.path.join(path, "index.sqlite"), check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key TEXT NOT NULL, dim INTEGER NOT NULL, "
+            "row INTEGER NOT NULL, PRIMARY KEY (model, key))"
+        )
+        self._conn.commit()
+
+    def _vector_file(self, dim: int) -> str:
+        return os.path.join(self.path, f"vectors_{dim}.f32")
+
+    def _rows(self, dim: int, min_rows: int) -> np.memmap:
+        # Map the file again only when rows were appended since it was last mapped
+        vectors = self._maps.get(dim)
+        if vectors is None or len(vectors) < min_rows:
+            vectors = np.memmap(self._vector_file(dim), dtype=np.float32, mode="r")
+            vectors = vectors[: len(vectors) // dim * dim].reshape(-1, dim)
+            self._maps[dim] = vectors
+        return vectors
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+                batch = keys[start : start + LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT key, dim, row FROM embeddings "
+                    f"WHERE model = ? AND key IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for key, dim, row in rows:
+                    found[key] = self._rows(dim, row + 1)[row].tolist()
+        return found
+
+    def put_many(self, model: str, embeddings: Dict[str, List[float]]):
+        by_dim: Dict[int, List[tuple]] = {}
+        for key, embedding in embeddings.items():
+            by_dim.setdefault(len(embedding), []).append((key, embedding))
+
+        # Rows are numbered from the size of the vector files, so appending and
+        # indexing them must not interleave with the writes of other processes
+        with self._lock, _interprocess_lock(os.path.join(self.path, "write.lock")):
+            for dim, items in by_dim.items():
+                vector_file = self._vector_file(dim)
+                with open(vector_file, "ab") as f:
+                    # Drop a partial row left by an interrupted write
+                    first_row = f.tell() // (dim * 4)
+                    f.truncate(first_row * dim * 4)
+                    f.write(
+                        np.asarray([e for _, e in items], dtype=np.float32).tobytes()
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (model, key, dim, row) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (model, key, dim, first_row + i)
+                        for i, (key, _) in enumerate(items)
+                    ],
+                )
+            self._conn.commit()
+
+    def close(self):
+        """Close the index database."""
+        with self._lock:
+            self._maps.clear()
+            self._conn.close()
+
+
+_default_store: Optional[BaseEmbeddingStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_embedding_store() -> BaseEmbeddingStore:
+    """Get the embedding store shared by all vector store connectors.
+
+    The store is persisted in ``EMBEDDING_CACHE_DIR`` if it is configured, and kept
+    in memory otherwise.
+
+    Returns:
+        BaseEmbeddingStore: The shared embedding store.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            if cfg.EMBEDDING_CACHE_DIR:
+                _default_store = LocalEmbeddingStore(cfg.EMBEDDING_CACHE_DIR)
+            else:
+                _default_store = InMemoryEmbeddingStore()
+        return _default_store
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings that cache the results of another embeddings object.
+
+    Query embeddings are cached separately from document embeddings, since some
+    models embed queries differently.
+
+    Attributes:
+        embeddings (Embeddings): The wrapped embeddings.
+        store (BaseEmbeddingStore): Where embeddings are cached. Defaults to the
+            store shared by all connectors.
+        model (str): Name identifying the wrapped model in the cache.
+
+    Example:
+        >>> embeddings = CachedEmbeddings(OpenAIEmbeddings())
+        >>> embeddings.embed_documents(["hello"])  # embedded
+        >>> embeddings.embed_documents(["hello"])  # read from the cache
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        store: Optional[BaseEmbeddingStore] = None,
+        model: Optional[str] = None,
+    ):
+        self.embeddings = embeddings
+        self.store = store if store is not None else get_embedding_store()
+        self.model = model or embedding_model_name(embeddings)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.store.embed(self.model, texts, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.store.embed(
+            f"{self.model}#query",
+            [text],
+            lambda texts: [self.embeddings.embed_query(texts[0])],
+        )[0]
+
+
+def cached_embeddings(embeddings: Optional[Embeddings]) -> Optional[Embeddings]:
+    """Wrap embeddings with the shared cache, unless they are already cached."""
+    if embeddings is None or isinstance(embeddings, CachedEmbeddings):
+        return embeddings
+    return CachedEmbeddings(embeddings)
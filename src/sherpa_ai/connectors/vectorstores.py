@@ -1,16 +1,26 @@
+import hashlib
+import json
 import os
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Iterable, List, Optional, Tuple, Type
 
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore, VectorStoreRetriever
-from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import CharacterTextSplitter
 from loguru import logger
 
 import sherpa_ai.config as cfg
-from sherpa_ai.utils import load_files
+from sherpa_ai.connectors.embedding_cache import cached_embeddings
+from sherpa_ai.utils import iter_load_files
+
+
+def _openai_embeddings(openai_api_key: str) -> Embeddings:
+    # langchain_openai is slow to import, so it is only imported when needed
+    from langchain_openai import OpenAIEmbeddings
+
+    return cached_embeddings(OpenAIEmbeddings(openai_api_key=openai_api_key))
 
 
 class ConversationStore(VectorStore):
@@ -84,7 +94,7 @@ class ConversationStore(VectorStore):
         pinecone.init(api_key=cfg.PINECONE_API_KEY, environment=cfg.PINECONE_ENV)
         logger.info(f"Loading index {index_name} from Pinecone")
         index = pinecone.Index(index_name)
-        embedding = OpenAIEmbeddings(openai_api_key=openai_api_key)
+        embedding = _openai_embeddings(openai_api_key)
         return cls(namespace, index, embedding, text_key)
 
     def add_text(self, text: str, metadata={}) -> str:
@@ -120,14 +130,32 @@ class ConversationStore(VectorStore):
         """Access the query embedding object if available."""
         return self.embeddings_func
 
-    def add_texts(self, texts: Iterable[str], metadatas: List[dict]) -> List[str]:
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        embedding_batch_size: int = 1000,
+        upsert_batch_size: int = 100,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> List[str]:
         """Add multiple texts to the vector store.
 
-        This method adds each text with its corresponding metadata to the vector store.
+        Texts are embedded with ``embed_documents`` in batches of
+        ``embedding_batch_size`` and upserted in chunks of ``upsert_batch_size``
+        vectors. Upserts run in a thread pool, so they overlap with the embedding of
+        the next batch.
 
         Args:
             texts (Iterable[str]): The texts to add.
-            metadatas (List[dict]): The metadata for each text.
+            metadatas (Optional[List[dict]]): The metadata for each text. Defaults to
+                an empty dict per text.
+            embedding_batch_size (int): Number of texts embedded per request.
+            upsert_batch_size (int): Number of vectors upserted per request.
+            max_workers (int): Number of upsert requests running at the same time.
+
+        Returns:
+            List[str]: The IDs of the added texts.
 
         Example:
             >>> from sherpa_ai.connectors.vectorstores import ConversationStore
@@ -136,8 +164,42 @@ class ConversationStore(VectorStore):
             >>> metadatas = [{"user": "user1"}, {"user": "user2"}]
             >>> store.add_texts(texts, metadatas)
         """
-        for text, metadata in zip(texts, metadatas):
-            self.add_text(text, metadata)
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [str(uuid.uuid4()) for _ in texts]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            upserts = []
+            for start in range(0, len(texts), embedding_batch_size):
+                end = start + embedding_batch_size
+                embeddings = self.embeddings.embed_documents(texts[start:end])
+                docs = [
+                    {
+                        "id": id,
+                        "values": embedding,
+                        "metadata": {**metadata, self.text_key: text},
+                    }
+                    for id, embedding, text, metadata in zip(
+                        ids[start:end],
+                        embeddings,
+                        texts[start:end],
+                        metadatas[start:end],
+                    )
+                ]
+                for i in range(0, len(docs), upsert_batch_size):
+                    upserts.append(
+                        executor.submit(
+                            self.db.upsert,
+                            vectors=docs[i : i + upsert_batch_size],
+                            namespace=self.namespace,
+                        )
+                    )
+
+            # Raise the error of any failed upsert
+            for upsert in upserts:
+                upsert.result()
+
+        return ids
 
     def similarity_search(
         self,
@@ -393,6 +455,12 @@ class LocalChromaStore(VectorStore):
         )
         return ids
 
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> Optional[bool]:
+        """Delete vectors by ID from the underlying chromadb collection."""
+        if ids:
+            self._collection.delete(ids=ids)
+        return True
+
     def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
         """Perform a similarity search in the chromadb collection."""
         query_embedding = self._embedding_function.embed_query(query)
@@ -420,17 +488,113 @@ class LocalChromaStore(VectorStore):
             store.add_texts(texts, metadatas)
         return store
 
+    def index_folder(self, file_path: str, manifest_path: Optional[str] = None):
+        """Index the files of a folder, only processing files changed since last time.
+
+        A manifest records the modification time, size, content hash and vector IDs
+        of each indexed file. Files whose modification time and size, or content,
+        did not change are skipped. Changed files are split and embedded again, and
+        the vectors of changed or removed files are deleted.
+
+        The manifest is saved after each file is added, so if indexing fails
+        partway, the next call only indexes the files that were not added yet.
+
+        Args:
+            file_path (str): Path to the folder containing files.
+            manifest_path (Optional[str]): Where the manifest is kept. If None, all
+                files are indexed and no manifest is saved.
+
+        Example:
+            >>> store = LocalChromaStore("chroma", embeddings, client=persistent_client)
+            >>> store.index_folder("path/to/files", "path/to/manifest.json")
+        """
+        manifest = {}
+        if manifest_path is not None and os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest and self._collection.count() == 0:
+                # The collection was reset, so nothing in the manifest is indexed
+                manifest = {}
+
+        files = [file_path + "/" + file for file in os.listdir(file_path)]
+        # Entries of files whose vectors are in the collection
+        new_manifest = {}
+        # Entries of changed files, added to the manifest once they are indexed
+        changed = {}
+        for file in files:
+            stat = os.stat(file)
+            entry = manifest.get(file)
+            if (
+                entry is not None
+                and entry["mtime"] == stat.st_mtime
+                and entry["size"] == stat.st_size
+            ):
+                new_manifest[file] = entry
+                continue
+
+            content_hash = _file_hash(file)
+            if entry is not None and entry["hash"] == content_hash:
+                new_manifest[file] = {
+                    **entry,
+                    "mtime": stat.st_mtime,
+                    "size": stat.st_size,
+                }
+                continue
+
+            changed[file] = {
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "hash": content_hash,
+                "ids": [],
+            }
+
+        stale_ids = [
+            id
+            for file, entry in manifest.items()
+            if file not in new_manifest
+            for id in entry["ids"]
+        ]
+        if stale_ids:
+            self.delete(stale_ids)
+        _save_manifest(manifest_path, new_manifest)
+
+        # Files are split and embedded as they finish loading in other processes
+        text_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
+        for document in iter_load_files(list(changed)):
+            source = document.metadata["source"]
+            documents = text_splitter.split_documents([document])
+            logger.info(f"adding documents of {source}")
+            entry = changed[source]
+            if documents:
+                entry["ids"].extend(self.add_documents(documents))
+            new_manifest[source] = entry
+            _save_manifest(manifest_path, new_manifest)
+
+        logger.info(
+            f"Indexed {file_path}: {len(changed)} files changed, "
+            f"{len(set(manifest) - set(files))} files removed"
+        )
+
     @classmethod
-    def from_folder(cls, file_path, openai_api_key, index_name="chroma"):
+    def from_folder(
+        cls,
+        file_path,
+        openai_api_key,
+        index_name="chroma",
+        persist_directory: Optional[str] = None,
+    ):
         """Create a Chroma DB from a folder of files.
 
         This method creates a ChromaDB from a folder of files, currently supporting
-        PDFs and markdown files.
+        PDFs and markdown files. If ``persist_directory`` is given, the collection is
+        stored there and only files changed since the last call are indexed again.
 
         Args:
             file_path (str): Path to the folder containing files.
             openai_api_key (str): The OpenAI API key.
             index_name (str, optional): Name of the index. Defaults to "chroma".
+            persist_directory (Optional[str]): Folder where the collection and its
+                manifest are kept. Defaults to an in-memory collection.
 
         Returns:
             LocalChromaStore: A new LocalChromaStore instance.
@@ -440,19 +604,40 @@ class LocalChromaStore(VectorStore):
             >>> store = LocalChromaStore.from_folder("path/to/files", "api_key")
             >>> results = store.similarity_search("query", k=5)
         """
-        files = os.listdir(file_path)
-        files = [file_path + "/" + file for file in files]
-        documents = load_files(files)
-
-        embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
-        chroma = cls(index_name, embeddings)
-        test_splitter = CharacterTextSplitter(chunk_size=1000, chunk_overlap=0)
-        documents = test_splitter.split_documents(documents)
-        logger.info("adding documents")
-        chroma.add_documents(documents)
+        embeddings = _openai_embeddings(openai_api_key)
+
+        client = None
+        manifest_path = None
+        if persist_directory is not None:
+            import chromadb
+
+            client = chromadb.PersistentClient(path=persist_directory)
+            manifest_path = os.path.join(
+                persist_directory, f"{index_name}_manifest.json"
+            )
+
+        chroma = cls(index_name, embeddings, client=client)
+        chroma.index_folder(file_path, manifest_path)
         return chroma
 
 
+def _save_manifest(manifest_path: Optional[str], manifest: dict):
+    if manifest_path is None:
+        return
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path)
+
+
+def _file_hash(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
 def configure_chroma(host: str, port: int, index_name: str, openai_api_key: str):
     """Configure a ChromaDB instance.
 
@@ -485,7 +670,7 @@ def configure_chroma(host: str, port: int, index_name: str, openai_api_key: str)
         )
 
     client = chromadb.HttpClient(host=cfg.CHROMA_HOST, port=cfg.CHROMA_PORT)
-    embeddings = OpenAIEmbeddings(openai_api_key=openai_api_key)
+    embeddings = _openai_embeddings(openai_api_key)
     return LocalChromaStore(
         collection_name=cfg.CHROMA_INDEX, embedding_function=embeddings, client=client
     )
@@ -520,13 +705,13 @@ def get_vectordb():
     else:
         if os.path.exists("files"):
             return LocalChromaStore.from_folder(
-                "files", cfg.OPENAI_API_KEY
+                "files", cfg.OPENAI_API_KEY, persist_directory=cfg.LOCAL_INDEX_DIR
             ).as_retriever()
         else:
             logger.warning(
                 "No files folder found, initialize an empty vectorstore instead"
             )
-            embedding_func = OpenAIEmbeddings(openai_api_key=cfg.OPENAI_API_KEY)
+            embedding_func = _openai_embeddings(cfg.OPENAI_API_KEY)
             return LocalChromaStore(
                 "memory", embedding_function=embedding_func
             ).as_retriever()
@@ -2,9 +2,37 @@
 
 import argparse
 import json
+from datetime import datetime, timezone
+from itertools import islice
 
 from sherpa_ai.database.user_usage_tracker import UserUsageTracker
-from sherpa_ai.cost_tracking.reporting import CostReporter
+from sherpa_ai.cost_tracking.reporting import EXPORT_FORMATS, CostReporter
+
+
+def parse_time(value: str) -> int:
+    """Parse a Unix timestamp or an ISO 8601 date/datetime into a Unix timestamp.
+
+    Dates and datetimes without a timezone are interpreted as UTC.
+    """
+    try:
+        return int(float(value))
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid time '{value}', expected a Unix timestamp or ISO 8601 date"
+        )
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def add_time_range_arguments(parser):
+    """Add the --since/--until time range filters to a subcommand parser."""
+    parser.add_argument("--since", type=parse_time, help="Only include usage at or after this time (Unix timestamp or ISO 8601)")
+    parser.add_argument("--until", type=parse_time, help="Only include usage before this time (Unix timestamp or ISO 8601)")
 
 
 def main():
@@ -15,22 +43,30 @@ def main():
     # Summary command
     summary_parser = subparsers.add_parser("summary", help="Show cost summary")
     summary_parser.add_argument("--user-id", help="Filter by user ID")
+    add_time_range_arguments(summary_parser)
     
     # Top users command
     top_users_parser = subparsers.add_parser("top-users", help="Show top users by cost")
     top_users_parser.add_argument("--limit", type=int, default=10, help="Number of users to show")
+    add_time_range_arguments(top_users_parser)
     
     # Top agents command
     top_agents_parser = subparsers.add_parser("top-agents", help="Show top agents by cost")
     top_agents_parser.add_argument("--limit", type=int, default=10, help="Number of agents to show")
+    add_time_range_arguments(top_agents_parser)
     
     # Model stats command
     model_stats_parser = subparsers.add_parser("model-stats", help="Show model usage statistics")
+    add_time_range_arguments(model_stats_parser)
     
     # Export command
     export_parser = subparsers.add_parser("export", help="Export cost data")
     export_parser.add_argument("--output", required=True, help="Output file path")
-    export_parser.add_argument("--format", choices=["json", "csv"], default="json", help="Output format")
+    export_parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="json", help="Output format")
+    export_parser.add_argument("--user-id", help="Filter by user ID")
+    add_time_range_arguments(export_parser)
+    export_parser.add_argument("--gzip", action="store_true", default=None, help="Gzip the output (default: when --output ends in .gz)")
+    export_parser.add_argument("--chunk-size", type=int, default=1000, help="Rows fetched from the database at a time")
     
     # Estimate command
     estimate_parser = subparsers.add_parser("estimate", help="Estimate cost for a model call")
@@ -73,7 +109,7 @@ def main():
 
 def handle_summary_command(tracker, args):
     """Handle summary command."""
-    summary = tracker.get_cost_summary(args.user_id)
+    summary = tracker.get_cost_summary(args.user_id, since=args.since, until=args.until)
     print(f"Cost Summary{' for ' + args.user_id if args.user_id else ''}:")
     print(f"  Total Cost: ${summary['total_cost']:.4f}")
     print(f"  Total Tokens: {summary['total_tokens']:,}")
@@ -88,7 +124,7 @@ def handle_summary_command(tracker, args):
 
 def handle_top_users_command(reporter, args):
     """Handle top users command."""
-    top_users = reporter.get_top_users_by_cost(args.limit)
+    top_users = reporter.get_top_users_by_cost(args.limit, since=args.since, until=args.until)
     print(f"Top {len(top_users)} Users by Cost:")
     for i, user in enumerate(top_users, 1):
         print(f"{i:2d}. {user['user_id']}: ${user['total_cost']:.4f} "
@@ -97,7 +133,7 @@ def handle_top_users_command(reporter, args):
 
 def handle_top_agents_command(reporter, args):
     """Handle top agents command."""
-    top_agents = reporter.get_top_agents_by_cost(args.limit)
+    top_agents = reporter.get_top_agents_by_cost(args.limit, since=args.since, until=args.until)
     print(f"Top {len(top_agents)} Agents by Cost:")
     for i, agent in enumerate(top_agents, 1):
         print(f"{i:2d}. {agent['agent_name']}: ${agent['total_cost']:.4f} "
@@ -106,7 +142,7 @@ def handle_top_agents_command(reporter, args):
 
 def handle_model_stats_command(reporter, args):
     """Handle model stats command."""
-    model_stats = reporter.get_model_statistics()
+    model_stats = reporter.get_model_statistics(since=args.since, until=args.until)
     print("Model Usage Statistics:")
     for model, stats in model_stats.items():
         print(f"  {model}:")
@@ -117,7 +153,15 @@ def handle_model_stats_command(reporter, args):
 
 def handle_export_command(reporter, args):
     """Handle export command."""
-    success = reporter.export_data(args.output, args.format)
+    success = reporter.export_data(
+        args.output,
+        args.format,
+        user_id=args.user_id,
+        since=args.since,
+        until=args.until,
+        compress=args.gzip,
+        chunk_size=args.chunk_size,
+    )
     if success:
         print(f"Data exported to {args.output} in {args.format.upper()} format")
     else:
@@ -135,11 +179,10 @@ def handle_estimate_command(tracker, args):
 
 def handle_metadata_command(tracker, args):
     """Handle metadata command."""
-    all_data = tracker.get_all_data()
-    records_with_metadata = [
-        record for record in all_data 
-        if record.get("usage_metadata_json")
-    ]
+    records_with_metadata = list(islice(
+        (record for record in tracker.iter_all_data() if record.get("usage_metadata_json")),
+        args.limit
+    ))
     
     print(f"Usage Metadata Details (showing {min(args.limit, len(records_with_metadata))} records):")
     for i, record in enumerate(records_with_metadata[:args.limit], 1):
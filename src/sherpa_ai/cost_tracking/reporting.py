@@ -1,9 +1,20 @@
 """Cost reporting utilities for enhanced UserUsageTracker."""
 
 from typing import Dict, List, Optional, Any
+import csv
+import gzip
 import json
 
-from sherpa_ai.database.user_usage_tracker import UserUsageTracker, UsageTracker
+from sqlalchemy import func
+
+from sherpa_ai.database.user_usage_tracker import (
+    USAGE_RECORD_FIELDS,
+    UserUsageTracker,
+    UsageTracker,
+)
+
+
+EXPORT_FORMATS = ("json", "jsonl", "csv")
 
 
 class CostReporter:
@@ -35,14 +46,61 @@ class CostReporter:
             "audio_tokens": input_details.get("audio", 0) + output_details.get("audio", 0)
         }
     
-    def get_usage_metadata_statistics(self, user_id: Optional[str] = None) -> Dict[str, Any]:
-        """Get detailed usage statistics from usage metadata."""
+    def _filter(
+        self,
+        query,
+        user_id: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ):
+        """Restrict a usage query to a user and a ``[since, until)`` time range."""
         if user_id:
-            data = self.tracker.session.query(UsageTracker).filter_by(user_id=user_id).all()
-        else:
-            data = self.tracker.session.query(UsageTracker).all()
+            query = query.filter(UsageTracker.user_id == user_id)
+        if since is not None:
+            query = query.filter(UsageTracker.timestamp >= since)
+        if until is not None:
+            query = query.filter(UsageTracker.timestamp < until)
+        return query
+
+    def get_usage_metadata_statistics(
+        self,
+        user_id: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Get detailed usage statistics from usage metadata.
+
+        Args:
+            user_id: Only include usage of this user.
+            since: Only include usage at or after this Unix timestamp.
+            until: Only include usage before this Unix timestamp.
+        """
+        session = self.tracker.session
+        totals = self._filter(
+            session.query(
+                func.count(UsageTracker.id),
+                func.coalesce(func.sum(UsageTracker.cost), 0.0),
+                func.coalesce(func.sum(UsageTracker.total_tokens), 0),
+                func.coalesce(func.sum(UsageTracker.reasoning_tokens), 0),
+                func.coalesce(func.sum(UsageTracker.cache_creation_tokens), 0),
+                func.coalesce(func.sum(UsageTracker.cache_read_tokens), 0),
+                func.coalesce(func.sum(UsageTracker.audio_tokens), 0),
+            ),
+            user_id,
+            since,
+            until,
+        ).one()
+        (
+            total_records,
+            total_cost,
+            total_tokens,
+            reasoning_tokens,
+            cache_creation,
+            cache_read,
+            audio_tokens,
+        ) = totals
         
-        if not data:
+        if not total_records:
             return {
                 "total_records": 0,
                 "total_cost": 0.0,
@@ -51,159 +109,197 @@ class CostReporter:
                 "token_details": {}
             }
         
-        total_cost = sum(item.cost for item in data)
-        total_tokens = 0
-        model_breakdown = {}
-        token_details = {
-            "reasoning_tokens": 0,
-            "cache_creation": 0,
-            "cache_read": 0,
-            "audio_tokens": 0
-        }
-        
-        for record in data:
-            # Extract tokens from usage_metadata_json
-            if record.usage_metadata_json:
-                try:
-                    usage_metadata = json.loads(record.usage_metadata_json)
-                    token_info = self.get_tokens_from_usage_metadata(usage_metadata)
-                    total_tokens += token_info.get("total_tokens", 0)
-                    
-                    # Extract detailed token info
-                    details = self.get_token_details_from_usage_metadata(usage_metadata)
-                    for key, value in details.items():
-                        token_details[key] += value
-                except (json.JSONDecodeError, KeyError):
-                    continue
-            
-            # Model breakdown
-            model = record.model_name or "unknown"
-            model_breakdown[model] = model_breakdown.get(model, 0) + record.cost
+        model = func.coalesce(UsageTracker.model_name, "unknown")
+        model_breakdown = dict(
+            self._filter(
+                session.query(model, func.sum(UsageTracker.cost)).group_by(model),
+                user_id,
+                since,
+                until,
+            ).all()
+        )
         
         return {
-            "total_records": len(data),
+            "total_records": total_records,
             "total_cost": total_cost,
             "total_tokens": total_tokens,
             "model_breakdown": model_breakdown,
-            "token_details": token_details
+            "token_details": {
+                "reasoning_tokens": reasoning_tokens,
+                "cache_creation": cache_creation,
+                "cache_read": cache_read,
+                "audio_tokens": audio_tokens
+            }
         }
+
+    def _grouped_totals(
+        self,
+        key,
+        limit: Optional[int] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[tuple]:
+        """Get ``(key, cost, tokens, calls)`` rows grouped by a column, by cost."""
+        total_cost = func.coalesce(func.sum(UsageTracker.cost), 0.0)
+        query = self._filter(
+            self.tracker.session.query(
+                key,
+                total_cost,
+                func.coalesce(func.sum(UsageTracker.total_tokens), 0),
+                func.count(UsageTracker.id),
+            ).group_by(key),
+            since=since,
+            until=until,
+        ).order_by(total_cost.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all()
     
-    def get_top_users_by_cost(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top users by cost."""
-        data = self.tracker.session.query(UsageTracker).all()
-        
-        # Group by user_id
-        user_costs = {}
-        for record in data:
-            user_id = record.user_id
-            if user_id not in user_costs:
-                user_costs[user_id] = {
-                    "user_id": user_id,
-                    "total_cost": 0.0,
-                    "total_tokens": 0,
-                    "total_calls": 0,
-                    "models_used": set()
-                }
-            
-            user_costs[user_id]["total_cost"] += record.cost
-            user_costs[user_id]["total_calls"] += 1
-            user_costs[user_id]["models_used"].add(record.model_name or "unknown")
-            
-            # Extract tokens from usage_metadata_json
-            if record.usage_metadata_json:
-                try:
-                    usage_metadata = json.loads(record.usage_metadata_json)
-                    token_info = self.get_tokens_from_usage_metadata(usage_metadata)
-                    user_costs[user_id]["total_tokens"] += token_info.get("total_tokens", 0)
-                except (json.JSONDecodeError, KeyError):
-                    continue
+    def get_top_users_by_cost(
+        self,
+        limit: int = 10,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get top users by cost.
+
+        Args:
+            limit: Maximum number of users to return.
+            since: Only include usage at or after this Unix timestamp.
+            until: Only include usage before this Unix timestamp.
+        """
+        rows = self._grouped_totals(UsageTracker.user_id, limit, since, until)
         
-        # Convert sets to lists and sort by cost
-        result = []
-        for user_data in user_costs.values():
-            user_data["models_used"] = list(user_data["models_used"])
-            result.append(user_data)
+        models_used = {user_id: set() for user_id, *_ in rows}
+        if models_used:
+            pairs = self._filter(
+                self.tracker.session.query(
+                    UsageTracker.user_id,
+                    func.coalesce(UsageTracker.model_name, "unknown"),
+                )
+                .filter(UsageTracker.user_id.in_(list(models_used)))
+                .distinct(),
+                since=since,
+                until=until,
+            )
+            for user_id, model_name in pairs:
+                models_used[user_id].add(model_name)
         
-        return sorted(result, key=lambda x: x["total_cost"], reverse=True)[:limit]
+        return [
+            {
+                "user_id": user_id,
+                "total_cost": total_cost,
+                "total_tokens": total_tokens,
+                "total_calls": total_calls,
+                "models_used": list(models_used[user_id])
+            }
+            for user_id, total_cost, total_tokens, total_calls in rows
+        ]
     
-    def get_top_agents_by_cost(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get top agents by cost."""
-        data = self.tracker.session.query(UsageTracker).all()
-        
-        # Group by agent_name
-        agent_costs = {}
-        for record in data:
-            agent_name = record.agent_name or "unknown"
-            if agent_name not in agent_costs:
-                agent_costs[agent_name] = {
-                    "agent_name": agent_name,
-                    "total_cost": 0.0,
-                    "total_tokens": 0,
-                    "total_calls": 0
-                }
-            
-            agent_costs[agent_name]["total_cost"] += record.cost
-            agent_costs[agent_name]["total_calls"] += 1
-            
-            # Extract tokens from usage_metadata_json
-            if record.usage_metadata_json:
-                try:
-                    usage_metadata = json.loads(record.usage_metadata_json)
-                    token_info = self.get_tokens_from_usage_metadata(usage_metadata)
-                    agent_costs[agent_name]["total_tokens"] += token_info.get("total_tokens", 0)
-                except (json.JSONDecodeError, KeyError):
-                    continue
-        
-        # Sort by cost
-        result = list(agent_costs.values())
-        return sorted(result, key=lambda x: x["total_cost"], reverse=True)[:limit]
+    def get_top_agents_by_cost(
+        self,
+        limit: int = 10,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get top agents by cost.
+
+        Args:
+            limit: Maximum number of agents to return.
+            since: Only include usage at or after this Unix timestamp.
+            until: Only include usage before this Unix timestamp.
+        """
+        agent = func.coalesce(UsageTracker.agent_name, "unknown")
+        return [
+            {
+                "agent_name": agent_name,
+                "total_cost": total_cost,
+                "total_tokens": total_tokens,
+                "total_calls": total_calls
+            }
+            for agent_name, total_cost, total_tokens, total_calls in self._grouped_totals(
+                agent, limit, since, until
+            )
+        ]
     
-    def get_model_statistics(self) -> Dict[str, Any]:
-        """Get model usage statistics."""
-        data = self.tracker.session.query(UsageTracker).all()
-        
-        model_stats = {}
-        for record in data:
-            model_name = record.model_name or "unknown"
-            if model_name not in model_stats:
-                model_stats[model_name] = {
-                    "model_name": model_name,
-                    "total_cost": 0.0,
-                    "total_tokens": 0,
-                    "total_calls": 0
-                }
-            
-            model_stats[model_name]["total_cost"] += record.cost
-            model_stats[model_name]["total_calls"] += 1
-            
-            # Extract tokens from usage_metadata_json
-            if record.usage_metadata_json:
-                try:
-                    usage_metadata = json.loads(record.usage_metadata_json)
-                    token_info = self.get_tokens_from_usage_metadata(usage_metadata)
-                    model_stats[model_name]["total_tokens"] += token_info.get("total_tokens", 0)
-                except (json.JSONDecodeError, KeyError):
-                    continue
-        
-        return model_stats
+    def get_model_statistics(
+        self,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Get model usage statistics.
+
+        Args:
+            since: Only include usage at or after this Unix timestamp.
+            until: Only include usage before this Unix timestamp.
+        """
+        model = func.coalesce(UsageTracker.model_name, "unknown")
+        return {
+            model_name: {
+                "model_name": model_name,
+                "total_cost": total_cost,
+                "total_tokens": total_tokens,
+                "total_calls": total_calls
+            }
+            for model_name, total_cost, total_tokens, total_calls in self._grouped_totals(
+                model, since=since, until=until
+            )
+        }
     
-    def export_data(self, output_path: str, format: str = "json") -> bool:
-        """Export cost data to file."""
+    def export_data(
+        self,
+        output_path: str,
+        format: str = "json",
+        user_id: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        compress: Optional[bool] = None,
+        chunk_size: int = 1000,
+    ) -> bool:
+        """Export cost data to file.
+
+        Rows are read from the database in chunks and written as they arrive,
+        so memory use stays constant regardless of the size of the usage table.
+
+        Args:
+            output_path: File to write to.
+            format: ``json`` (a single array), ``jsonl`` (one record per line) or ``csv``.
+            user_id: Only export usage of this user.
+            since: Only export usage at or after this Unix timestamp.
+            until: Only export usage before this Unix timestamp.
+            compress: Gzip the output. Defaults to True if ``output_path`` ends in ``.gz``.
+            chunk_size: Number of rows fetched from the database per round trip.
+
+        Returns:
+            bool: Whether the export succeeded.
+        """
         try:
-            data = self.tracker.get_all_data()
-            
-            if format == "json":
-                with open(output_path, 'w') as f:
-                    json.dump(data, f, indent=2, default=str)
-            elif format == "csv":
-                import csv
-                if data:
-                    with open(output_path, 'w', newline='') as f:
-                        writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                        writer.writeheader()
-                        writer.writerows(data)
-            else:
+            if format not in EXPORT_FORMATS:
                 raise ValueError(f"Unsupported format: {format}")
+            if compress is None:
+                compress = output_path.endswith(".gz")
+
+            rows = self.tracker.iter_all_data(
+                chunk_size=chunk_size, user_id=user_id, since=since, until=until
+            )
+            opener = gzip.open if compress else open
+            
+            with opener(output_path, 'wt', newline='') as f:
+                if format == "json":
+                    f.write("[")
+                    for i, row in enumerate(rows):
+                        f.write(",\n  " if i else "\n  ")
+                        f.write(json.dumps(row, default=str))
+                    f.write("\n]\n")
+                elif format == "jsonl":
+                    for row in rows:
+                        f.write(json.dumps(row, default=str))
+                        f.write("\n")
+                else:
+                    writer = csv.DictWriter(f, fieldnames=USAGE_RECORD_FIELDS)
+                    writer.writeheader()
+                    for row in rows:
+                        writer.writerow(row)
             
             return True
         except Exception as e:
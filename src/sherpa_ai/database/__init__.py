@@ -1,7 +1,8 @@
 """Database module for Sherpa AI.
 
 This module provides database functionality for tracking user usage and managing whitelists.
-It exports the UserUsageTracker class which handles token usage tracking on a per-user basis.
+It exports the UserUsageTracker class which handles token usage tracking on a per-user basis,
+and get_usage_tracker, which returns the process-wide tracker used by the LLM wrappers.
 
 Example:
     >>> from sherpa_ai.database import UserUsageTracker
@@ -10,7 +11,8 @@ Example:
     {'token-left': 900, 'can_execute': True, 'message': '', 'time_left': '23 hours : 59 min : 59 sec'}
 """
 
-from sherpa_ai.database.user_usage_tracker import UserUsageTracker
+from sherpa_ai.database.usage_writer import UsageWriter
+from sherpa_ai.database.user_usage_tracker import UserUsageTracker, get_usage_tracker
 
 
-__all__ = ["UserUsageTracker"]
+__all__ = ["UserUsageTracker", "UsageWriter", "get_usage_tracker"]
@@ -0,0 +1,253 @@
+"""Background writer for batching usage records into the database."""
+
+import atexit
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+# Sentinel telling the writer thread to write what it has and exit
+_STOP = object()
+
+
+class UsageWriter:
+    """Batch usage records on a background thread and insert them in bulk.
+
+    Records are queued by ``submit`` and written with a single executemany
+    insert once ``batch_size`` records are pending or ``flush_interval`` seconds
+    have passed since the first pending record, whichever comes first. Pending
+    records are written when the writer is closed, which also happens at
+    interpreter shutdown.
+
+    If the insert fails, the records of the batch are inserted one at a time so
+    that a single bad record does not lose the others. Records that still fail
+    are kept and retried with the next batch, up to ``max_retries`` times.
+
+    Attributes:
+        engine: SQLAlchemy engine the records are written with.
+        table: Mapped class or table the records are inserted into.
+        batch_size (int): Maximum number of records written per insert.
+        flush_interval (float): Maximum seconds a record waits before being written.
+        max_retries (int): Number of later batches a record that failed to be
+            inserted is retried with before it is dropped.
+        on_write (Optional[Callable]): Called with the session and records of every
+            batch after they are inserted, in the same transaction.
+        on_flush (Optional[Callable]): Called with the ``(record, context)`` pairs
+            of every batch after it has been committed.
+
+    Example:
+        >>> writer = UsageWriter(engine, UsageTracker, batch_size=50)
+        >>> writer.submit({"user_id": "user123", "cost": 0.01})
+        >>> writer.flush()
+        True
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        table: Any,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        on_write: Optional[Callable[[Any, List[Dict[str, Any]]], None]] = None,
+        on_flush: Optional[Callable[[List[Tuple[Dict[str, Any], Any]]], None]] = None,
+    ):
+        self.engine = engine
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.on_write = on_write
+        self.on_flush = on_flush
+
+        self._session_factory = sessionmaker(bind=engine)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        # Failed attempts of the records kept for a retry, by record id
+        self._attempts: Dict[int, int] = {}
+        self._thread = threading.Thread(
+            target=self._run, name="sherpa-usage-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the writer has been closed."""
+        return self._closed
+
+    def submit(self, record: Dict[str, Any], context: Any = None):
+        """Queue a record to be written.
+
+        Args:
+            record (Dict[str, Any]): Column values of the row to insert.
+            context (Any): Opaque value handed back to ``on_flush`` with the record.
+
+        Raises:
+            RuntimeError: If the writer has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit usage to a closed UsageWriter")
+        self._queue.put((record, context))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every record submitted so far has been written.
+
+        Records that failed to be inserted are kept for the next batch, so they
+        may still be pending when this returns.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the records were written before the timeout.
+        """
+        if self._closed:
+            return not self._thread.is_alive()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Write pending records and stop the writer thread.
+
+        Args:
+            timeout (Optional[float]): Maximum seconds to wait for the thread.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self):
+        batch = []
+        waiters = []
+        deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                failed = self._write(batch)
+                if failed:
+                    logger.error(
+                        f"Dropping {len(failed)} usage records that could not be "
+                        "written before the writer was closed"
+                    )
+                for waiter in waiters:
+                    waiter.set()
+                return
+
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+            elif deadline is not None and time.monotonic() < deadline:
+                continue
+
+            # Batch is full, the interval elapsed or a flush was requested. Drain
+            # whatever else is already queued into this write when flushing.
+            if waiters:
+                stop = self._drain(batch, waiters)
+                if stop:
+                    self._queue.put(_STOP)
+
+            batch = self._keep_for_retry(self._write(batch))
+            deadline = time.monotonic() + self.flush_interval if batch else None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+    def _drain(self, batch: list, waiters: list) -> bool:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return False
+            if item is _STOP:
+                return True
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                batch.append(item)
+
+    def _write(
+        self, batch: List[Tuple[Dict[str, Any], Any]]
+    ) -> List[Tuple[Dict[str, Any], Any]]:
+        if not batch:
+            return []
+
+        try:
+            self._insert(batch)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Error writing usage record: {str(e)}")
+                return batch
+            logger.warning(
+                f"Error writing {len(batch)} usage records, writing them one at a "
+                f"time: {str(e)}"
+            )
+            written, failed = [], []
+            for item in batch:
+                try:
+                    self._insert([item])
+                except Exception as e:
+                    logger.error(f"Error writing usage record: {str(e)}")
+                    failed.append(item)
+                else:
+                    written.append(item)
+        else:
+            written, failed = batch, []
+
+        if written and self.on_flush:
+            try:
+                self.on_flush(written)
+            except Exception as e:
+                logger.error(f"Error in usage writer flush callback: {e}")
+        return failed
+
+    def _insert(self, batch: List[Tuple[Dict[str, Any], Any]]):
+        records = [record for record, _ in batch]
+        session = self._session_factory()
+        try:
+            session.execute(insert(self.table), records)
+            if self.on_write:
+                self.on_write(session, records)
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _keep_for_retry(
+        self, failed: List[Tuple[Dict[str, Any], Any]]
+    ) -> List[Tuple[Dict[str, Any], Any]]:
+        kept = []
+        attempts = {}
+        for item in failed:
+            count = self._attempts.get(id(item), 0) + 1
+            if count > self.max_retries:
+                logger.error(
+                    f"Dropping usage record after {count} failed writes: {item[0]}"
+                )
+                continue
+            kept.append(item)
+            attempts[id(item)] = count
+        # Kept records stay referenced by the next batch, so their ids are unique
+        self._attempts = attempts
+        return kept
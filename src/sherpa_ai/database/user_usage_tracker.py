@@ -1,20 +1,54 @@
 """User usage tracking module for Sherpa AI."""
 
 import json
+import threading
 import time
-from typing import Dict, Any, Optional, List
-from sqlalchemy import Boolean, Column, Integer, String, Float, Text, create_engine
+from typing import Dict, Any, Iterator, Optional, List
+from sqlalchemy import (
+    Boolean,
+    bindparam,
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    create_engine,
+    func,
+    inspect,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
 import sherpa_ai.config as cfg
 from sherpa_ai.cost_tracking.pricing import PricingManager
 from sherpa_ai.cost_tracking.logger import UsageLogger
 from sherpa_ai.cost_tracking.backup import DatabaseBackup
+from sherpa_ai.database.usage_writer import UsageWriter
 from loguru import logger
 
 Base = declarative_base()
 
+# Width in seconds of the time buckets that per-user usage is aggregated into
+USAGE_WINDOW_BUCKET_SECONDS = 60
+
+# Fields of the usage records returned by get_all_data and iter_all_data
+USAGE_RECORD_FIELDS = (
+    "id",
+    "user_id",
+    "cost",
+    "model_name",
+    "session_id",
+    "agent_name",
+    "timestamp",
+    "reset_timestamp",
+    "reminded_timestamp",
+    "usage_metadata_json",
+)
+
 
 class UsageTracker(Base):
     """SQLAlchemy model for tracking LLM token usage."""
@@ -30,6 +64,34 @@ class UsageTracker(Base):
     reset_timestamp = Column(Boolean, default=False)
     reminded_timestamp = Column(Boolean, default=False)
     usage_metadata_json = Column(Text, default=None)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    reasoning_tokens = Column(Integer, default=0)
+    cache_creation_tokens = Column(Integer, default=0)
+    cache_read_tokens = Column(Integer, default=0)
+    audio_tokens = Column(Integer, default=0)
+
+    __table_args__ = (
+        Index("ix_usage_tracker_user_id_timestamp", "user_id", "timestamp"),
+    )
+
+
+class UsageWindow(Base):
+    """SQLAlchemy model for per-user usage aggregated into fixed time buckets.
+
+    Maintained on every usage write so that windowed quota checks read a bounded
+    number of buckets instead of scanning a user's whole history.
+    """
+    __tablename__ = "usage_window"
+
+    user_id = Column(String, primary_key=True)
+    bucket_start = Column(Integer, primary_key=True)
+    input_tokens = Column(Integer, default=0)
+    output_tokens = Column(Integer, default=0)
+    total_tokens = Column(Integer, default=0)
+    cost = Column(Float, default=0.0)
+    calls = Column(Integer, default=0)
 
 
 class Whitelist(Base):
@@ -40,13 +102,238 @@ class Whitelist(Base):
     user_id = Column(String, nullable=False, unique=True)
 
 
+def token_columns_from_usage_metadata(
+    usage_metadata: Dict[str, Any],
+    input_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None,
+) -> Dict[str, int]:
+    """Get the token counts stored in their own usage columns.
+
+    Args:
+        usage_metadata (Dict[str, Any]): Usage metadata of the call.
+        input_tokens (Optional[int]): Input tokens, read from the metadata if None.
+        output_tokens (Optional[int]): Output tokens, read from the metadata if None.
+
+    Returns:
+        Dict[str, int]: Values of the promoted token columns.
+    """
+    if input_tokens is None:
+        input_tokens = usage_metadata.get("input_tokens", 0)
+    if output_tokens is None:
+        output_tokens = usage_metadata.get("output_tokens", 0)
+    input_details = usage_metadata.get("input_token_details") or {}
+    output_details = usage_metadata.get("output_token_details") or {}
+    return {
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": usage_metadata.get("total_tokens", input_tokens + output_tokens),
+        "reasoning_tokens": output_details.get("reasoning", 0),
+        "cache_creation_tokens": input_details.get("cache_creation", 0),
+        "cache_read_tokens": input_details.get("cache_read", 0),
+        "audio_tokens": input_details.get("audio", 0) + output_details.get("audio", 0),
+    }
+
+
+def _bucket_start(timestamp: int) -> int:
+    """Get the start of the usage window bucket containing a timestamp."""
+    return timestamp - timestamp % USAGE_WINDOW_BUCKET_SECONDS
+
+
+def _upsert_insert(dialect_name: str) -> Optional[Any]:
+    """Get the insert construct supporting ON CONFLICT of a dialect, if any."""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+
+        return insert
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        return insert
+    return None
+
+
+def update_usage_windows(session: Any, records: List[Dict[str, Any]]):
+    """Add usage records to the per-user window buckets.
+
+    Records falling into the same bucket are combined, so a batch costs one
+    statement per (user, bucket). On SQLite and PostgreSQL buckets are upserted,
+    so concurrent writers can add the first record of the same bucket. Must be
+    called in the transaction that inserts the records.
+
+    Args:
+        session: Session the records are being written with.
+        records (List[Dict[str, Any]]): Column values of the inserted usage rows.
+    """
+    increments = {}
+    for record in records:
+        key = (record["user_id"], _bucket_start(record["timestamp"]))
+        totals = increments.setdefault(key, [0, 0, 0, 0.0, 0])
+        totals[0] += record.get("input_tokens") or 0
+        totals[1] += record.get("output_tokens") or 0
+        totals[2] += record.get("total_tokens") or 0
+        totals[3] += record.get("cost") or 0.0
+        totals[4] += 1
+    if not increments:
+        return
+
+    rows = [
+        dict(
+            user_id=user_id,
+            bucket_start=bucket_start,
+            input_tokens=totals[0],
+            output_tokens=totals[1],
+            total_tokens=totals[2],
+            cost=totals[3],
+            calls=totals[4],
+        )
+        for (user_id, bucket_start), totals in increments.items()
+    ]
+    counters = ("input_tokens", "output_tokens", "total_tokens", "cost", "calls")
+
+    insert = _upsert_insert(session.get_bind().dialect.name)
+    if insert is not None:
+        statement = insert(UsageWindow.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "bucket_start"],
+            set_={
+                name: getattr(UsageWindow.__table__.c, name)
+                + getattr(statement.excluded, name)
+                for name in counters
+            },
+        )
+        session.execute(statement, rows)
+        return
+
+    for row in rows:
+        result = session.execute(
+            update(UsageWindow)
+            .where(
+                UsageWindow.user_id == row["user_id"],
+                UsageWindow.bucket_start == row["bucket_start"],
+            )
+            .values(
+                **{name: getattr(UsageWindow, name) + row[name] for name in counters}
+            )
+        )
+        if result.rowcount == 0:
+            session.add(UsageWindow(**row))
+    session.flush()
+
+
+def _upgrade_schema(engine: Any):
+    """Create the usage tables and bring databases from older versions up to date.
+
+    Adds the token columns promoted out of ``usage_metadata_json`` and the
+    ``(user_id, timestamp)`` index, backfilling existing rows, and builds the
+    usage window buckets from the existing history the first time they are
+    created.
+    """
+    inspector = inspect(engine)
+    had_usage_table = inspector.has_table(UsageTracker.__tablename__)
+    had_window_table = inspector.has_table(UsageWindow.__tablename__)
+
+    missing_columns = []
+    if had_usage_table:
+        existing = {
+            column["name"]
+            for column in inspector.get_columns(UsageTracker.__tablename__)
+        }
+        missing_columns = [
+            column
+            for column in UsageTracker.__table__.columns
+            if column.name not in existing
+        ]
+
+    with engine.begin() as connection:
+        for column in missing_columns:
+            column_type = column.type.compile(engine.dialect)
+            default = " DEFAULT 0" if isinstance(column.type, Integer) else ""
+            connection.execute(
+                text(
+                    f"ALTER TABLE {UsageTracker.__tablename__} "
+                    f"ADD COLUMN {column.name} {column_type}{default}"
+                )
+            )
+
+    # Creates missing tables with their indexes, existing ones are left untouched
+    Base.metadata.create_all(engine)
+    if had_usage_table:
+        # create_all only builds the indexes of the tables it creates
+        for index in UsageTracker.__table__.indexes:
+            index.create(engine, checkfirst=True)
+
+    if any(column.name.endswith("_tokens") for column in missing_columns):
+        _backfill_token_columns(engine)
+
+    if had_usage_table and not had_window_table:
+        bucket = (
+            UsageTracker.timestamp / USAGE_WINDOW_BUCKET_SECONDS
+        ) * USAGE_WINDOW_BUCKET_SECONDS
+        with engine.begin() as connection:
+            connection.execute(
+                UsageWindow.__table__.insert().from_select(
+                    [
+                        "user_id",
+                        "bucket_start",
+                        "input_tokens",
+                        "output_tokens",
+                        "total_tokens",
+                        "cost",
+                        "calls",
+                    ],
+                    select(
+                        UsageTracker.user_id,
+                        bucket,
+                        func.coalesce(func.sum(UsageTracker.input_tokens), 0),
+                        func.coalesce(func.sum(UsageTracker.output_tokens), 0),
+                        func.coalesce(func.sum(UsageTracker.total_tokens), 0),
+                        func.coalesce(func.sum(UsageTracker.cost), 0.0),
+                        func.count(),
+                    ).group_by(UsageTracker.user_id, bucket),
+                )
+            )
+
+
+def _backfill_token_columns(engine: Any):
+    """Fill the promoted token columns of existing rows from their usage metadata."""
+    table = UsageTracker.__table__
+    with engine.begin() as connection:
+        rows = connection.execute(
+            select(table.c.id, table.c.usage_metadata_json).where(
+                table.c.usage_metadata_json.is_not(None)
+            )
+        )
+        updates = []
+        for row_id, usage_metadata_json in rows:
+            try:
+                usage_metadata = json.loads(usage_metadata_json)
+            except (json.JSONDecodeError, TypeError):
+                continue
+            columns = token_columns_from_usage_metadata(usage_metadata)
+            update_values = {f"new_{name}": value for name, value in columns.items()}
+            update_values["row_id"] = row_id
+            updates.append(update_values)
+        if updates:
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("row_id"))
+                .values(
+                    {
+                        name: bindparam(f"new_{name}")
+                        for name in token_columns_from_usage_metadata({})
+                    }
+                ),
+                updates,
+            )
+
+
 class UserUsageTracker:
     """Clean, minimal usage tracker with essential functionality only."""
 
     def __init__(
         self,
-        db_name: str = cfg.DB_NAME,
-        db_url: str = cfg.DB_URL,
+        db_name: Optional[str] = None,
+        db_url: Optional[str] = None,
         bucket_name: Optional[str] = None,
         s3_file_key: Optional[str] = None,
         log_to_s3: bool = None,
@@ -56,10 +343,15 @@ class UserUsageTracker:
         engine: Optional[Any] = None,
         session: Optional[Any] = None,
         verbose_logger: Optional[Any] = None,
+        writer: Optional[UsageWriter] = None,
     ):
-        """Initialize the clean UserUsageTracker."""
-        self.db_name = db_name
-        self.db_url = db_url
+        """Initialize the clean UserUsageTracker.
+
+        When a ``writer`` is given, ``add_usage`` queues records on it instead of
+        committing each one, and S3 backups and reminders run after each batch.
+        """
+        self.db_name = db_name or cfg.DB_NAME
+        self.db_url = db_url or cfg.DB_URL
         
         # Use provided engine/session or create new ones
         if engine is not None:
@@ -89,7 +381,9 @@ class UserUsageTracker:
             self.verbose_logger = verbose_logger
 
         # Create tables
-        Base.metadata.create_all(self.engine)
+        _upgrade_schema(self.engine)
+
+        self.writer = writer
         
         # Configuration
         self.max_daily_token = cfg.DAILY_TOKEN_LIMIT
@@ -125,7 +419,8 @@ class UserUsageTracker:
         check_limits: bool = True,
         send_reminder: bool = True,
         reset_timestamp: bool = False,
-        reminded_timestamp: bool = False
+        reminded_timestamp: bool = False,
+        verbose_logger: Optional[Any] = None
     ) -> Optional[Dict[str, Any]]:
         """Unified method to add usage data with optional limit checking.
 
@@ -142,6 +437,7 @@ class UserUsageTracker:
             send_reminder: Whether to send reminder if approaching limits.
             reset_timestamp: Whether to reset the timestamp.
             reminded_timestamp: Whether to mark as reminded.
+            verbose_logger: Logger for the reminder, defaults to the tracker's own.
             
         Returns:
             dict: Usage information if check_limits=True, None otherwise.
@@ -167,36 +463,51 @@ class UserUsageTracker:
                 "total_tokens": input_tokens + output_tokens
             }
         usage_metadata_json = json.dumps(usage_metadata)
-        
-        try:
-            # Try with usage_metadata_json column
-            data = UsageTracker(
+        record = {
+            "user_id": user_id,
+            "cost": cost,
+            "model_name": model_name or "unknown",
+            "session_id": session_id,
+            "agent_name": agent_name,
+            "timestamp": int(time.time()),
+            "reset_timestamp": reset_timestamp,
+            "reminded_timestamp": reminded_timestamp,
+            "usage_metadata_json": usage_metadata_json,
+            **token_columns_from_usage_metadata(
+                usage_metadata, input_tokens, output_tokens
+            ),
+        }
+
+        if self.writer is not None:
+            self.writer.submit(record, context=(send_reminder, verbose_logger))
+            self.usage_logger.log_usage(
                 user_id=user_id,
                 cost=cost,
                 model_name=model_name or "unknown",
                 session_id=session_id,
                 agent_name=agent_name,
-                reset_timestamp=reset_timestamp,
-                reminded_timestamp=reminded_timestamp,
-                usage_metadata_json=usage_metadata_json
+                usage_metadata=usage_metadata
             )
-            self.session.add(data)
+            if check_limits:
+                # Limits are checked against the database, so the queued record
+                # has to be written first
+                self.writer.flush()
+                return self.check_usage(user_id, input_tokens, output_tokens, usage_metadata)
+            return None
+        
+        try:
+            # Try with usage_metadata_json column
+            self.session.add(UsageTracker(**record))
+            update_usage_windows(self.session, [record])
             self.session.commit()
         except Exception as e:
             # Handle case where database doesn't have usage_metadata_json column
             if "usage_metadata_json" in str(e):
                 # Retry without usage_metadata_json
                 self.session.rollback()
-                data = UsageTracker(
-                    user_id=user_id,
-                    cost=cost,
-                    model_name=model_name or "unknown",
-                    session_id=session_id,
-                    agent_name=agent_name,
-                    reset_timestamp=reset_timestamp,
-                    reminded_timestamp=reminded_timestamp
-                )
-                self.session.add(data)
+                record.pop("usage_metadata_json")
+                self.session.add(UsageTracker(**record))
+                update_usage_windows(self.session, [record])
                 self.session.commit()
             else:
                 raise
@@ -218,11 +529,11 @@ class UserUsageTracker:
         if check_limits:
             result = self.check_usage(user_id, input_tokens, output_tokens, usage_metadata)
             if send_reminder:
-                self._send_reminder(user_id)
+                self._send_reminder(user_id, verbose_logger)
             return result
         
         if send_reminder:
-            self._send_reminder(user_id)
+            self._send_reminder(user_id, verbose_logger)
         
         return None
     
@@ -336,53 +647,86 @@ class UserUsageTracker:
         return [{"id": item.id, "user_id": item.user_id} for item in data]
     
     def _get_sum_of_tokens_since_last_reset(self, user_id: str) -> int:
-        """Get total tokens used since last reset."""
-        data = self._get_data_since_last_reset(user_id)
-        if not data:
-            return 0
-        
-        total_tokens = 0
-        for record in data:
-            if record.usage_metadata_json:
-                try:
-                    usage_metadata = json.loads(record.usage_metadata_json)
-                    total_tokens += usage_metadata.get("total_tokens", 0)
-                except (json.JSONDecodeError, KeyError):
-                    continue
-        
-        return total_tokens
+        """Get total tokens used within the last ``limit_time_size_in_hours``.
+
+        Whole buckets inside the window are read from the usage window table and
+        only the partial bucket at the start of the window is summed from the
+        usage rows, so the cost does not grow with the user's history.
+        """
+        window_start = int(time.time() - self.limit_time_size_in_hours * 3600)
+        # Start of the first bucket that lies entirely inside the window
+        first_bucket = -(-window_start // USAGE_WINDOW_BUCKET_SECONDS) * USAGE_WINDOW_BUCKET_SECONDS
+
+        bucket_tokens = self.session.query(
+            func.coalesce(func.sum(UsageWindow.total_tokens), 0)
+        ).filter(
+            UsageWindow.user_id == user_id,
+            UsageWindow.bucket_start >= first_bucket,
+        ).scalar()
+
+        edge_tokens = 0
+        if first_bucket > window_start:
+            edge_tokens = self.session.query(
+                func.coalesce(func.sum(UsageTracker.total_tokens), 0)
+            ).filter(
+                UsageTracker.user_id == user_id,
+                UsageTracker.timestamp >= window_start,
+                UsageTracker.timestamp < first_bucket,
+            ).scalar()
+
+        return int(bucket_tokens + edge_tokens)
     
     def _get_data_since_last_reset(self, user_id: str) -> List[UsageTracker]:
         """Get data since last reset for a user."""
         return self.session.query(UsageTracker).filter_by(user_id=user_id).all()
     
-    def _send_reminder(self, user_id: str):
+    def _send_reminder(self, user_id: str, verbose_logger: Optional[Any] = None):
         """Send reminder if user is approaching limits."""
         # Simple reminder logic - can be enhanced
         current_usage = self._get_sum_of_tokens_since_last_reset(user_id)
         if current_usage > self.max_daily_token * 0.75:  # 75% threshold
             message = f"Hi friend, you have used {current_usage} tokens out of {self.max_daily_token} daily limit. You are approaching your limit."
-            self.verbose_logger.log(message)
+            (verbose_logger or self.verbose_logger).log(message)
             logger.info(f"User {user_id} is approaching token limit: {current_usage}/{self.max_daily_token}")
     
     def get_all_data(self) -> List[Dict[str, Any]]:
         """Get all usage data."""
-        data = self.session.query(UsageTracker).all()
-        return [
-            {
-                "id": item.id,
-                "user_id": item.user_id,
-                "cost": item.cost,
-                "model_name": item.model_name,
-                "session_id": item.session_id,
-                "agent_name": item.agent_name,
-                "timestamp": item.timestamp,
-                "reset_timestamp": item.reset_timestamp,
-                "reminded_timestamp": item.reminded_timestamp,
-                "usage_metadata_json": item.usage_metadata_json
-            }
-            for item in data
-        ]
+        return list(self.iter_all_data())
+
+    def iter_all_data(
+        self,
+        chunk_size: int = 1000,
+        user_id: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over usage data, fetching rows from the database in chunks.
+
+        Rows are streamed from a server-side cursor where the database supports
+        one, so only ``chunk_size`` rows are held in memory at a time.
+
+        Args:
+            chunk_size (int): Number of rows fetched per round trip.
+            user_id (Optional[str]): Only include usage of this user.
+            since (Optional[int]): Only include usage at or after this Unix timestamp.
+            until (Optional[int]): Only include usage before this Unix timestamp.
+
+        Yields:
+            Dict[str, Any]: One usage record, with the keys in ``USAGE_RECORD_FIELDS``.
+        """
+        columns = [getattr(UsageTracker, field) for field in USAGE_RECORD_FIELDS]
+        query = self.session.query(*columns)
+        if user_id:
+            query = query.filter(UsageTracker.user_id == user_id)
+        if since is not None:
+            query = query.filter(UsageTracker.timestamp >= since)
+        if until is not None:
+            query = query.filter(UsageTracker.timestamp < until)
+        query = query.order_by(UsageTracker.id).execution_options(
+            stream_results=True, yield_per=chunk_size
+        )
+        for row in query:
+            yield dict(zip(USAGE_RECORD_FIELDS, row))
 
     def parse_usage_metadata(self, usage_metadata_json: str) -> Dict[str, Any]:
         """Parse usage metadata JSON string into structured data.
@@ -405,6 +749,21 @@ class UserUsageTracker:
     def close_connection(self):
         """Close the database connection and cleanup helpers."""
         self.session.close()
+
+    def _on_batch_written(self, batch: List[tuple]):
+        """Back up the database and send reminders once a queued batch is written."""
+        self.database_backup.upload_to_s3()
+
+        reminders = {}
+        for record, (send_reminder, verbose_logger) in batch:
+            if send_reminder:
+                reminders[(record["user_id"], id(verbose_logger))] = verbose_logger
+        for (user_id, _), verbose_logger in reminders.items():
+            self._send_reminder(user_id, verbose_logger)
+
+        if isinstance(self.session, scoped_session):
+            # Reminders ran on the writer thread, release its session
+            self.session.remove()
     
     # Backward compatibility methods (delegate to reporting module)
     def get_tokens_from_usage_metadata(self, usage_metadata: Dict[str, Any]) -> Dict[str, int]:
@@ -447,55 +806,75 @@ class UserUsageTracker:
     
     
 
+    def _sum_cost(self, *criteria) -> float:
+        """Get the total cost of the usage records matching the criteria."""
+        return self.session.query(
+            func.coalesce(func.sum(UsageTracker.cost), 0.0)
+        ).filter(*criteria).scalar()
+
     def get_user_cost(self, user_id: str) -> float:
         """Get total cost for a user."""
-        data = self._get_data_since_last_reset(user_id)
-        return sum(record.cost for record in data)
+        return self._sum_cost(UsageTracker.user_id == user_id)
 
     def get_session_cost(self, session_id: str) -> float:
         """Get total cost for a session."""
-        data = self.session.query(UsageTracker).filter_by(session_id=session_id).all()
-        return sum(record.cost for record in data)
+        return self._sum_cost(UsageTracker.session_id == session_id)
 
     def get_agent_cost(self, agent_name: str) -> float:
         """Get total cost for an agent."""
-        data = self.session.query(UsageTracker).filter_by(agent_name=agent_name).all()
-        return sum(record.cost for record in data)
+        return self._sum_cost(UsageTracker.agent_name == agent_name)
     
-    def get_cost_summary(self, user_id: str = None) -> dict:
-        """Get cost summary statistics."""
+    def get_cost_summary(
+        self,
+        user_id: str = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> dict:
+        """Get cost summary statistics.
+
+        Args:
+            user_id: Only summarize usage of this user.
+            since: Only include usage at or after this Unix timestamp.
+            until: Only include usage before this Unix timestamp.
+        """
+        criteria = []
         if user_id:
-            # Get summary for specific user
-            data = self._get_data_since_last_reset(user_id)
-            total_cost = sum(record.cost for record in data)
-            
-            # Calculate model breakdown
-            model_breakdown = {}
-            for record in data:
-                model_breakdown[record.model_name] = model_breakdown.get(record.model_name, 0) + record.cost
-            
-            return {
-                "total_cost": total_cost,
-                "user_id": user_id,
-                "total_records": len(data),
-                "model_breakdown": model_breakdown
-            }
-        else:
-            # Get summary for all users
-            all_data = self.session.query(UsageTracker).all()
-            total_cost = sum(record.cost for record in all_data)
-            user_costs = {}
-            model_breakdown = {}
-            for record in all_data:
-                user_costs[record.user_id] = user_costs.get(record.user_id, 0) + record.cost
-                model_breakdown[record.model_name] = model_breakdown.get(record.model_name, 0) + record.cost
+            criteria.append(UsageTracker.user_id == user_id)
+        if since is not None:
+            criteria.append(UsageTracker.timestamp >= since)
+        if until is not None:
+            criteria.append(UsageTracker.timestamp < until)
 
-            return {
-                "total_cost": total_cost,
-                "user_costs": user_costs,
-                "total_records": len(all_data),
-                "model_breakdown": model_breakdown
-            }
+        total_records, total_cost, total_tokens = self.session.query(
+            func.count(UsageTracker.id),
+            func.coalesce(func.sum(UsageTracker.cost), 0.0),
+            func.coalesce(func.sum(UsageTracker.total_tokens), 0),
+        ).filter(*criteria).one()
+        model_breakdown = dict(
+            self.session.query(UsageTracker.model_name, func.sum(UsageTracker.cost))
+            .filter(*criteria)
+            .group_by(UsageTracker.model_name)
+            .all()
+        )
+
+        summary = {
+            "total_cost": total_cost,
+            "total_records": total_records,
+            "total_tokens": total_tokens,
+            "total_calls": total_records,
+            "average_cost_per_call": total_cost / total_records if total_records else 0.0,
+            "model_breakdown": model_breakdown
+        }
+        if user_id:
+            summary["user_id"] = user_id
+        else:
+            summary["user_costs"] = dict(
+                self.session.query(UsageTracker.user_id, func.sum(UsageTracker.cost))
+                .filter(*criteria)
+                .group_by(UsageTracker.user_id)
+                .all()
+            )
+        return summary
     
     def estimate_cost(self, model_name: str, input_tokens: int, output_tokens: int) -> float:
         """Estimate cost for a model call."""
@@ -520,3 +899,47 @@ class UserUsageTracker:
         from sherpa_ai.cost_tracking.reporting import CostReporter
         reporter = CostReporter(self)
         return reporter.get_usage_metadata_statistics(user_id)
+
+
+_shared_trackers: Dict[str, UserUsageTracker] = {}
+_shared_trackers_lock = threading.Lock()
+
+
+def get_usage_tracker(db_url: Optional[str] = None) -> UserUsageTracker:
+    """Get the process-wide usage tracker for a database.
+
+    The tracker is created once per database URL and reused by every LLM call in
+    the process. It shares one pooled engine, uses a thread-local session per
+    caller and records usage through a background ``UsageWriter``, so recording
+    usage only queues a row instead of opening a connection and committing.
+
+    Args:
+        db_url (Optional[str]): Database URL, defaults to ``cfg.DB_URL``.
+
+    Returns:
+        UserUsageTracker: The shared tracker for the database.
+
+    Example:
+        >>> tracker = get_usage_tracker()
+        >>> tracker.add_usage(user_id="user123", input_tokens=10, check_limits=False)
+    """
+    db_url = db_url or cfg.DB_URL
+    with _shared_trackers_lock:
+        tracker = _shared_trackers.get(db_url)
+        if tracker is None or tracker.writer.closed:
+            engine = create_engine(db_url)
+            tracker = UserUsageTracker(
+                db_url=db_url,
+                engine=engine,
+                session=scoped_session(sessionmaker(bind=engine)),
+            )
+            tracker.writer = UsageWriter(
+                engine,
+                UsageTracker,
+                batch_size=cfg.USAGE_WRITER_BATCH_SIZE,
+                flush_interval=cfg.USAGE_WRITER_FLUSH_INTERVAL,
+                on_write=update_usage_windows,
+                on_flush=tracker._on_batch_written,
+            )
+            _shared_trackers[db_url] = tracker
+        return tracker
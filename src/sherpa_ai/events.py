@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import Any
+from typing import Any, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -213,3 +213,50 @@ def build_event(event_type: str, name: str, **kwargs) -> Event:
         return TriggerEvent(name=name, **kwargs)
     else:
         return GenericEvent(**kwargs, event_type=event_type, name=name)
+
+
+_EVENT_CLASSES = {
+    cls.__name__: cls
+    for cls in (GenericEvent, TriggerEvent, ActionStartEvent, ActionFinishEvent)
+}
+
+
+def dump_event(event: Event) -> Tuple[Optional[str], Any]:
+    """Convert an event to a compact picklable form.
+
+    Built-in events are converted to their class name and the fields that were
+    explicitly set, which is much smaller to pickle than a Pydantic model. Other
+    events are returned unchanged.
+
+    Args:
+        event (Event): The event to convert.
+
+    Returns:
+        Tuple[Optional[str], Any]: The converted event, rebuilt by ``load_event``.
+
+    Example:
+        >>> from sherpa_ai.events import build_event, dump_event, load_event
+        >>> event = build_event("message", "question", content="Hi")
+        >>> load_event(dump_event(event)) == event
+        True
+    """
+    name = type(event).__name__
+    if _EVENT_CLASSES.get(name) is type(event):
+        fields = {field: getattr(event, field) for field in event.model_fields_set}
+        return name, fields
+    return None, event
+
+
+def load_event(data: Tuple[Optional[str], Any]) -> Event:
+    """Rebuild an event converted by ``dump_event``.
+
+    Args:
+        data (Tuple[Optional[str], Any]): The converted event.
+
+    Returns:
+        Event: The rebuilt event.
+    """
+    name, payload = data
+    if name is None:
+        return payload
+    return _EVENT_CLASSES[name](**payload)
@@ -0,0 +1,44 @@
+"""Lazy exports for Sherpa AI packages.
+
+Package ``__init__`` modules use :func:`lazy_exports` to expose their public
+classes without importing the submodules defining them, so importing a package
+only loads the submodules that are actually used.
+
+Example:
+    >>> # In sherpa_ai/actions/__init__.py
+    >>> __getattr__, __dir__ = lazy_exports(
+    ...     __name__, {"ArxivSearch": "sherpa_ai.actions.arxiv_search"}
+    ... )
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Create the module ``__getattr__`` and ``__dir__`` of a package.
+
+    Args:
+        package (str): Name of the package, usually ``__name__``.
+        exports (Dict[str, str]): Module defining each exported name.
+
+    Returns:
+        Tuple[Callable[[str], object], Callable[[], List[str]]]: The
+            ``__getattr__`` and ``__dir__`` functions of the package.
+    """
+
+    def __getattr__(name: str) -> object:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name]), name)
+        # Cache the value so later lookups do not go through __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
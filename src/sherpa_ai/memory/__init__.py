@@ -12,8 +12,37 @@ Example:
     >>> belief.update("observation", "action")
 """
 
-from sherpa_ai.memory.belief import Belief
-from sherpa_ai.memory.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
 
+from sherpa_ai.lazy_imports import lazy_exports
 
-__all__ = ["SharedMemory", "Belief"]
+if TYPE_CHECKING:
+    from sherpa_ai.memory.belief import Belief
+    from sherpa_ai.memory.context import (
+        MostRecentTruncation,
+        PriorityTruncation,
+        SummarizeOldestTruncation,
+        TruncationStrategy,
+    )
+    from sherpa_ai.memory.shared_memory import SharedMemory
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Belief": "sherpa_ai.memory.belief",
+        "MostRecentTruncation": "sherpa_ai.memory.context",
+        "PriorityTruncation": "sherpa_ai.memory.context",
+        "SummarizeOldestTruncation": "sherpa_ai.memory.context",
+        "TruncationStrategy": "sherpa_ai.memory.context",
+        "SharedMemory": "sherpa_ai.memory.shared_memory",
+    },
+)
+
+__all__ = [
+    "SharedMemory",
+    "Belief",
+    "TruncationStrategy",
+    "MostRecentTruncation",
+    "PriorityTruncation",
+    "SummarizeOldestTruncation",
+]
@@ -6,20 +6,167 @@ It defines the Belief class which manages agent state, events, and internal reas
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+import heapq
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, List, Optional
 
 import pydash
 import transitions as ts
 from loguru import logger
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from sherpa_ai.events import Event, build_event
+from sherpa_ai.memory.context import (
+    ContextEntry,
+    MostRecentTruncation,
+    TruncationStrategy,
+)
 from sherpa_ai.memory.state_machine import SherpaStateMachine
 
 if TYPE_CHECKING:
     from sherpa_ai.actions.base import BaseAction
 
 
+def _event_key(event: Event) -> Hashable:
+    """Hashable key identifying events that compare equal."""
+    try:
+        return type(event), event.model_dump_json()
+    except Exception:
+        # Content that cannot be serialized to JSON falls back to its repr
+        return type(event), repr(event)
+
+
+# Types of observed events that make up the context of an agent
+CONTEXT_EVENT_TYPES = ("task", "result", "user_input")
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+def _render_context_line(event: Event) -> str:
+    return f"{event.name}: {event.content}({event.event_type})"
+
+
+class _EventIndex:
+    """Lookups over a list of events, kept up to date as the list grows.
+
+    The indexed list stays a plain list so that code appending to or replacing
+    ``Belief.events`` and ``Belief.internal_events`` keeps working. ``sync`` indexes
+    any events appended since the last call and rebuilds the index when the list
+    was replaced, shrunk or rewritten, so lookups cost O(new events) rather than
+    O(all events). Events are treated as immutable once they are in the list.
+
+    The rendered history line and token count of every event are cached as
+    well, so assembling a token budgeted history only touches the events that
+    end up in it.
+
+    Attributes:
+        dedup (bool): Whether to maintain the set of event keys used by ``contains``.
+        render (Optional[Callable[[Event], str]]): Renders the line of an event.
+            Defaults to the string of its dict form.
+    """
+
+    # Token counts are cached for this many distinct token counters at most
+    MAX_TOKEN_COUNTERS = 4
+
+    def __init__(
+        self, dedup: bool = False, render: Optional[Callable[[Event], str]] = None
+    ):
+        self.dedup = dedup
+        self.render = render
+        self.reset(None)
+
+    def reset(self, source: Optional[List[Event]]):
+        self.source = source
+        self.size = 0
+        self.last = None
+        self.by_type: Dict[str, List[int]] = {}
+        self.dumps: List[Optional[dict]] = []
+        self.lines: List[Optional[str]] = []
+        self.token_counts: Dict[Callable[[str], int], List[Optional[int]]] = {}
+        self.keys = set()
+
+    def sync(self, events: List[Event]):
+        if (
+            events is not self.source
+            or len(events) < self.size
+            or (self.size and events[self.size - 1] is not self.last)
+        ):
+            self.reset(events)
+
+        for position in range(self.size, len(events)):
+            event = events[position]
+            self.by_type.setdefault(event.event_type, []).append(position)
+            self.dumps.append(None)
+            self.lines.append(None)
+            if self.dedup:
+                self.keys.add(_event_key(event))
+
+        self.size = len(events)
+        self.last = events[-1] if events else None
+
+    def contains(self, event: Event) -> bool:
+        return _event_key(event) in self.keys
+
+    def positions(self, event_type: str) -> List[int]:
+        return self.by_type.get(event_type, [])
+
+    def dump(self, position: int) -> Dict[str, Any]:
+        dump = self.dumps[position]
+        if dump is None:
+            dump = self.dumps[position] = self.source[position].model_dump()
+        # Copy so callers modifying the result do not change the cached dump
+        return dict(dump)
+
+    def line(self, position: int) -> str:
+        line = self.lines[position]
+        if line is None:
+            if self.render is not None:
+                line = self.render(self.source[position])
+            else:
+                line = str(self.dump(position))
+            self.lines[position] = line
+        return line
+
+    def token_count(self, position: int, token_counter: Callable[[str], int]) -> int:
+        try:
+            counts = self.token_counts.get(token_counter)
+        except TypeError:
+            # Unhashable token counter, nothing to cache the counts under
+            return token_counter(self.line(position))
+
+        if counts is None:
+            if len(self.token_counts) >= self.MAX_TOKEN_COUNTERS:
+                self.token_counts.clear()
+            counts = self.token_counts[token_counter] = []
+        if len(counts) < self.size:
+            counts.extend([None] * (self.size - len(counts)))
+
+        count = counts[position]
+        if count is None:
+            count = counts[position] = token_counter(self.line(position))
+        return count
+
+    def history(
+        self,
+        token_counter: Callable[[str], int],
+        max_tokens: int,
+        exclude_types: Optional[List[str]] = None,
+    ) -> str:
+        """Join the most recent event lines until ``max_tokens`` is exceeded."""
+        excluded = set(exclude_types or [])
+        results = []
+        current_tokens = 0
+        for position in reversed(range(self.size)):
+            if self.source[position].event_type in excluded:
+                continue
+            results.append(self.line(position))
+            current_tokens += self.token_count(position, token_counter)
+            if current_tokens > max_tokens:
+                break
+        return "\n".join(reversed(results))
+
+
 class Belief(BaseModel):
     """Manages agent beliefs and state tracking.
 
@@ -55,6 +202,19 @@ class Belief(BaseModel):
     belief_data: Dict = Field(default_factory=dict)
     max_tokens: int = 4000
 
+    _event_index: _EventIndex = PrivateAttr(
+        default_factory=lambda: _EventIndex(dedup=True, render=_render_context_line)
+    )
+    _internal_index: _EventIndex = PrivateAttr(default_factory=_EventIndex)
+
+    def _indexed_events(self) -> _EventIndex:
+        self._event_index.sync(self.events)
+        return self._event_index
+
+    def _indexed_internal_events(self) -> _EventIndex:
+        self._internal_index.sync(self.internal_events)
+        return self._internal_index
+
     def update(self, observation: Event):
         """Update belief with a new observation event.
 
@@ -68,16 +228,28 @@ class Belief(BaseModel):
             >>> print(belief.events)
             [Event("observation", "user_input", "Hello")]
         """
-        if observation in self.events:
+        index = self._indexed_events()
+        if index.contains(observation):
             return
 
         self.events.append(observation)
+        index.sync(self.events)
 
-    def get_context(self, token_counter: Callable[[str], int]):
+    def get_context(
+        self,
+        token_counter: Callable[[str], int],
+        truncation: Optional[TruncationStrategy] = None,
+    ):
         """Get the context of the agent's belief state.
 
+        The context is made of the observed task, result and user_input events, one
+        line per event. The line and token count of each event are cached, and the
+        context is joined once after the truncation strategy picked its lines.
+
         Args:
             token_counter (Callable[[str], int]): Function to count tokens in text.
+            truncation (Optional[TruncationStrategy]): How to fit the events into
+                max_tokens. Defaults to MostRecentTruncation.
 
         Returns:
             str: Context string containing relevant events, truncated if exceeding max_tokens.
@@ -90,20 +262,24 @@ class Belief(BaseModel):
             >>> print(context)
             'current_task: Analyze data(task)'
         """  # noqa: E501
-        context = ""
-        for event in reversed(self.events):
-            if event.event_type in [
-                "task",
-                "result",
-                "user_input",
-            ]:
-                message = f"{event.name}: {event.content}({event.event_type})"
-                context = message + "\n" + context
-
-                if token_counter(context) > self.max_tokens:
-                    break
+        if truncation is None:
+            truncation = MostRecentTruncation()
+
+        index = self._indexed_events()
+        positions = heapq.merge(
+            *(index.positions(event_type) for event_type in CONTEXT_EVENT_TYPES)
+        )
+        entries = [
+            ContextEntry(
+                self.events[i],
+                index.line(i),
+                lambda i=i: index.token_count(i, token_counter),
+            )
+            for i in positions
+        ]
 
-        return context
+        lines = truncation.select(entries, self.max_tokens)
+        return "".join(line + "\n" for line in lines)
 
     def update_internal(self, event_type: str, name: str, **kwargs):
         """Add an internal event to the belief state.
@@ -138,9 +314,8 @@ class Belief(BaseModel):
             >>> print(len(events))
             1
         """
-        return [
-            event for event in self.internal_events if event.event_type == event_type
-        ]
+        index = self._indexed_internal_events()
+        return [self.internal_events[i] for i in index.positions(event_type)]
 
     def get_events_by_type(self, event_type: str) -> List[dict]:
         """Retrieve events of a specific type as JSON objects.
@@ -159,7 +334,8 @@ class Belief(BaseModel):
             >>> print(events[0]["name"])
             test_action
         """
-        return [event.model_dump() for event in self.internal_events if event.event_type == event_type]
+        index = self._indexed_internal_events()
+        return [index.dump(i) for i in index.positions(event_type)]
 
     def get_events_excluding_types(self, exclude_types: List[str]) -> List[dict]:
         """Retrieve events excluding specific types as JSON objects.
@@ -179,7 +355,13 @@ class Belief(BaseModel):
             >>> print(events[0]["event_type"])
             action_start
         """
-        return [event.model_dump() for event in self.internal_events if event.event_type not in exclude_types]
+        index = self._indexed_internal_events()
+        excluded = set(exclude_types)
+        return [
+            index.dump(i)
+            for i, event in enumerate(self.internal_events)
+            if event.event_type not in excluded
+        ]
 
     def set_current_task(self, content):
         """Set the current task in the belief state.
@@ -199,9 +381,10 @@ class Belief(BaseModel):
     def get_internal_history(self, token_counter: Callable[[str], int]):
         """Get the internal history of the agent as a string, with token limiting.
 
-        This method uses get_events_excluding_types to retrieve all internal events as dicts,
-        then converts them to strings in reverse order (most recent first) for LLM context,
-        and applies token limiting.
+        Internal events are rendered as the string of their dict form and walked from
+        the most recent one until max_tokens is exceeded. The rendered string and token
+        count of each event are cached, so only the events in the window are visited
+        and no event is tokenized more than once per token counter.
 
         Args:
             token_counter (Callable[[str], int]): Function to count tokens in text.
@@ -218,17 +401,8 @@ class Belief(BaseModel):
             >>> print(history)
             'analysis(reasoning)'
         """
-        events = self.get_events_excluding_types([])  # get all events
-        results = []
-        current_tokens = 0
-        for event in reversed(events):
-            event_str = str(event)
-            results.append(event_str)
-            current_tokens += token_counter(event_str)
-            if current_tokens > self.max_tokens:
-                break
-        context = "\n".join(reversed(results))
-        return context
+        index = self._indexed_internal_events()
+        return index.history(token_counter, self.max_tokens)
 
     def get_histories_excluding_types(
         self,
@@ -238,8 +412,8 @@ class Belief(BaseModel):
     ):
         """Get internal history excluding specific event types as a string, with token limiting.
 
-        This method uses get_events_excluding_types to retrieve internal events as dicts (excluding specified types),
-        then converts them to strings in reverse order (most recent first) for LLM context, and applies token limiting.
+        Like get_internal_history, this reuses the cached rendered string and token count
+        of each event, skipping events of the excluded types.
 
         Args:
             exclude_types (list[str]): List of event types to exclude.
@@ -260,19 +434,9 @@ class Belief(BaseModel):
             'analysis(reasoning)'
         """  # noqa: E501
         if token_counter is None:
-            def token_counter(x):
-                return len(x.split())
-        events = self.get_events_excluding_types(exclude_types)
-        results = []
-        current_tokens = 0
-        for event in reversed(events):
-            event_str = str(event)
-            results.append(event_str)
-            current_tokens += token_counter(event_str)
-            if current_tokens > max_tokens:
-                break
-        context = "\n".join(reversed(results))
-        return context
+            token_counter = _count_words
+        index = self._indexed_internal_events()
+        return index.history(token_counter, max_tokens, exclude_types)
 
     def clear_short_term_memory(self):
         """Clear short-term memory by removing all internal events and dictionary data.
@@ -0,0 +1,166 @@
+"""Context truncation module for Sherpa AI.
+
+This module defines the strategies Belief.get_context uses to fit the events an
+agent has observed into a token budget. A strategy receives one ContextEntry per
+candidate event, in chronological order, and returns the lines that make up the
+context.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+from sherpa_ai.events import Event
+
+
+class ContextEntry:
+    """A candidate line of an agent's context.
+
+    Attributes:
+        event (Event): The event the line was rendered from.
+        text (str): The rendered line.
+        tokens (int): Number of tokens in the line, counted on first access.
+
+    Example:
+        >>> entry = ContextEntry(event, "task1: Analyze data(task)", lambda: 5)
+        >>> print(entry.tokens)
+        5
+    """
+
+    __slots__ = ("event", "text", "_count_tokens", "_tokens")
+
+    def __init__(self, event: Event, text: str, count_tokens: Callable[[], int]):
+        self.event = event
+        self.text = text
+        self._count_tokens = count_tokens
+        self._tokens = None
+
+    @property
+    def tokens(self) -> int:
+        if self._tokens is None:
+            self._tokens = self._count_tokens()
+        return self._tokens
+
+
+class TruncationStrategy(ABC):
+    """Base class for strategies fitting context entries into a token budget.
+
+    Token counts of the entries are summed rather than counted on the joined
+    context, so the separators between lines are not included in the budget.
+    """
+
+    @abstractmethod
+    def select(self, entries: List[ContextEntry], max_tokens: int) -> List[str]:
+        """Select the lines making up the context.
+
+        Args:
+            entries (List[ContextEntry]): Candidate entries, oldest first.
+            max_tokens (int): Token budget of the context.
+
+        Returns:
+            List[str]: Lines of the context, in the order they should appear.
+        """
+        pass
+
+
+class MostRecentTruncation(TruncationStrategy):
+    """Keep the most recent entries.
+
+    Entries are added from the newest one until the budget is exceeded. The entry
+    crossing the budget is kept, matching how contexts have always been truncated.
+
+    Example:
+        >>> context = belief.get_context(count_tokens, MostRecentTruncation())
+    """
+
+    def select(self, entries: List[ContextEntry], max_tokens: int) -> List[str]:
+        lines = []
+        total_tokens = 0
+        for entry in reversed(entries):
+            lines.append(entry.text)
+            total_tokens += entry.tokens
+            if total_tokens > max_tokens:
+                break
+        lines.reverse()
+        return lines
+
+
+class PriorityTruncation(TruncationStrategy):
+    """Keep entries by event type priority, most recent first within a priority.
+
+    Entries that do not fit in the remaining budget are skipped, so smaller entries
+    of a lower priority can still be included. Kept entries appear in their
+    original order.
+
+    Attributes:
+        priorities (Dict[str, int]): Priority of each event type, higher is kept first.
+        default_priority (int): Priority of event types not in ``priorities``.
+
+    Example:
+        >>> strategy = PriorityTruncation({"task": 2, "result": 1})
+        >>> context = belief.get_context(count_tokens, strategy)
+    """
+
+    def __init__(self, priorities: Dict[str, int], default_priority: int = 0):
+        self.priorities = priorities
+        self.default_priority = default_priority
+
+    def select(self, entries: List[ContextEntry], max_tokens: int) -> List[str]:
+        order = sorted(
+            range(len(entries)),
+            key=lambda i: (
+                -self.priorities.get(
+                    entries[i].event.event_type, self.default_priority
+                ),
+                -i,
+            ),
+        )
+        kept = []
+        total_tokens = 0
+        for i in order:
+            tokens = entries[i].tokens
+            if total_tokens + tokens <= max_tokens:
+                kept.append(i)
+                total_tokens += tokens
+        return [entries[i].text for i in sorted(kept)]
+
+
+class SummarizeOldestTruncation(TruncationStrategy):
+    """Keep the most recent entries and replace older ones with a summary.
+
+    Entries are kept from the newest one while they fit in the budget. The lines of
+    the remaining older entries are passed to ``summarizer``, whose result becomes the
+    first line of the context.
+
+    Attributes:
+        summarizer (Callable[[List[str]], str]): Summarizes the lines of the dropped
+            entries, for example with an LLM call.
+        max_summary_tokens (Optional[int]): Tokens reserved for the summary. Defaults
+            to none, in which case the summary is added on top of the budget.
+
+    Example:
+        >>> strategy = SummarizeOldestTruncation(lambda lines: f"{len(lines)} earlier events")
+        >>> context = belief.get_context(count_tokens, strategy)
+    """
+
+    def __init__(
+        self,
+        summarizer: Callable[[List[str]], str],
+        max_summary_tokens: Optional[int] = None,
+    ):
+        self.summarizer = summarizer
+        self.max_summary_tokens = max_summary_tokens
+
+    def select(self, entries: List[ContextEntry], max_tokens: int) -> List[str]:
+        budget = max_tokens - (self.max_summary_tokens or 0)
+        start = len(entries)
+        total_tokens = 0
+        while start > 0 and total_tokens + entries[start - 1].tokens <= budget:
+            start -= 1
+            total_tokens += entries[start].tokens
+
+        lines = [entry.text for entry in entries[start:]]
+        if start > 0:
+            summary = self.summarizer([entry.text for entry in entries[:start]])
+            if summary:
+                lines.insert(0, summary)
+        return lines
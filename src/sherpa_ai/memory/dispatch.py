@@ -0,0 +1,175 @@
+"""Event dispatch for shared memory.
+
+This module delivers shared memory events to subscribed agent runtimes. Each
+subscriber has its own queue, drained in order by a shared thread pool, so a slow
+subscriber does not hold up the others. Queues can be bounded, in which case an
+overflow policy decides whether publishers wait or events are dropped.
+
+Example:
+    >>> executor = ThreadPoolExecutor(max_workers=4)
+    >>> channel = SubscriberChannel(runtime, executor, capacity=10)
+    >>> ticket = channel.put(event)
+    >>> delivered = ticket.result()
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Any, Deque, Literal, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from sherpa_ai.events import Event
+
+#: What to do with an event when the queue of a subscriber is full:
+#:   - "block": the publisher waits until there is room in the queue
+#:   - "drop_newest": the new event is not delivered to the subscriber
+#:   - "drop_oldest": the oldest queued event is not delivered to the subscriber
+OverflowPolicy = Literal["block", "drop_newest", "drop_oldest"]
+
+
+class DeliveryStats(BaseModel):
+    """Delivery metrics of a shared memory subscriber.
+
+    Latencies are measured from the time an event is queued for the subscriber
+    until the subscriber has handled it.
+
+    Attributes:
+        subscriber (str): Representation of the subscriber.
+        delivered (int): Number of events handled by the subscriber.
+        dropped (int): Number of events dropped because the queue was full.
+        failed (int): Number of events the subscriber raised an error on.
+        lag (int): Number of events queued or being handled.
+        last_latency (float): Latency of the last delivered event, in seconds.
+        mean_latency (float): Mean latency of delivered events, in seconds.
+        max_latency (float): Maximum latency of delivered events, in seconds.
+    """
+
+    subscriber: str
+    delivered: int = 0
+    dropped: int = 0
+    failed: int = 0
+    lag: int = 0
+    last_latency: float = 0.0
+    mean_latency: float = 0.0
+    max_latency: float = 0.0
+
+
+class SubscriberChannel:
+    """Ordered, optionally bounded queue of events for one subscriber.
+
+    At most one event of a channel is being delivered at a time, so the
+    subscriber receives events in the order they were queued.
+
+    Attributes:
+        subscriber (Any): The agent runtime receiving the events. It must have an
+            ``ask(event, block)`` method.
+        capacity (Optional[int]): Maximum number of queued events, unbounded if
+            None.
+        overflow (OverflowPolicy): What to do with events when the queue is full.
+    """
+
+    def __init__(
+        self,
+        subscriber: Any,
+        executor: Executor,
+        capacity: Optional[int] = None,
+        overflow: OverflowPolicy = "block",
+    ):
+        self.subscriber = subscriber
+        self.capacity = capacity
+        self.overflow = overflow
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._queue: Deque[Tuple[Event, float, Future]] = deque()
+        self._space_waiters: Deque[Future] = deque()
+        self._running = False
+        self._in_flight = 0
+        self._stats = DeliveryStats(subscriber=repr(subscriber))
+        self._total_latency = 0.0
+
+    def put(self, event: Event) -> Optional[Future]:
+        """Queue an event for the subscriber.
+
+        Args:
+            event (Event): The event to deliver.
+
+        Returns:
+            Optional[Future]: Future resolved with True once the subscriber has
+                handled the event, or False if the event was dropped or failed.
+                None if the queue is full and the overflow policy is "block".
+        """
+        ticket = Future()
+        with self._lock:
+            if self.capacity is not None and len(self._queue) >= self.capacity:
+                if self.overflow == "block":
+                    return None
+                self._stats.dropped += 1
+                if self.overflow == "drop_newest":
+                    ticket.set_result(False)
+                    return ticket
+                _, _, dropped_ticket = self._queue.popleft()
+                dropped_ticket.set_result(False)
+
+            self._queue.append((event, time.perf_counter(), ticket))
+            start = not self._running
+            self._running = True
+
+        if start:
+            self._executor.submit(self._deliver_next)
+        return ticket
+
+    def wait_for_space(self) -> Future:
+        """Get a future resolved once the queue has room for another event."""
+        waiter = Future()
+        with self._lock:
+            if self.capacity is None or len(self._queue) < self.capacity:
+                waiter.set_result(None)
+            else:
+                self._space_waiters.append(waiter)
+        return waiter
+
+    def stats(self) -> DeliveryStats:
+        """Get the delivery metrics of the subscriber."""
+        with self._lock:
+            return self._stats.model_copy(
+                update={"lag": len(self._queue) + self._in_flight}
+            )
+
+    def _deliver_next(self):
+        with self._lock:
+            event, queued_at, ticket = self._queue.popleft()
+            self._in_flight = 1
+            waiter = self._space_waiters.popleft() if self._space_waiters else None
+        if waiter is not None:
+            waiter.set_result(None)
+
+        try:
+            self.subscriber.ask(event, block=True)
+            delivered = True
+        except Exception as e:
+            logger.exception(e)
+            delivered = False
+        latency = time.perf_counter() - queued_at
+
+        with self._lock:
+            self._in_flight = 0
+            if delivered:
+                stats = self._stats
+                stats.delivered += 1
+                stats.last_latency = latency
+                stats.max_latency = max(stats.max_latency, latency)
+                self._total_latency += latency
+                stats.mean_latency = self._total_latency / stats.delivered
+            else:
+                self._stats.failed += 1
+            more = len(self._queue) > 0
+            self._running = more
+
+        ticket.set_result(delivered)
+        if more:
+            # Give the thread back to the pool between events, so that busy
+            # subscribers do not starve the others
+            self._executor.submit(self._deliver_next)
@@ -0,0 +1,282 @@
+"""Indexed event store for Sherpa AI shared memory.
+
+This module defines the EventStore class, which keeps the events of a shared
+memory with per-type and per-sender indexes, cursor-based reads and a retention
+policy. Events evicted by the retention policy can be spilled to a JSON lines
+file, where cursor reads still find them.
+
+Example:
+    >>> store = EventStore(max_events=1000, max_age=3600)
+    >>> offset = store.append(build_event("task", "task1", content="First task"))
+    >>> events, cursor = store.since(0)
+    >>> tasks = store.get_by_type("task")
+"""
+
+import bisect
+import heapq
+import json
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sherpa_ai.events import Event, build_event, load_event
+
+# Evicted events are removed from the underlying lists once there are this many
+COMPACTION_THRESHOLD = 1024
+
+
+def _event_size(event: Event) -> int:
+    try:
+        return len(event.model_dump_json())
+    except Exception:
+        # Content that cannot be serialized to JSON falls back to its repr
+        return len(repr(event))
+
+
+class EventStore:
+    """Append-only store of events with indexes and retention.
+
+    Every appended event gets an offset, starting at 0 and never reused, so
+    readers can keep a cursor and only read the events appended since their last
+    read. The store also behaves as a sequence of the retained events, oldest
+    first.
+
+    Events are evicted oldest first once any retention limit is exceeded.
+
+    Attributes:
+        max_events (Optional[int]): Maximum number of retained events.
+        max_age (Optional[float]): Maximum age of retained events, in seconds.
+        max_bytes (Optional[int]): Maximum total size of retained events, measured
+            as the length of their JSON form.
+        spill_path (Optional[str]): JSON lines file receiving evicted events. It is
+            truncated when the store is created. Events of custom event classes are
+            read back from it as generic events.
+
+    Example:
+        >>> store = EventStore(max_events=2)
+        >>> for name in ["a", "b", "c"]:
+        ...     store.append(build_event("task", name, content=name))
+        >>> [event.name for event in store]
+        ['b', 'c']
+        >>> store.first_offset, store.next_offset
+        (1, 3)
+    """
+
+    def __init__(
+        self,
+        max_events: Optional[int] = None,
+        max_age: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        spill_path: Optional[str] = None,
+    ):
+        self.max_events = max_events
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+
+        self._lock = threading.RLock()
+        self._events: List[Event] = []
+        self._times: List[float] = []
+        self._sizes: List[int] = []
+        # Position of the first retained event and offset of the event at position 0
+        self._head = 0
+        self._base = 0
+        self._bytes = 0
+        self._by_type: Dict[str, List[int]] = {}
+        self._by_sender: Dict[str, List[int]] = {}
+
+        if spill_path is not None:
+            open(spill_path, "w").close()
+
+    @property
+    def first_offset(self) -> int:
+        """Offset of the oldest retained event."""
+        with self._lock:
+            return self._base + self._head
+
+    @property
+    def next_offset(self) -> int:
+        """Offset the next appended event will get."""
+        with self._lock:
+            return self._base + len(self._events)
+
+    def append(self, event: Event) -> int:
+        """Add an event to the store.
+
+        Args:
+            event (Event): The event to add.
+
+        Returns:
+            int: The offset of the event.
+        """
+        now = time.time()
+        size = _event_size(event) if self.max_bytes is not None else 0
+        with self._lock:
+            offset = self._base + len(self._events)
+            self._events.append(event)
+            self._times.append(now)
+            self._sizes.append(size)
+            self._bytes += size
+            self._by_type.setdefault(event.event_type, []).append(offset)
+            self._by_sender.setdefault(event.sender, []).append(offset)
+            self._evict(now)
+        return offset
+
+    def get(self, offset: int) -> Optional[Event]:
+        """Get a retained event by offset, or None if it is not retained."""
+        with self._lock:
+            self._evict(time.time())
+            position = offset - self._base
+            if self._head <= position < len(self._events):
+                return self._events[position]
+            return None
+
+    def get_by_type(self, event_type: str) -> List[Event]:
+        """Get the retained events of a type, oldest first."""
+        return self.get_by_types([event_type])
+
+    def get_by_types(self, event_types: Iterable[str]) -> List[Event]:
+        """Get the retained events of any of some types, oldest first."""
+        with self._lock:
+            self._evict(time.time())
+            offsets = [self._by_type.get(t, []) for t in dict.fromkeys(event_types)]
+            return self._lookup(offsets, self.first_offset)
+
+    def get_by_sender(self, sender: str) -> List[Event]:
+        """Get the retained events of a sender, oldest first."""
+        with self._lock:
+            self._evict(time.time())
+            return self._lookup([self._by_sender.get(sender, [])], self.first_offset)
+
+    def since(
+        self, offset: int, event_types: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Event], int]:
+        """Get the events appended at or after an offset.
+
+        Events evicted before they were read are read from the spill file if there
+        is one, and skipped otherwise.
+
+        Args:
+            offset (int): Offset to read from, usually the cursor returned by the
+                previous call.
+            event_types (Optional[Iterable[str]]): Only get events of these types.
+
+        Returns:
+            Tuple[List[Event], int]: The events, oldest first, and the cursor to
+                pass to the next call.
+
+        Example:
+            >>> events, cursor = store.since(0)
+            >>> new_events, cursor = store.since(cursor)
+        """
+        if event_types is not None:
+            event_types = list(event_types)
+        with self._lock:
+            self._evict(time.time())
+            first = self.first_offset
+            next_offset = self.next_offset
+            spilled = []
+            if offset < first and self.spill_path is not None:
+                spilled = self._read_spilled(offset, first, event_types)
+            start = max(offset, first)
+
+            if event_types is None:
+                events = self._events[start - self._base :]
+            else:
+                offsets = [self._by_type.get(t, []) for t in dict.fromkeys(event_types)]
+                events = self._lookup(offsets, start)
+        return spilled + events, max(offset, next_offset)
+
+    def _lookup(self, offset_lists: List[List[int]], start: int) -> List[Event]:
+        # Merge the offsets at or after start of some sorted index lists
+        tails = [
+            offsets[bisect.bisect_left(offsets, start) :] for offsets in offset_lists
+        ]
+        if len(tails) == 0:
+            return []
+        merged = tails[0] if len(tails) == 1 else heapq.merge(*tails)
+        return [self._events[offset - self._base] for offset in merged]
+
+    def _evict(self, now: float):
+        head = self._head
+        size = len(self._events)
+        while head < size and (
+            (self.max_events is not None and size - head > self.max_events)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            or (self.max_age is not None and now - self._times[head] > self.max_age)
+        ):
+            self._bytes -= self._sizes[head]
+            head += 1
+
+        if head == self._head:
+            return
+        if self.spill_path is not None:
+            self._spill(self._head, head)
+        self._head = head
+        if head >= COMPACTION_THRESHOLD and head * 2 >= size:
+            self._compact()
+
+    def _compact(self):
+        head = self._head
+        first = self._base + head
+        del self._events[:head]
+        del self._times[:head]
+        del self._sizes[:head]
+        self._base = first
+        self._head = 0
+
+        for index in (self._by_type, self._by_sender):
+            for key in list(index):
+                offsets = index[key]
+                del offsets[: bisect.bisect_left(offsets, first)]
+                if not offsets:
+                    del index[key]
+
+    def _spill(self, start: int, end: int):
+        with open(self.spill_path, "a") as f:
+            for position in range(start, end):
+                event = self._events[position]
+                record = {
+                    "offset": self._base + position,
+                    "class": type(event).__name__,
+                    "event": event.model_dump(),
+                }
+                # Content that cannot be serialized to JSON is saved as its string
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _read_spilled(
+        self, start: int, end: int, event_types: Optional[Iterable[str]]
+    ) -> List[Event]:
+        types = set(event_types) if event_types is not None else None
+        events = []
+        with open(self.spill_path) as f:
+            for line in f:
+                record = json.loads(line)
+                if not start <= record["offset"] < end:
+                    continue
+                fields = record["event"]
+                if types is not None and fields["event_type"] not in types:
+                    continue
+                try:
+                    events.append(load_event((record["class"], fields)))
+                except KeyError:
+                    event_type, name = fields.pop("event_type"), fields.pop("name")
+                    events.append(build_event(event_type, name, **fields))
+        return events
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events) - self._head
+
+    def __iter__(self) -> Iterator[Event]:
+        with self._lock:
+            return iter(self._events[self._head :])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Event, List[Event]]:
+        with self._lock:
+            if isinstance(index, slice):
+                return self._events[self._head :][index]
+            size = len(self._events) - self._head
+            if not -size <= index < size:
+                raise IndexError("event index out of range")
+            return self._events[self._head + index % size]
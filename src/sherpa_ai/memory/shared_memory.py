@@ -8,10 +8,18 @@ from __future__ import annotations
 
 import asyncio
 import threading
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Tuple
 
 from sherpa_ai.events import Event, build_event
-from sherpa_ai.runtime import ThreadedRuntime
+from sherpa_ai.memory.dispatch import DeliveryStats, OverflowPolicy, SubscriberChannel
+from sherpa_ai.memory.event_store import EventStore
+
+if TYPE_CHECKING:
+    from sherpa_ai.runtime import ThreadedRuntime
+
+# Number of threads delivering events to subscribers
+DEFAULT_DISPATCH_WORKERS = 8
 
 
 class SharedMemory:
@@ -22,20 +30,42 @@ class SharedMemory:
     and synchronizing state with agent beliefs. Note that the agent names registered in the shared
     memory must be unique
 
+    Events are delivered to each subscriber through its own ordered queue, so subscribers
+    receive events concurrently and a slow subscriber does not delay the others.
+
     Attributes:
         objective (str): The overall objective being pursued.
-        events (List[Event]): List of events in shared memory.
+        events (EventStore): Events in shared memory, indexed by type and sender.
         event_type_subscriptions (dict[type[Event], list[ThreadedRuntime]]): Agent runtime subscriptions to specific event types.
         sender_subscriptions (dict[str, list[ThreadedRuntime]]): Agent runtime subscriptions based on sender.
         _lock (threading.RLock): Reentrant lock for thread safety.
 
     """  # noqa: E501
 
-    def __init__(self, objective: str = ""):
+    def __init__(
+        self,
+        objective: str = "",
+        max_events: Optional[int] = None,
+        subscriber_capacity: Optional[int] = None,
+        overflow: OverflowPolicy = "block",
+        dispatch_workers: int = DEFAULT_DISPATCH_WORKERS,
+        event_store: Optional[EventStore] = None,
+    ):
         """Initialize shared memory with an objective.
 
         Args:
             objective (str): The overall objective to pursue.
+            max_events (Optional[int]): Number of events retained, oldest events are
+                evicted first. Unbounded if None.
+            subscriber_capacity (Optional[int]): Number of events queued per
+                subscriber before the overflow policy applies. Unbounded if None.
+            overflow (OverflowPolicy): What to do with an event when the queue of a
+                subscriber is full: "block" waits for room in the queue,
+                "drop_newest" and "drop_oldest" drop an event for that subscriber.
+            dispatch_workers (int): Number of threads delivering events.
+            event_store (Optional[EventStore]): Store of the events, used to configure
+                retention by age or size and spilling to disk. Defaults to a store
+                retaining ``max_events`` events.
 
         Example:
             >>> memory = SharedMemory("Complete the task")
@@ -43,17 +73,40 @@ class SharedMemory:
             'Complete the task'
         """
         self.objective = objective
-        self.events: List[Event] = []
+        self.events = (
+            event_store if event_store is not None else EventStore(max_events)
+        )
         self.event_type_subscriptions: dict[type[Event], list[ThreadedRuntime]] = {}
         self.sender_subscriptions: dict[str, list[ThreadedRuntime]] = {}
+        self.subscriber_capacity = subscriber_capacity
+        self.overflow = overflow
+        self.dispatch_workers = dispatch_workers
+        self._channels: dict[Any, SubscriberChannel] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._lock = threading.RLock()
 
+    def _channel(self, subscriber: Any) -> SubscriberChannel:
+        # Must be called with the lock held
+        channel = self._channels.get(subscriber)
+        if channel is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.dispatch_workers,
+                    thread_name_prefix="SharedMemory",
+                )
+            channel = SubscriberChannel(
+                subscriber, self._executor, self.subscriber_capacity, self.overflow
+            )
+            self._channels[subscriber] = channel
+        return channel
+
     async def add_event(self, event: Event, wait: bool = False):
         """Add an event to shared memory.
 
         Args:
             event (Event): Event to add to shared memory.
-            wait (bool): Whether to wait for the event to be processed.
+            wait (bool): Whether to wait for the event to be processed by all
+                subscribers. Subscribers process the event concurrently.
 
         Example:
             >>> memory = SharedMemory("Complete the task")
@@ -62,26 +115,54 @@ class SharedMemory:
             >>> print(len(memory.events))
             1
         """
-        # List to store all handler coroutines
-        processed_subscribers = set()
+        # Subscribers in subscription order, each subscriber only once
+        processed_subscribers = {}
 
         with self._lock:
             # Add event to the list
             self.events.append(event)
 
-            # Collect handler tasks for event type subscribers
+            # Collect event type subscribers
             if event.event_type in self.event_type_subscriptions:
                 for subscriber in self.event_type_subscriptions[event.event_type]:
-                    processed_subscribers.add(subscriber)
+                    processed_subscribers[subscriber] = None
 
-            # Collect handler tasks for sender subscribers
+            # Collect sender subscribers
             if event.sender in self.sender_subscriptions:
                 for subscriber in self.sender_subscriptions[event.sender]:
-                    processed_subscribers.add(subscriber)
+                    processed_subscribers[subscriber] = None
+
+            # Queue the event for all subscribers while holding the lock, so that
+            # every subscriber receives events in the order they were added
+            channels = [self._channel(s) for s in processed_subscribers]
+            tickets = [channel.put(event) for channel in channels]
+
+        # Wait for room in the full queues of the "block" overflow policy
+        for i, channel in enumerate(channels):
+            while tickets[i] is None:
+                await asyncio.wrap_future(channel.wait_for_space())
+                tickets[i] = channel.put(event)
+
+        if wait:
+            await asyncio.gather(*(asyncio.wrap_future(t) for t in tickets))
 
-        # send event to all subscribers
-        for subscriber in processed_subscribers:
-            subscriber.ask(event, block=wait)
+    def get_delivery_stats(self) -> List[DeliveryStats]:
+        """Get the delivery metrics of every subscriber that received events.
+
+        Returns:
+            List[DeliveryStats]: Delivered, dropped and queued event counts and
+                delivery latencies of each subscriber.
+
+        Example:
+            >>> memory = SharedMemory("Complete the task")
+            >>> memory.subscribe_event_type("task", runtime)
+            >>> memory.add("task", "task1", content="First task", wait=True)
+            >>> print(memory.get_delivery_stats()[0].delivered)
+            1
+        """
+        with self._lock:
+            channels = list(self._channels.values())
+        return [channel.stats() for channel in channels]
 
     def add(self, event_type: str, name: str, sender="", **kwargs):
         asyncio.run(self.async_add(event_type, name, sender, **kwargs))
@@ -138,7 +219,7 @@ class SharedMemory:
                 self.sender_subscriptions[sender] = []
             self.sender_subscriptions[sender].append(subscriber)
 
-    def get_by_type(self, event_type):
+    def get_by_type(self, event_type: str) -> List[Event]:
         """Get all events of a specific type.
 
         Args:
@@ -155,4 +236,40 @@ class SharedMemory:
             >>> print(len(tasks))
             2
         """
-        return [event for event in self.events if event.event_type == event_type]
+        return self.events.get_by_type(event_type)
+
+    def get_by_sender(self, sender: str) -> List[Event]:
+        """Get all events of a specific sender.
+
+        Args:
+            sender (str): Sender of events to retrieve.
+
+        Returns:
+            List[Event]: List of events sent by the sender.
+        """
+        return self.events.get_by_sender(sender)
+
+    def get_since(
+        self, offset: int, event_types: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Event], int]:
+        """Get the events added since an offset, for observers keeping a cursor.
+
+        Args:
+            offset (int): Offset to read from, 0 or the cursor returned by the
+                previous call.
+            event_types (Optional[Iterable[str]]): Only get events of these types.
+
+        Returns:
+            Tuple[List[Event], int]: The new events and the cursor to pass to the
+                next call.
+
+        Example:
+            >>> memory = SharedMemory("Complete the task")
+            >>> memory.add("task", "task1", content="First task")
+            >>> events, cursor = memory.get_since(0)
+            >>> memory.add("task", "task2", content="Second task")
+            >>> events, cursor = memory.get_since(cursor)
+            >>> print([event.name for event in events])
+            ['task2']
+        """
+        return self.events.since(offset, event_types)
@@ -5,8 +5,11 @@ for semantic search capabilities. It defines the SharedMemoryWithVectorDB class
 which combines shared memory with vector storage for context retrieval.
 """
 
+import asyncio
 import threading
-from typing import List, Optional
+import weakref
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
 from sherpa_ai.actions.planning import Plan
 
@@ -14,7 +17,10 @@ from sherpa_ai.actions.planning import Plan
 from sherpa_ai.connectors.base import BaseVectorDB
 from sherpa_ai.events import Event
 from sherpa_ai.memory import SharedMemory
-from sherpa_ai.memory.belief import Belief
+from sherpa_ai.memory.belief import CONTEXT_EVENT_TYPES, Belief
+
+# Number of tasks whose vector search results are cached
+RETRIEVAL_CACHE_SIZE = 128
 
 
 class SharedMemoryWithVectorDB(SharedMemory):
@@ -24,6 +30,10 @@ class SharedMemoryWithVectorDB(SharedMemory):
     using a vector database. It allows for semantic search of relevant context
     based on the current task.
 
+    The vector database is searched once per task, and each retrieved chunk is added
+    to the shared memory only once. Each belief is only sent the events added since
+    it last observed the shared memory.
+
     Attributes:
         session_id (str): Unique identifier for the current session.
         vectorStorage (BaseVectorDB): Vector database for semantic search.
@@ -59,6 +69,33 @@ class SharedMemoryWithVectorDB(SharedMemory):
         self.current_step = None
         self.session_id = session_id
         self.vectorStorage = vectorStorage
+        self._retrievals: OrderedDict[str, List[str]] = OrderedDict()
+        self._injected_chunks = set()
+        # Cursor of each observing belief, keyed by id since beliefs are unhashable
+        self._observer_cursors: Dict[int, int] = {}
+        self._observe_lock = threading.Lock()
+
+    async def _retrieve(self, query: str) -> List[str]:
+        with self._observe_lock:
+            if query in self._retrievals:
+                self._retrievals.move_to_end(query)
+                return self._retrievals[query]
+
+        # The search is blocking, so it runs in a thread to keep the loop responsive
+        contexts = await asyncio.to_thread(
+            self.vectorStorage.similarity_search,
+            query=query,
+            number_of_results=5,
+            k=1,
+            session_id=self.session_id,
+        )
+        chunks = [context.page_content for context in contexts]
+
+        with self._observe_lock:
+            self._retrievals[query] = chunks
+            if len(self._retrievals) > RETRIEVAL_CACHE_SIZE:
+                self._retrievals.popitem(last=False)
+        return chunks
 
     def observe(self, belief: Belief):
         """Synchronize agent belief with shared memory state and vector database context.
@@ -76,33 +113,56 @@ class SharedMemoryWithVectorDB(SharedMemory):
             >>> memory.observe(belief)
             >>> print(belief.current_task.content)
             'Process data'
-        """
-        tasks = super().get_by_type("task")
+        """  # noqa: E501
+        asyncio.run(self.async_observe(belief))
 
-        task = tasks[-1] if len(tasks) > 0 else None
+    async def async_observe(self, belief: Belief):
+        """Synchronize agent belief with shared memory state and vector database context.
 
-        # based on the current task search similarity on the context and add it as an
-        # event type user_input which is going to be used as a context on the prompt
-        contexts = self.vectorStorage.similarity_search(
-            query=task.content, 
-            number_of_results=5, 
-            k=1, 
-            session_id=self.session_id
-        )
-        # Loop through the similarity search results, add the chunks as user_input events which will be added as a context in the belief class.
-        for context in contexts:
-            super().add(
-                name="",
-                event_type="user_input",
-                content=context.page_content,
-            )
+        The vector database is only searched the first time a task is observed, and
+        only retrieved chunks that are not in the shared memory yet are added to it,
+        as user_input events which are used as context in the belief. Only the events
+        added since the last observation of the belief are sent to it.
 
-        belief.set_current_task(task.content)
+        Args:
+            belief (Belief): Agent belief to update.
 
-        for event in self.events:
-            if event.event_type in [
-                "task",
-                "result",
-                "user_input",
-            ]:
-                belief.update(event)
+        Example:
+            >>> memory = SharedMemoryWithVectorDB("Complete task", "session1", vectorStorage=db)
+            >>> memory.add("task", "initial_task", content="Process data")
+            >>> belief = Belief()
+            >>> await memory.async_observe(belief)
+            >>> print(belief.current_task.content)
+            'Process data'
+        """  # noqa: E501
+        tasks = self.get_by_type("task")
+        task = tasks[-1] if len(tasks) > 0 else None
+
+        if task is not None:
+            chunks = await self._retrieve(task.content)
+            with self._observe_lock:
+                new_chunks = [
+                    chunk
+                    for chunk in dict.fromkeys(chunks)
+                    if chunk not in self._injected_chunks
+                ]
+                self._injected_chunks.update(new_chunks)
+            await asyncio.gather(
+                *(
+                    self.async_add("user_input", "", content=chunk)
+                    for chunk in new_chunks
+                )
+            )
+            belief.set_current_task(task.content)
+
+        with self._observe_lock:
+            key = id(belief)
+            if key not in self._observer_cursors:
+                # Forget the cursor when the belief is garbage collected
+                weakref.finalize(belief, self._observer_cursors.pop, key, None)
+            events, cursor = self.get_since(
+                self._observer_cursors.get(key, 0), CONTEXT_EVENT_TYPES
+            )
+            self._observer_cursors[key] = cursor
+        for event in events:
+            belief.update(event)
@@ -7,7 +7,7 @@ model interactions including inputs, outputs, and model information.
 
 import json
 import typing
-from typing import Any, Coroutine, List, Optional
+from typing import Any, List, Optional
 
 from langchain_core.callbacks import ( 
     AsyncCallbackManagerForLLMRun,
@@ -82,37 +82,18 @@ class ChatModelWithLogging(BaseChatModel):
             'Hi there!'
             >>> # Check logs for detailed interaction info
         """
-        # get the name of the language model. For models like OpenAI, this is the model
-        # name (e.g., gpt-3.5-turbo). for other LLMs, this is the type of the LLM
-        llm_name = (
-            self.llm.model_name if hasattr(self.llm, "model_name") else self._llm_type
-        )
-        input_text = []
-        for message in messages:
-            # make sure all the messages stay on the same line
-            input_text.append(
-                {"text": message.content.replace("\n", "\\n"), "agent": message.type}
-            )
         result = self.llm._generate(messages, stop, run_manager, **kwargs)
-        # only one generation for a LLM call
-        generation = result.generations[0]
-        log = {
-            "input": input_text,
-            # make sure all the messages stay on the same line
-            "output": generation.message.content.replace("\n", "\\n"),
-            "llm_name": llm_name,
-        }
-        self.logger.info(json.dumps(log))
+        self._log_generation(messages, result)
         return result
 
-    def _agenerate(
+    async def _agenerate(
         self,
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
-    ) -> Coroutine[Any, Any, ChatResult]:
-        """Asynchronously generate chat completions.
+    ) -> ChatResult:
+        """Asynchronously generate chat completions with detailed logging.
 
         Args:
             messages (List[BaseMessage]): List of messages in the conversation.
@@ -121,7 +102,7 @@ class ChatModelWithLogging(BaseChatModel):
             **kwargs (Any): Additional arguments for the model.
 
         Returns:
-            Coroutine[Any, Any, ChatResult]: Coroutine for the generation result.
+            ChatResult: Generated chat completion result.
 
         Example:
             >>> model = ChatModelWithLogging(llm=ChatOpenAI())
@@ -129,4 +110,34 @@ class ChatModelWithLogging(BaseChatModel):
             >>> print(result.generations[0].text)
             'Hi there!'
         """
-        self.llm.agenerate(messages, stop, run_manager, **kwargs)
+        result = await self.llm._agenerate(messages, stop, run_manager, **kwargs)
+        self._log_generation(messages, result)
+        return result
+
+    def _log_generation(self, messages: List[BaseMessage], result: ChatResult):
+        """Log the input messages and generated output of a model call.
+
+        Args:
+            messages (List[BaseMessage]): Messages the model was called with.
+            result (ChatResult): Result generated by the model.
+        """
+        # get the name of the language model. For models like OpenAI, this is the model
+        # name (e.g., gpt-3.5-turbo). for other LLMs, this is the type of the LLM
+        llm_name = (
+            self.llm.model_name if hasattr(self.llm, "model_name") else self._llm_type
+        )
+        input_text = []
+        for message in messages:
+            # make sure all the messages stay on the same line
+            input_text.append(
+                {"text": message.content.replace("\n", "\\n"), "agent": message.type}
+            )
+        # only one generation for a LLM call
+        generation = result.generations[0]
+        log = {
+            "input": input_text,
+            # make sure all the messages stay on the same line
+            "output": generation.message.content.replace("\n", "\\n"),
+            "llm_name": llm_name,
+        }
+        self.logger.info(json.dumps(log))
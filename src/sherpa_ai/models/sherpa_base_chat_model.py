@@ -5,6 +5,7 @@ It defines base and OpenAI-specific chat model classes with Sherpa enhancements
 like usage tracking and verbose logging.
 """
 
+from contextvars import ContextVar
 from typing import Any, List, Optional
 
 from langchain_openai import ChatOpenAI
@@ -16,10 +17,18 @@ from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
 
-from sherpa_ai.database.user_usage_tracker import UserUsageTracker
+from sherpa_ai.database.user_usage_tracker import get_usage_tracker
 from sherpa_ai.verbose_loggers.base import BaseVerboseLogger
 
 
+# Set while an ``_agenerate`` call is in flight. Providers without a native async
+# path fall back to running ``self._generate`` in an executor (copying the current
+# context), so ``_generate`` checks this flag to avoid recording the usage twice.
+_tracked_by_async_call: ContextVar[bool] = ContextVar(
+    "_tracked_by_async_call", default=False
+)
+
+
 def usage_metadata_from_result(response: ChatResult) -> Optional[dict]:
     """Extract usage metadata from the AI message of a chat result.
 
@@ -41,6 +50,72 @@ def usage_metadata_from_result(response: ChatResult) -> Optional[dict]:
     return None
 
 
+def track_usage(
+    response: ChatResult,
+    user_id: str,
+    model_name: Optional[str] = None,
+    session_id: Optional[str] = None,
+    agent_name: Optional[str] = None,
+    verbose_logger: Optional[BaseVerboseLogger] = None,
+) -> None:
+    """Record the token usage of a chat result for a user.
+
+    Falls back to a zero-token record when the response carries no usage
+    metadata, so that the call is still counted.
+
+    Args:
+        response (ChatResult): The generated chat result.
+        user_id (str): ID of the user making the request.
+        model_name (Optional[str]): Name of the model used.
+        session_id (Optional[str]): ID of the session.
+        agent_name (Optional[str]): Name of the agent.
+        verbose_logger (Optional[BaseVerboseLogger]): Logger for usage reminders.
+    """
+    # The shared tracker queues the record for a background batch insert, so
+    # this adds no database round trip to the model call
+    user_db = get_usage_tracker()
+
+    usage_metadata = usage_metadata_from_result(response)
+
+    if usage_metadata:
+        user_db.add_usage(
+            user_id=user_id,
+            usage_metadata=usage_metadata,
+            model_name=model_name,
+            session_id=session_id,
+            agent_name=agent_name,
+            check_limits=False,
+            verbose_logger=verbose_logger,
+        )
+    else:
+        # Fallback to legacy tracking if no usage metadata
+        # This should rarely happen with proper callback integration
+        user_db.add_usage(
+            user_id=user_id,
+            input_tokens=0,
+            output_tokens=0,
+            model_name=model_name,
+            session_id=session_id,
+            agent_name=agent_name,
+            check_limits=False,
+            verbose_logger=verbose_logger,
+        )
+
+
+async def atrack_usage(response: ChatResult, user_id: str, **kwargs: Any) -> None:
+    """Asynchronously record the token usage of a chat result for a user.
+
+    Recording only queues the usage on the shared tracker's background writer,
+    so it is safe to run directly on the event loop.
+
+    Args:
+        response (ChatResult): The generated chat result.
+        user_id (str): ID of the user making the request.
+        **kwargs (Any): Additional arguments passed to ``track_usage``.
+    """
+    track_usage(response, user_id, **kwargs)
+
+
 class SherpaBaseChatModel(BaseChatModel):
     """Base chat model with Sherpa-specific enhancements.
 
@@ -63,14 +138,17 @@ class SherpaBaseChatModel(BaseChatModel):
     agent_name: Optional[str] = None
     verbose_logger: BaseVerboseLogger = None
 
-    def _agenerate(
+    async def _agenerate(
         self,
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
-    ):
-        """Asynchronously generate chat completions.
+    ) -> ChatResult:
+        """Asynchronously generate chat completions and track token usage.
+
+        Awaits the parent model's async generation directly, then records usage
+        per user without blocking the event loop.
 
         Args:
             messages (List[BaseMessage]): List of messages in the conversation.
@@ -78,10 +156,32 @@ class SherpaBaseChatModel(BaseChatModel):
             run_manager (Optional[AsyncCallbackManagerForLLMRun]): Callback manager.
             **kwargs (Any): Additional arguments for the model.
 
-        Note:
-            This is a placeholder method that needs to be implemented.
+        Returns:
+            ChatResult: Generated chat completion result.
+
+        Example:
+            >>> model = SherpaBaseChatModel(user_id="user123")
+            >>> result = await model._agenerate([Message("Hello")])
+            >>> print(result.generations[0].text)
+            'Hi there!'
         """
-        pass
+        token = _tracked_by_async_call.set(True)
+        try:
+            response = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        finally:
+            _tracked_by_async_call.reset(token)
+
+        if self.user_id:
+            await atrack_usage(
+                response,
+                self.user_id,
+                model_name=getattr(self, "model_name", "unknown"),
+                session_id=self.session_id,
+                agent_name=self.agent_name,
+                verbose_logger=self.verbose_logger,
+            )
+
+        return response
 
     @property
     def _llm_type(self):
@@ -128,40 +228,17 @@ class SherpaBaseChatModel(BaseChatModel):
         # Generate response first, then read token usage from the result
         response = super()._generate(messages, stop, run_manager, **kwargs)
 
-        # Track usage if user_id is provided
-        if self.user_id:
-            user_db = UserUsageTracker(verbose_logger=self.verbose_logger)
-
-            # Get model name and metadata
-            model_name = getattr(self, 'model_name', 'unknown')
-            session_id = getattr(self, 'session_id', None)
-            agent_name = getattr(self, 'agent_name', None)
-
-            # Extract usage metadata from the generated message
-            usage_metadata = usage_metadata_from_result(response)
-
-            if usage_metadata:
-                # Use the new usage metadata-based tracking
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    usage_metadata=usage_metadata,
-                    model_name=model_name,
-                    session_id=session_id,
-                    agent_name=agent_name
-                )
-            else:
-                # Fallback to legacy tracking if no usage metadata
-                # This should rarely happen with proper callback integration
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    input_tokens=0,
-                    output_tokens=0,
-                    model_name=model_name,
-                    session_id=session_id,
-                    agent_name=agent_name
-                )
-
-            user_db.close_connection()
+        # Track usage if user_id is provided. Async calls that fall back to this
+        # method in an executor record the usage themselves.
+        if self.user_id and not _tracked_by_async_call.get():
+            track_usage(
+                response,
+                self.user_id,
+                model_name=getattr(self, "model_name", "unknown"),
+                session_id=self.session_id,
+                agent_name=self.agent_name,
+                verbose_logger=self.verbose_logger,
+            )
 
         return response
 
@@ -188,14 +265,17 @@ class SherpaChatOpenAI(ChatOpenAI):
     agent_name: Optional[str] = None
     verbose_logger: BaseVerboseLogger = None
 
-    def _agenerate(
+    async def _agenerate(
         self,
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
-    ):
-        """Asynchronously generate chat completions.
+    ) -> ChatResult:
+        """Asynchronously generate chat completions and track token usage.
+
+        Awaits the parent model's async generation directly, then records usage
+        per user without blocking the event loop.
 
         Args:
             messages (List[BaseMessage]): List of messages in the conversation.
@@ -203,10 +283,32 @@ class SherpaChatOpenAI(ChatOpenAI):
             run_manager (Optional[AsyncCallbackManagerForLLMRun]): Callback manager.
             **kwargs (Any): Additional arguments for the model.
 
-        Note:
-            This is a placeholder method that needs to be implemented.
+        Returns:
+            ChatResult: Generated chat completion result.
+
+        Example:
+            >>> model = SherpaChatOpenAI(user_id="user123")
+            >>> result = await model._agenerate([Message("Hello")])
+            >>> print(result.generations[0].text)
+            'Hi there!'
         """
-        pass
+        token = _tracked_by_async_call.set(True)
+        try:
+            response = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        finally:
+            _tracked_by_async_call.reset(token)
+
+        if self.user_id:
+            await atrack_usage(
+                response,
+                self.user_id,
+                model_name=getattr(self, "model_name", "unknown"),
+                session_id=self.session_id,
+                agent_name=self.agent_name,
+                verbose_logger=self.verbose_logger,
+            )
+
+        return response
 
     @property
     def _llm_type(self):
@@ -252,39 +354,16 @@ class SherpaChatOpenAI(ChatOpenAI):
         # Generate response first, then read token usage from the result
         response = super()._generate(messages, stop, run_manager, **kwargs)
 
-        # Track usage if user_id is provided
-        if self.user_id:
-            user_db = UserUsageTracker(verbose_logger=self.verbose_logger)
-
-            # Get model name and metadata
-            model_name = getattr(self, 'model_name', 'unknown')
-            session_id = getattr(self, 'session_id', None)
-            agent_name = getattr(self, 'agent_name', None)
-
-            # Extract usage metadata from the generated message
-            usage_metadata = usage_metadata_from_result(response)
-
-            if usage_metadata:
-                # Use the new usage metadata-based tracking
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    usage_metadata=usage_metadata,
-                    model_name=model_name,
-                    session_id=session_id,
-                    agent_name=agent_name
-                )
-            else:
-                # Fallback to legacy tracking if no usage metadata
-                # This should rarely happen with proper callback integration
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    input_tokens=0,
-                    output_tokens=0,
-                    model_name=model_name,
-                    session_id=session_id,
-                    agent_name=agent_name
-                )
-            
-            user_db.close_connection()
+        # Track usage if user_id is provided. Async calls that fall back to this
+        # method in an executor record the usage themselves.
+        if self.user_id and not _tracked_by_async_call.get():
+            track_usage(
+                response,
+                self.user_id,
+                model_name=getattr(self, "model_name", "unknown"),
+                session_id=self.session_id,
+                agent_name=self.agent_name,
+                verbose_logger=self.verbose_logger,
+            )
 
         return response
@@ -17,7 +17,7 @@ from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
 from pydantic import BaseModel
 
-from sherpa_ai.database.user_usage_tracker import UserUsageTracker
+from sherpa_ai.database.user_usage_tracker import get_usage_tracker
 from sherpa_ai.models.sherpa_base_chat_model import usage_metadata_from_result
 
 
@@ -40,14 +40,14 @@ class SherpaOpenAI(ChatOpenAI):
 
     user_id: Optional[str] = None
 
-    def _agenerate(
+    async def _agenerate(
         self,
         messages: List[BaseMessage],
         stop: Optional[List[str]] = None,
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
-    ):
-        """Asynchronously generate chat completions.
+    ) -> ChatResult:
+        """Asynchronously generate chat completions and track token usage.
 
         Args:
             messages (List[BaseMessage]): List of messages in the conversation.
@@ -55,10 +55,15 @@ class SherpaOpenAI(ChatOpenAI):
             run_manager (Optional[AsyncCallbackManagerForLLMRun]): Callback manager.
             **kwargs (Any): Additional arguments for the model.
 
-        Note:
-            This is a placeholder method that needs to be implemented.
+        Returns:
+            ChatResult: Generated chat completion result.
         """
-        pass
+        response = await super()._agenerate(messages, stop, run_manager, **kwargs)
+
+        if self.user_id:
+            self._track_usage(response)
+
+        return response
 
     @property
     def _llm_type(self):
@@ -106,27 +111,35 @@ class SherpaOpenAI(ChatOpenAI):
 
         # Track usage if user_id is provided
         if self.user_id:
-            user_db = UserUsageTracker()
-
-            # Extract usage metadata from the generated message
-            usage_metadata = usage_metadata_from_result(response)
-
-            if usage_metadata:
-                # Use the new unified add_usage method
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    usage_metadata=usage_metadata
-                )
-            else:
-                # Fallback to legacy tracking if no usage metadata
-                # Extract from response.llm_output as fallback
-                total_token = (response.llm_output or {}).get("token_usage", {}).get("total_tokens", 0)
-                user_db.add_usage(
-                    user_id=self.user_id,
-                    input_tokens=total_token // 2,  # Rough split for legacy
-                    output_tokens=total_token // 2
-                )
-            
-            user_db.close_connection()
+            self._track_usage(response)
 
         return response
+
+    def _track_usage(self, response: ChatResult) -> None:
+        """Record token usage from a chat response.
+
+        Args:
+            response (ChatResult): The chat result to extract usage from.
+        """
+        user_db = get_usage_tracker()
+
+        # Extract usage metadata from the generated message
+        usage_metadata = usage_metadata_from_result(response)
+
+        if usage_metadata:
+            # Use the new unified add_usage method
+            user_db.add_usage(
+                user_id=self.user_id,
+                usage_metadata=usage_metadata,
+                check_limits=False
+            )
+        else:
+            # Fallback to legacy tracking if no usage metadata
+            # Extract from response.llm_output as fallback
+            total_token = (response.llm_output or {}).get("token_usage", {}).get("total_tokens", 0)
+            user_db.add_usage(
+                user_id=self.user_id,
+                input_tokens=total_token // 2,  # Rough split for legacy
+                output_tokens=total_token // 2,
+                check_limits=False
+            )
@@ -25,8 +25,7 @@ from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
 from pydantic import ConfigDict
 
-from sherpa_ai.database.user_usage_tracker import UserUsageTracker
-from sherpa_ai.models.sherpa_base_chat_model import usage_metadata_from_result
+from sherpa_ai.models.sherpa_base_chat_model import atrack_usage, track_usage
 from sherpa_ai.verbose_loggers.base import BaseVerboseLogger
 
 
@@ -112,7 +111,7 @@ class SherpaLLM(BaseChatModel):
         response = await self.llm._agenerate(messages, stop, run_manager, **kwargs)
 
         if self.user_id:
-            self._track_usage(response)
+            await atrack_usage(response, self.user_id, **self._usage_kwargs())
 
         return response
 
@@ -122,29 +121,20 @@ class SherpaLLM(BaseChatModel):
         Args:
             response: The chat result to extract usage from.
         """
-        user_db = UserUsageTracker(verbose_logger=self.verbose_logger)
+        track_usage(response, self.user_id, **self._usage_kwargs())
+
+    def _usage_kwargs(self) -> dict:
+        """Collect the usage-tracking metadata for this model.
 
+        Returns:
+            dict: Model name, session, agent and verbose logger for tracking.
+        """
         model_name = getattr(self.llm, "model_name", None) or getattr(
             self.llm, "model", "unknown"
         )
-        usage_metadata = usage_metadata_from_result(response)
-
-        if usage_metadata:
-            user_db.add_usage(
-                user_id=self.user_id,
-                usage_metadata=usage_metadata,
-                model_name=model_name,
-                session_id=self.session_id,
-                agent_name=self.agent_name,
-            )
-        else:
-            user_db.add_usage(
-                user_id=self.user_id,
-                input_tokens=0,
-                output_tokens=0,
-                model_name=model_name,
-                session_id=self.session_id,
-                agent_name=self.agent_name,
-            )
-
-        user_db.close_connection()
\ No newline at end of file
+        return {
+            "model_name": model_name,
+            "session_id": self.session_id,
+            "agent_name": self.agent_name,
+            "verbose_logger": self.verbose_logger,
+        }
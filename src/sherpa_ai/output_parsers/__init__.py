@@ -12,12 +12,28 @@ Example:
     >>> result = number_validator.validate("The answer is 42")
 """
 
-from sherpa_ai.output_parsers.base import BaseOutputParser, BaseOutputProcessor
-from sherpa_ai.output_parsers.citation_validation import CitationValidation
-from sherpa_ai.output_parsers.entity_validation import EntityValidation
-from sherpa_ai.output_parsers.link_parse import LinkParser
-from sherpa_ai.output_parsers.number_validation import NumberValidation
+from typing import TYPE_CHECKING
 
+from sherpa_ai.lazy_imports import lazy_exports
+
+if TYPE_CHECKING:
+    from sherpa_ai.output_parsers.base import BaseOutputParser, BaseOutputProcessor
+    from sherpa_ai.output_parsers.citation_validation import CitationValidation
+    from sherpa_ai.output_parsers.entity_validation import EntityValidation
+    from sherpa_ai.output_parsers.link_parse import LinkParser
+    from sherpa_ai.output_parsers.number_validation import NumberValidation
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "BaseOutputParser": "sherpa_ai.output_parsers.base",
+        "BaseOutputProcessor": "sherpa_ai.output_parsers.base",
+        "CitationValidation": "sherpa_ai.output_parsers.citation_validation",
+        "EntityValidation": "sherpa_ai.output_parsers.entity_validation",
+        "LinkParser": "sherpa_ai.output_parsers.link_parse",
+        "NumberValidation": "sherpa_ai.output_parsers.number_validation",
+    },
+)
 
 __all__ = [
     "LinkParser",
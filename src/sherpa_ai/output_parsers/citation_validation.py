@@ -5,7 +5,11 @@ It defines the CitationValidation class which analyzes text against source
 materials and adds appropriate citations using various similarity metrics.
 """
 
-import nltk
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Optional
+
 from loguru import logger
 from nltk.tokenize import sent_tokenize, word_tokenize
 
@@ -13,10 +17,103 @@ from sherpa_ai.actions.base import ActionResource, BaseRetrievalAction
 from sherpa_ai.memory import Belief
 from sherpa_ai.output_parsers.base import BaseOutputProcessor
 from sherpa_ai.output_parsers.validation_result import ValidationResult
+from sherpa_ai.resources import ensure_punkt
+
+
+@lru_cache(maxsize=4096)
+def _tokenize(text: str) -> tuple[tuple[str, ...], frozenset[str]]:
+    # Sentences and resource lines are compared many times, so tokenize them once
+    ensure_punkt()
+    tokens = tuple(word_tokenize(text))
+    return tokens, frozenset(tokens)
+
+
+@lru_cache(maxsize=1024)
+def _resource_lines(content: str) -> tuple[str, ...]:
+    # TODO: verify that splitting each sentence on newlines improves citation results
+    return tuple(
+        line
+        for resource_sentence in content.split(".")
+        for line in resource_sentence.split("\n")
+        if len(line) > 0
+    )
+
+
+def _ngrams(text: str, n: int) -> set[str]:
+    text = text.lower()
+    if len(text) <= n:
+        return {text}
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+# Lines containing at least this share of the n-grams of a sentence are always
+# candidates, so sentences quoted from long lines are not ranked out
+CONTAINMENT_THRESHOLD = 0.9
+
+
+class ResourceLineIndex:
+    """Inverted index from character n-grams to the lines of resources.
+
+    The index is used to find the resource lines most similar to a sentence, so
+    the exact similarity metrics only run on those candidates. Lines are ranked by
+    the Jaccard index of their n-grams with the sentence, so long lines do not
+    outrank short ones just by having more n-grams.
+
+    Attributes:
+        lines (list[tuple[int, str]]): Index of the resource and text of each line.
+        ngram_size (int): Number of characters in each n-gram.
+
+    Example:
+        >>> index = ResourceLineIndex(resources)
+        >>> candidates = index.candidates("Python is great.", 10)
+    """
+
+    def __init__(self, resources: list[ActionResource], ngram_size: int = 3):
+        self.ngram_size = ngram_size
+        self.lines = []
+        self._sizes = []
+        self._postings = {}
+        for resource_index, resource in enumerate(resources):
+            for line in _resource_lines(resource.content):
+                line_id = len(self.lines)
+                self.lines.append((resource_index, line))
+                ngrams = _ngrams(line, ngram_size)
+                self._sizes.append(len(ngrams))
+                for ngram in ngrams:
+                    self._postings.setdefault(ngram, []).append(line_id)
+
+    def candidates(self, sentence: str, k: Optional[int]) -> list[tuple[int, str]]:
+        """Get the resource lines most similar to a sentence.
 
-# download the punkt tokenizer. This is necessary for the sent_tokenize in NLTK.
-# The download will only happen once and the result will be cached.
-nltk.download("punkt_tab")
+        Args:
+            sentence (str): Sentence to find candidate lines for.
+            k (Optional[int]): Number of lines with the highest n-gram Jaccard index
+                returned. Lines containing almost all n-grams of the sentence are
+                returned as well. If None, all lines are returned.
+
+        Returns:
+            list[tuple[int, str]]: Index of the resource and text of each candidate
+                line, ordered by resource.
+        """
+        if k is None:
+            return self.lines
+
+        sentence_ngrams = _ngrams(sentence, self.ngram_size)
+        counts = Counter()
+        for ngram in sentence_ngrams:
+            counts.update(self._postings.get(ngram, ()))
+
+        scores = {
+            line_id: shared / (len(sentence_ngrams) + self._sizes[line_id] - shared)
+            for line_id, shared in counts.items()
+        }
+        line_ids = set(heapq.nlargest(k, scores, key=scores.get))
+        line_ids.update(
+            line_id
+            for line_id, shared in counts.items()
+            if shared >= CONTAINMENT_THRESHOLD * len(sentence_ngrams)
+        )
+        return [self.lines[line_id] for line_id in sorted(line_ids)]
 
 
 class CitationValidation(BaseOutputProcessor):
@@ -33,6 +130,9 @@ class CitationValidation(BaseOutputProcessor):
             Default is 0.7.
         token_overlap (float): Minimum token overlap ratio for citation.
             Default is 0.7.
+        max_candidates (Optional[int]): Number of resource lines sharing the most
+            character n-grams with a sentence that are compared to it. If None,
+            every line is compared. Default is 20.
 
     Example:
         >>> validator = CitationValidation(sequence_threshold=0.8)
@@ -43,7 +143,11 @@ class CitationValidation(BaseOutputProcessor):
     """
 
     def __init__(
-        self, sequence_threshold=0.7, jaccard_threshold=0.7, token_overlap=0.7
+        self,
+        sequence_threshold=0.7,
+        jaccard_threshold=0.7,
+        token_overlap=0.7,
+        max_candidates: Optional[int] = 20,
     ):
         """Initialize a new CitationValidation instance.
 
@@ -51,6 +155,7 @@ class CitationValidation(BaseOutputProcessor):
             sequence_threshold (float): Subsequence length ratio threshold.
             jaccard_threshold (float): Jaccard similarity threshold.
             token_overlap (float): Token overlap ratio threshold.
+            max_candidates (Optional[int]): Number of candidate lines per sentence.
 
         Example:
             >>> validator = CitationValidation(sequence_threshold=0.8)
@@ -60,6 +165,7 @@ class CitationValidation(BaseOutputProcessor):
         self.sequence_threshold = sequence_threshold
         self.jaccard_threshold = jaccard_threshold
         self.token_overlap = token_overlap
+        self.max_candidates = max_candidates
 
     def calculate_token_overlap(self, sentence1, sentence2) -> tuple:
         """
@@ -86,11 +192,11 @@ class CitationValidation(BaseOutputProcessor):
             '0.75, 0.75'
         """
         # Tokenize the sentences
-        tokens1 = word_tokenize(sentence1)
-        tokens2 = word_tokenize(sentence2)
+        tokens1, set1 = _tokenize(sentence1)
+        tokens2, set2 = _tokenize(sentence2)
 
         # Calculate the set intersection to find the overlapping tokens
-        overlapping_tokens = set(tokens1) & set(tokens2)
+        overlapping_tokens = set1 & set2
         # Calculate the percentage of token overlap
         if len(tokens1) == 0:
             overlap_percentage = 0
@@ -126,8 +232,8 @@ class CitationValidation(BaseOutputProcessor):
             '0.60'
         """
         # Convert the sentences to sets of words
-        set1 = set(word_tokenize(sentence1))
-        set2 = set(word_tokenize(sentence2))
+        _, set1 = _tokenize(sentence1)
+        _, set2 = _tokenize(sentence2)
 
         # Calculate the Jaccard index
         intersection = len(set1.intersection(set2))
@@ -141,7 +247,9 @@ class CitationValidation(BaseOutputProcessor):
         """Calculate length of longest common subsequence.
 
         This method finds the length of the longest subsequence of characters
-        that appear in both texts in the same order.
+        that appear in both texts in the same order. It uses a bit-parallel
+        algorithm, with one bit per character of ``text1`` packed in an integer,
+        so each character of ``text2`` is processed by a few integer operations.
 
         Args:
             text1 (str): First text to compare.
@@ -157,17 +265,24 @@ class CitationValidation(BaseOutputProcessor):
             ...     "hello there"
             ... )
             >>> print(length)
-            6
+            7
         """
-        dp = [[0 for i in range(len(text1) + 1)] for i in range(len(text2) + 1)]
+        if len(text1) == 0 or len(text2) == 0:
+            return 0
 
-        for i in range(1, len(text2) + 1):
-            for j in range(1, len(text1) + 1):
-                diagnoal = dp[i - 1][j - 1]
-                if text1[j - 1] == text2[i - 1]:
-                    diagnoal += 1
-                dp[i][j] = max(diagnoal, dp[i - 1][j], dp[i][j - 1])
-        return dp[-1][-1]
+        # Bit i of the mask of a character is set if text1[i] is that character
+        char_masks = {}
+        for i, char in enumerate(text1):
+            char_masks[char] = char_masks.get(char, 0) | (1 << i)
+
+        # Zero bits of row mark the positions where the LCS length increases
+        all_ones = (1 << len(text1)) - 1
+        row = all_ones
+        for char in text2:
+            matches = row & char_masks.get(char, 0)
+            row = ((row + matches) | (row - matches)) & all_ones
+
+        return len(text1) - row.bit_count()
 
     def flatten_nested_list(self, nested_list: list[list[str]]) -> list[str]:
         """Flatten a nested list of strings.
@@ -208,6 +323,8 @@ class CitationValidation(BaseOutputProcessor):
             >>> print(sentences)
             ['Hello there.', 'How are you?']
         """
+        # The punkt tokenizer is downloaded the first time it is needed
+        ensure_punkt()
         sentences = sent_tokenize(paragraph)
         return sentences
 
@@ -269,15 +386,22 @@ class CitationValidation(BaseOutputProcessor):
 
         return self.add_citations(text, resources)
 
-    def add_citation_to_sentence(self, sentence: str, resources: list[ActionResource]):
+    def add_citation_to_sentence(
+        self,
+        sentence: str,
+        resources: list[ActionResource],
+        index: Optional[ResourceLineIndex] = None,
+    ):
         """Add citations to a single sentence.
 
-        This method checks the sentence against each resource using similarity
-        metrics to determine which sources to cite.
+        This method checks the sentence against the candidate lines of the
+        resources using similarity metrics to determine which sources to cite.
 
         Args:
             sentence (str): Sentence to add citations to.
             resources (list[ActionResource]): Available citation sources.
+            index (Optional[ResourceLineIndex]): Index of the resource lines. Built
+                from ``resources`` if not given.
 
         Returns:
             citation_ids: a list of citation identifiers
@@ -302,30 +426,46 @@ class CitationValidation(BaseOutputProcessor):
         if len(sentence) <= 5:
             return citation_ids, citation_links
 
-        for index, resource in enumerate(resources):
-            cited = False
-            resource_link = resource.source
-            resource_text = resource.content
-            resource_sentences = resource_text.split(".")
-            # TODO: verify that splitting each sentence on newlines improves citation results
-            nested_sentence_lines = [s.split("\n") for s in resource_sentences]
-            resource_lines = self.flatten_nested_list(nested_sentence_lines)
-
-            for resource_line in resource_lines:
-                if not cited and not (resource_link in citation_links):
-                    seq = self.longest_common_subsequence(sentence, resource_line)
-                    if (
-                        (seq / len(sentence)) > self.sequence_threshold
-                        or sentence in resource_line
-                        or self.jaccard_index(sentence, resource_line)
-                        > self.jaccard_threshold
-                    ):
-                        citation_links.append(resource_link)
-                        citation_ids.append(index + 1)
-                        cited = True
+        if index is None:
+            index = ResourceLineIndex(resources)
+
+        for resource_index, resource_line in index.candidates(
+            sentence, self.max_candidates
+        ):
+            resource_link = resources[resource_index].source
+            if resource_link in citation_links:
+                continue
+
+            if self.is_match(sentence, resource_line):
+                citation_links.append(resource_link)
+                citation_ids.append(resource_index + 1)
 
         return citation_ids, citation_links
 
+    def is_match(self, sentence: str, resource_line: str) -> bool:
+        """Check whether a sentence is similar enough to a resource line to cite it.
+
+        Cheaper checks run first, and the longest common subsequence is skipped
+        when even a full match of the shorter text could not reach the threshold.
+
+        Args:
+            sentence (str): Sentence to cite.
+            resource_line (str): Line of a resource.
+
+        Returns:
+            bool: True if the sentence should cite the resource.
+        """
+        if sentence in resource_line:
+            return True
+        if self.jaccard_index(sentence, resource_line) > self.jaccard_threshold:
+            return True
+
+        max_sequence = min(len(sentence), len(resource_line))
+        if max_sequence / len(sentence) <= self.sequence_threshold:
+            return False
+        seq = self.longest_common_subsequence(sentence, resource_line)
+        return (seq / len(sentence)) > self.sequence_threshold
+
     def format_sentence_with_citations(self, sentence, ids, links):
         """Format a sentence with its citations.
 
@@ -366,6 +506,7 @@ class CitationValidation(BaseOutputProcessor):
         paragraph = [p for p in paragraph if len(p.strip()) > 0]
 
         paragraphs = [self.split_paragraph_into_sentences(s) for s in paragraph]
+        index = ResourceLineIndex(resources)
 
         new_paragraph = []
         for paragraph in paragraphs:
@@ -377,7 +518,7 @@ class CitationValidation(BaseOutputProcessor):
                 if len(sentence) == 0:
                     continue
 
-                ids, links = self.add_citation_to_sentence(sentence, resources)
+                ids, links = self.add_citation_to_sentence(sentence, resources, index)
                 formatted_sentence = self.format_sentence_with_citations(
                     sentence, ids, links
                 )
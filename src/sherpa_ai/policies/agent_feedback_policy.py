@@ -15,6 +15,7 @@ from sherpa_ai.events import Event, build_event
 from sherpa_ai.memory import Belief
 from sherpa_ai.policies import ReactPolicy
 from sherpa_ai.prompts.prompt_template_loader import PromptTemplate
+from sherpa_ai.token_counter import get_llm_token_counter
 
 
 class AgentFeedbackPolicy(ReactPolicy):
@@ -66,7 +67,7 @@ class AgentFeedbackPolicy(ReactPolicy):
         actions = belief.actions
 
         task = belief.current_task.content
-        context = belief.get_context(self.llm.get_num_tokens)
+        context = belief.get_context(get_llm_token_counter(self.llm))
         options = "\n".join(
             [f"{i+1}. {action.name}" for i, action in enumerate(actions)]
         )
@@ -78,15 +79,16 @@ class AgentFeedbackPolicy(ReactPolicy):
             version="1.0",
             variables=variables,
         )
-        result = self.llm.invoke(agent_feedback_prompt)
+        result = await self.llm.ainvoke(agent_feedback_prompt)
         question = result.content if hasattr(result, "content") else str(result)
         logger.info(f"Question to the user: {question}")
 
         await self.agent.shared_memory.async_add("task", name="Agent", content=question)
-        result = self.agent.run()
+        # The agent runs its own event loop and may wait for user input
+        result = await asyncio.to_thread(self.agent.run)
 
         belief.update(build_event("user_input", "Agent", content=result))
-        return super().select_action(belief, **kwargs)
+        return await super().async_select_action(belief)
 
     def select_action(self, belief: Belief, **kwargs):
         """Select action based on agent feedback.
@@ -18,6 +18,7 @@ from sherpa_ai.policies.utils import (
     transform_json_output,
 )
 from sherpa_ai.prompts.prompt_template_loader import PromptTemplate
+from sherpa_ai.token_counter import get_llm_token_counter
 
 if TYPE_CHECKING:
     from sherpa_ai.memory.belief import Belief
@@ -88,7 +89,7 @@ class ChatStateMachinePolicy(BasePolicy):
         current_state = belief.get_state_obj().name
         state_description = belief.get_state_obj().description
         conversations = construct_conversation_from_belief(
-            belief, self.llm.get_num_tokens, self.max_conversation_tokens
+            belief, get_llm_token_counter(self.llm), self.max_conversation_tokens
         )
 
         formatted_state_description = ""
@@ -124,7 +125,7 @@ class ChatStateMachinePolicy(BasePolicy):
         logger.debug(f"Prompt: {self.chat_template.invoke(prompt_data)}")
 
         chain = self.chat_template | self.llm
-        result = chain.invoke(prompt_data).content
+        result = (await chain.ainvoke(prompt_data)).content
         logger.debug(f"Result: {result}")
 
         name, args = transform_json_output(result)
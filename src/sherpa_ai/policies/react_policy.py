@@ -18,6 +18,7 @@ from sherpa_ai.policies.base import BasePolicy, PolicyOutput
 from sherpa_ai.policies.exceptions import SherpaPolicyException
 from sherpa_ai.policies.utils import is_selection_trivial, transform_json_output
 from sherpa_ai.prompts.prompt_template_loader import PromptTemplate
+from sherpa_ai.token_counter import get_llm_token_counter
 
 if TYPE_CHECKING:
     from sherpa_ai.memory.belief import Belief
@@ -65,11 +66,44 @@ class ReactPolicy(BasePolicy):
         },
     }
 
+    def get_prompt(self, belief: Belief, actions: list) -> str:
+        """Create the action selection prompt.
+
+        Args:
+            belief (Belief): Current belief state of the agent.
+            actions (list): Actions available to the agent.
+
+        Returns:
+            str: The prompt asking the language model to select an action.
+        """
+        task_description = belief.current_task.content
+        possible_actions = "\n".join([str(action) for action in actions])
+        history_of_previous_actions = belief.get_internal_history(
+            get_llm_token_counter(self.llm)
+        )
+
+        response_format = json.dumps(self.response_format, indent=4)
+
+        variables = {
+            "role_description": self.role_description,
+            "output_instruction": self.output_instruction,
+            "task_description": task_description,
+            "possible_actions": possible_actions,
+            "history_of_previous_actions": history_of_previous_actions,
+            "response_format": response_format,
+        }
+        return self.prompt_template.format_prompt(
+            prompt_parent_id="react_policy_prompt",
+            prompt_id="SELECTION_DESCRIPTION",
+            version="1.0",
+            variables=variables,
+        )
+
     async def async_select_action(self, belief: Belief) -> Optional[PolicyOutput]:
         """Asynchronously select an action based on current belief state.
 
-        This method currently just calls the synchronous version. It exists
-        to provide an async interface for future async implementations.
+        Same as :meth:`select_action`, with the language model called
+        asynchronously so other tasks on the event loop keep running.
 
         Args:
             belief (Belief): Current belief state of the agent.
@@ -77,6 +111,9 @@ class ReactPolicy(BasePolicy):
         Returns:
             Optional[PolicyOutput]: Selected action and arguments, or None.
 
+        Raises:
+            SherpaPolicyException: If selected action not in available actions.
+
         Example:
             >>> policy = ReactPolicy(llm=language_model)
             >>> output = await policy.async_select_action(belief)
@@ -84,7 +121,28 @@ class ReactPolicy(BasePolicy):
             ...     print(output.action.name)
             'SearchCode'
         """
-        return self.select_action(belief)
+        actions = await belief.async_get_actions()
+
+        if is_selection_trivial(actions):
+            return PolicyOutput(action=actions[0], args={})
+
+        prompt = self.get_prompt(belief, actions)
+        logger.debug(f"Prompt: {prompt}")
+        result = await self.llm.ainvoke(prompt)
+        # Handle both string and Message responses
+        result_text = result.content if hasattr(result, 'content') else str(result)
+        logger.debug(f"Result: {result_text}")
+
+        name, args = transform_json_output(result_text)
+
+        action = await belief.async_get_action(name)
+
+        if action is None:
+            raise SherpaPolicyException(
+                f"Action {name} not found in the list of possible actions"
+            )
+
+        return PolicyOutput(action=action, args=args)
 
     def select_action(self, belief: Belief) -> Optional[PolicyOutput]:
         """Select an action based on current belief state.
@@ -116,28 +174,7 @@ class ReactPolicy(BasePolicy):
         if is_selection_trivial(actions):
             return PolicyOutput(action=actions[0], args={})
 
-        task_description = belief.current_task.content
-        possible_actions = "\n".join([str(action) for action in actions])
-        history_of_previous_actions = belief.get_internal_history(
-            self.llm.get_num_tokens
-        )
-
-        response_format = json.dumps(self.response_format, indent=4)
-
-        variables = {
-            "role_description": self.role_description,
-            "output_instruction": self.output_instruction,
-            "task_description": task_description,
-            "possible_actions": possible_actions,
-            "history_of_previous_actions": history_of_previous_actions,
-            "response_format": response_format,
-        }
-        prompt = self.prompt_template.format_prompt(
-            prompt_parent_id="react_policy_prompt",
-            prompt_id="SELECTION_DESCRIPTION",
-            version="1.0",
-            variables=variables,
-        )
+        prompt = self.get_prompt(belief, actions)
         logger.debug(f"Prompt: {prompt}")
         result = self.llm.invoke(prompt)
         # Handle both string and Message responses
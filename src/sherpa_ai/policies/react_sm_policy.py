@@ -20,6 +20,7 @@ from sherpa_ai.policies.base import BasePolicy, PolicyOutput
 from sherpa_ai.policies.exceptions import SherpaPolicyException
 from sherpa_ai.policies.utils import is_selection_trivial, transform_json_output
 from sherpa_ai.prompts.prompt_template_loader import PromptTemplate
+from sherpa_ai.token_counter import get_llm_token_counter
 
 if TYPE_CHECKING:
     from sherpa_ai.memory.belief import Belief
@@ -88,7 +89,7 @@ class ReactStateMachinePolicy(BasePolicy):
         task_description = belief.current_task.content
         possible_actions = "\n".join([str(action) for action in actions])
         history_of_previous_actions = belief.get_internal_history(
-            self.llm.get_num_tokens
+            get_llm_token_counter(self.llm)
         )
         current_state = belief.get_state_obj().name
         state_description = belief.get_state_obj().description
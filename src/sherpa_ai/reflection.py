@@ -7,6 +7,7 @@ from langchain_core.tools import BaseTool
 from loguru import logger 
 
 from sherpa_ai.prompt_generator import PromptGenerator
+from sherpa_ai.token_counter import get_llm_token_counter
 
 
 class Reflection:
@@ -53,7 +54,7 @@ class Reflection:
         self.llm = llm
         self.action_list = action_list
 
-        self.token_counter = self.llm.get_num_tokens
+        self.token_counter = get_llm_token_counter(self.llm)
         prompt = PromptGenerator()
         self.format = prompt.response_format
         self.commands = [
@@ -0,0 +1,65 @@
+"""Lazy provisioning of external resources for Sherpa AI.
+
+Resources such as NLTK data are only downloaded the first time they are needed,
+so importing Sherpa AI does no network work. Call :func:`warmup` at application
+startup to provision everything up front instead.
+
+Example:
+    >>> import sherpa_ai
+    >>> sherpa_ai.warmup()
+"""
+
+from functools import lru_cache
+
+from loguru import logger
+
+
+@lru_cache(maxsize=None)
+def ensure_nltk_data(package: str, resource_path: str):
+    """Make sure an NLTK data package is available, downloading it if needed.
+
+    The check runs once per package and process.
+
+    Args:
+        package (str): Name of the NLTK package (e.g., "punkt_tab").
+        resource_path (str): Path of the resource in the NLTK data folder
+            (e.g., "tokenizers/punkt_tab").
+
+    Example:
+        >>> from sherpa_ai.resources import ensure_nltk_data
+        >>> ensure_nltk_data("punkt_tab", "tokenizers/punkt_tab")
+    """
+    import nltk
+
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        logger.info(f"Downloading NLTK data package {package}")
+        nltk.download(package, quiet=True)
+
+
+def ensure_punkt():
+    """Make sure the tokenizer used by ``sent_tokenize`` and ``word_tokenize`` is available."""
+    ensure_nltk_data("punkt_tab", "tokenizers/punkt_tab")
+
+
+def warmup(configure_logging: bool = True):
+    """Provision the resources Sherpa AI otherwise loads on first use.
+
+    This loads the settings from the environment and the .env file, configures the
+    logger and downloads the NLTK data used for tokenization.
+
+    Args:
+        configure_logging (bool): Whether to configure the logger with the
+            ``LOG_LEVEL`` setting. Defaults to True.
+
+    Example:
+        >>> import sherpa_ai
+        >>> sherpa_ai.warmup()
+    """
+    from sherpa_ai import config
+
+    config.load_settings()
+    if configure_logging:
+        config.configure_logging()
+    ensure_punkt()
@@ -1,3 +1,11 @@
+from sherpa_ai.runtime.asyncio_runtime import AgentTask, AsyncioRuntime
+from sherpa_ai.runtime.process_runtime import AgentProcess, ProcessRuntime
 from sherpa_ai.runtime.threaded_runtime import ThreadedRuntime
 
-__all__ = ["ThreadedRuntime"]
+__all__ = [
+    "AgentProcess",
+    "AgentTask",
+    "AsyncioRuntime",
+    "ProcessRuntime",
+    "ThreadedRuntime",
+]
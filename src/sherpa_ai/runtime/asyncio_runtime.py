@@ -0,0 +1,307 @@
+"""Asyncio runtime for Sherpa AI agents.
+
+This module defines the AsyncioRuntime class, which hosts many agents as tasks on
+one shared event loop instead of one thread per agent. Each agent has a bounded
+mailbox: events are handled one at a time in the order they were sent, and
+senders wait when the mailbox of an agent is full.
+
+Example:
+    >>> runtime = AsyncioRuntime()
+    >>> agent_task = runtime.spawn(QAAgent())
+    >>> result = agent_task.ask(build_event("message", "question", content="Hi"))
+    >>> runtime.stop()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import TYPE_CHECKING, Any, Coroutine, List, Optional
+
+from loguru import logger
+
+from sherpa_ai.events import Event
+
+if TYPE_CHECKING:
+    from sherpa_ai.agents.base import BaseAgent
+
+DEFAULT_MAILBOX_SIZE = 100
+
+# Sentinel event asking an agent task to stop after the events sent before it
+_STOP = object()
+
+
+class RuntimeFuture:
+    """Result of a call made on the runtime loop from another thread.
+
+    Provides the ``get`` method of pykka futures, so that code written for
+    ThreadedRuntime works with either runtime.
+
+    Example:
+        >>> future = agent_task.ask(event, block=False)
+        >>> result = future.get(timeout=10)
+    """
+
+    def __init__(self, future: concurrent.futures.Future):
+        self._future = future
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """Wait for the result.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait before raising
+                ``TimeoutError``. Waits forever if None.
+
+        Returns:
+            Any: The result of the call. Exceptions of the call are re-raised.
+        """
+        return self._future.result(timeout)
+
+    def done(self) -> bool:
+        """Check whether the call has finished."""
+        return self._future.done()
+
+
+class AgentTask:
+    """An agent hosted by an AsyncioRuntime.
+
+    Events sent to the agent are queued in its mailbox and handled one at a time,
+    in the order they were sent. An idle agent only holds a suspended coroutine.
+
+    Attributes:
+        runtime (AsyncioRuntime): The runtime hosting the agent.
+        agent (BaseAgent): The hosted agent.
+
+    Example:
+        >>> agent_task = runtime.spawn(agent)
+        >>> result = await agent_task.async_ask(event)  # on the runtime loop
+        >>> result = agent_task.ask(event)  # from any other thread
+    """
+
+    def __init__(self, runtime: AsyncioRuntime, agent: BaseAgent, mailbox_size: int):
+        self.runtime = runtime
+        self.agent = agent
+        self._mailbox: asyncio.Queue = asyncio.Queue(mailbox_size)
+        # asyncio locks are fair, so senders blocked on a full mailbox keep
+        # their order
+        self._send_lock = asyncio.Lock()
+        self._stopped = False
+        self._finished = asyncio.Event()
+        self._done: Optional[RuntimeFuture] = None
+
+    async def send(self, event: Event) -> asyncio.Future:
+        """Queue an event for the agent, waiting while its mailbox is full.
+
+        Must be awaited on the runtime loop.
+
+        Args:
+            event (Event): The event to send.
+
+        Returns:
+            asyncio.Future: Future of the result of the agent run on the event.
+        """
+        return await self._put(event, self.runtime.loop.create_future())
+
+    async def async_ask(self, event: Event) -> Any:
+        """Send an event to the agent and wait for the result of its run.
+
+        Must be awaited on the runtime loop.
+
+        Args:
+            event (Event): The event to send.
+
+        Returns:
+            Any: The result of the agent run, usually a TaskResult.
+        """
+        return await (await self.send(event))
+
+    def ask(self, event: Event, block: bool = True) -> Any:
+        """Send an event to the agent from any thread.
+
+        Args:
+            event (Event): The event to send.
+            block (bool): Whether to wait for the result. Cannot be True on the
+                runtime loop, use ``async_ask`` there instead.
+
+        Returns:
+            Any: The result of the agent run if ``block`` is True, or its
+                RuntimeFuture otherwise.
+        """
+        if block and self.runtime.in_loop():
+            raise RuntimeError(
+                "Blocking ask on the runtime loop would deadlock, use async_ask"
+            )
+        future = self.runtime.submit(self.async_ask(event))
+        return future.get() if block else future
+
+    def tell(self, event: Event):
+        """Send an event to the agent from any thread without waiting.
+
+        Errors raised while handling the event are logged.
+
+        Args:
+            event (Event): The event to send.
+        """
+        self.runtime.submit(self._put(event, None))
+
+    def stop(self) -> RuntimeFuture:
+        """Stop the agent once the events already sent are handled.
+
+        Returns:
+            RuntimeFuture: Future resolved when the agent has stopped.
+        """
+        self.runtime.submit(self._put(_STOP, None))
+        return self._done
+
+    async def _put(
+        self, event: Any, future: Optional[asyncio.Future]
+    ) -> Optional[asyncio.Future]:
+        if self._stopped:
+            raise RuntimeError(f"Agent {self.agent.name} has been stopped")
+        if event is _STOP:
+            self._stopped = True
+        async with self._send_lock:
+            await self._mailbox.put((event, future))
+        return future
+
+    async def _run(self):
+        try:
+            await self._handle_events()
+        finally:
+            self._finished.set()
+
+    async def _handle_events(self):
+        while True:
+            event, future = await self._mailbox.get()
+            if event is _STOP:
+                return
+            if future is not None and future.cancelled():
+                continue
+
+            try:
+                await self.agent.async_handle_event(event)
+                result = await self.agent.async_run()
+            except Exception as e:
+                if future is None:
+                    logger.exception(e)
+                elif not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if future is not None and not future.cancelled():
+                    future.set_result(result)
+
+
+class AsyncioRuntime:
+    """Runtime hosting many agents as tasks on one event loop.
+
+    By default the runtime runs its own event loop in a background thread, so it
+    can be used from synchronous code. An already running loop can be given
+    instead, in which case the caller is responsible for running it.
+
+    Agents share the loop, so only awaited work lets other agents make progress.
+    Output validation runs in a worker thread, but synchronous actions and
+    blocking calls made by asynchronous actions still stall every agent of the
+    runtime. Use ProcessRuntime for CPU-bound agents.
+
+    Attributes:
+        loop (asyncio.AbstractEventLoop): The loop running the agents.
+        mailbox_size (int): Default number of events queued per agent before
+            senders wait.
+
+    Example:
+        >>> runtime = AsyncioRuntime()
+        >>> agent_tasks = [runtime.spawn(agent) for agent in agents]
+        >>> result = agent_tasks[0].ask(event)
+        >>> runtime.stop()
+    """
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        mailbox_size: int = DEFAULT_MAILBOX_SIZE,
+    ):
+        self.mailbox_size = mailbox_size
+        self._agent_tasks: List[AgentTask] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=loop.run_forever, name="AsyncioRuntime", daemon=True
+            )
+            self._thread.start()
+        self.loop = loop
+
+    @property
+    def agent_tasks(self) -> List[AgentTask]:
+        """The agents hosted by the runtime."""
+        with self._lock:
+            return list(self._agent_tasks)
+
+    def in_loop(self) -> bool:
+        """Check whether the caller is running on the runtime loop."""
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    def submit(self, coroutine: Coroutine) -> RuntimeFuture:
+        """Schedule a coroutine on the runtime loop from any thread.
+
+        Coroutines are started in the order they are submitted.
+
+        Args:
+            coroutine (Coroutine): The coroutine to run.
+
+        Returns:
+            RuntimeFuture: Future of the result of the coroutine.
+        """
+        return RuntimeFuture(asyncio.run_coroutine_threadsafe(coroutine, self.loop))
+
+    def spawn(self, agent: BaseAgent, mailbox_size: Optional[int] = None) -> AgentTask:
+        """Start hosting an agent.
+
+        Args:
+            agent (BaseAgent): The agent to host.
+            mailbox_size (Optional[int]): Number of events queued for the agent
+                before senders wait. Defaults to the runtime ``mailbox_size``.
+
+        Returns:
+            AgentTask: Handle used to send events to the agent.
+        """
+        agent_task = AgentTask(self, agent, mailbox_size or self.mailbox_size)
+        agent_task._done = self.submit(agent_task._run())
+        with self._lock:
+            self._agent_tasks.append(agent_task)
+        return agent_task
+
+    async def async_stop(self):
+        """Stop all agents once their queued events are handled.
+
+        Must be awaited on the runtime loop.
+        """
+        with self._lock:
+            agent_tasks, self._agent_tasks = self._agent_tasks, []
+        for agent_task in agent_tasks:
+            if not agent_task._stopped:
+                await agent_task._put(_STOP, None)
+        await asyncio.gather(*(t._finished.wait() for t in agent_tasks))
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop all agents and the runtime loop if it is owned by the runtime.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the queued events to be
+                handled. Waits forever if None.
+        """
+        if self.in_loop():
+            raise RuntimeError("Use async_stop on the runtime loop")
+        self.submit(self.async_stop()).get(timeout)
+
+        if self._thread is not None:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            self.loop.close()
+            self._thread = None
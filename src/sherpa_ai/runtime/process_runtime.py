@@ -0,0 +1,378 @@
+"""Process runtime for Sherpa AI agents.
+
+This module defines the ProcessRuntime class, which hosts agents in a pool of
+worker processes, so that CPU-bound work such as output validation runs on all
+cores instead of sharing the GIL of one process. Each agent lives in one worker
+and handles its events in the order they were sent. Events and results cross
+process boundaries in a compact form (see ``dump_event`` and ``dump_task_result``).
+
+Agents are created inside their worker by a picklable factory, since agents
+usually hold LLM clients that cannot be pickled. Events that an agent adds to
+its shared memory are forwarded to the SharedMemory of the parent process, so
+subscriptions keep working across processes.
+
+Example:
+    >>> runtime = ProcessRuntime(max_workers=4)
+    >>> agent_process = runtime.spawn(make_agent, shared_memory=shared_memory)
+    >>> shared_memory.subscribe_event_type("task", agent_process)
+    >>> result = agent_process.ask(build_event("task", "question", content="Hi"))
+    >>> runtime.stop()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from sherpa_ai.config.task_result import TaskResult
+from sherpa_ai.events import Event, dump_event, load_event
+from sherpa_ai.memory.shared_memory import SharedMemory
+from sherpa_ai.runtime.asyncio_runtime import RuntimeFuture
+
+if TYPE_CHECKING:
+    from sherpa_ai.agents.base import BaseAgent
+
+# Seconds between checks that a worker process is still alive
+LIVENESS_INTERVAL = 0.5
+
+
+def dump_task_result(result: Any) -> Any:
+    """Convert the result of an agent run to a compact picklable form."""
+    if type(result) is TaskResult:
+        return (result.content, result.status)
+    return result
+
+
+def load_task_result(data: Any) -> Any:
+    """Rebuild the result of an agent run converted by ``dump_task_result``."""
+    if isinstance(data, tuple):
+        content, status = data
+        return TaskResult(content=content, status=status)
+    return data
+
+
+class _ForwardingSharedMemory(SharedMemory):
+    """Shared memory of an agent in a worker, forwarding events to the parent."""
+
+    def __init__(self, objective: str, agent_id: int, outbox: multiprocessing.Queue):
+        super().__init__(objective)
+        self._agent_id = agent_id
+        self._outbox = outbox
+
+    async def add_event(self, event: Event, wait: bool = False):
+        with self._lock:
+            self.events.append(event)
+        self._outbox.put(("event", self._agent_id, dump_event(event)))
+
+
+def _picklable_error(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+        return error
+    except Exception:
+        return RuntimeError(repr(error))
+
+
+def _worker_main(inbox: multiprocessing.Queue, outbox: multiprocessing.Queue):
+    """Host agents in a worker process until asked to stop."""
+    agents: Dict[int, BaseAgent] = {}
+    loop = asyncio.new_event_loop()
+
+    async def handle(agent: BaseAgent, event: Event) -> Any:
+        await agent.async_handle_event(event)
+        return await agent.async_run()
+
+    while True:
+        message = inbox.get()
+        kind = message[0]
+        if kind == "stop":
+            break
+
+        if kind == "spawn":
+            _, request_id, agent_id, factory, objective = message
+            try:
+                agent = factory()
+                if objective is not None:
+                    agent.shared_memory = _ForwardingSharedMemory(
+                        objective, agent_id, outbox
+                    )
+                agents[agent_id] = agent
+                outbox.put(("spawned", request_id, None))
+            except Exception as e:
+                outbox.put(("spawned", request_id, _picklable_error(e)))
+        elif kind == "event":
+            _, agent_id, request_id, data = message
+            try:
+                result = loop.run_until_complete(
+                    handle(agents[agent_id], load_event(data))
+                )
+                reply = ("result", request_id, dump_task_result(result), None)
+            except Exception as e:
+                reply = ("result", request_id, None, _picklable_error(e))
+            outbox.put(reply)
+
+    loop.close()
+    outbox.put(("stopped",))
+
+
+class AgentProcess:
+    """An agent hosted in a worker process of a ProcessRuntime.
+
+    Has the ``ask`` and ``tell`` methods of the other runtimes, so it can
+    subscribe to a SharedMemory like any agent runtime.
+
+    Attributes:
+        runtime (ProcessRuntime): The runtime hosting the agent.
+        agent_id (int): Identifier of the agent in the runtime.
+        worker (int): Index of the worker process hosting the agent.
+
+    Example:
+        >>> agent_process = runtime.spawn(make_agent)
+        >>> result = agent_process.ask(event)
+    """
+
+    def __init__(self, runtime: ProcessRuntime, agent_id: int, worker: int):
+        self.runtime = runtime
+        self.agent_id = agent_id
+        self.worker = worker
+
+    def ask(
+        self, event: Event, block: bool = True, timeout: Optional[float] = None
+    ) -> Any:
+        """Send an event to the agent.
+
+        Args:
+            event (Event): The event to send.
+            block (bool): Whether to wait for the result.
+            timeout (Optional[float]): Seconds to wait for the result before
+                raising ``TimeoutError`` if ``block`` is True. Waits forever if
+                None.
+
+        Returns:
+            Any: The result of the agent run if ``block`` is True, or its
+                RuntimeFuture otherwise.
+
+        Raises:
+            RuntimeError: If the worker process hosting the agent has died.
+        """
+        future = self.runtime._send(self, event)
+        return future.get(timeout) if block else future
+
+    def tell(self, event: Event):
+        """Send an event to the agent without waiting for the result.
+
+        Errors raised while handling the event are logged.
+
+        Args:
+            event (Event): The event to send.
+        """
+        self.runtime._send(self, event, log_errors=True)
+
+
+class ProcessRuntime:
+    """Runtime hosting agents in a pool of worker processes.
+
+    Agents are assigned to workers in turn. A worker handles the events of its
+    agents one at a time, so throughput scales with the number of workers.
+
+    If a worker process dies, the pending calls of its agents fail with
+    ``RuntimeError``, as do the events sent to them afterwards.
+
+    Attributes:
+        max_workers (int): Number of worker processes.
+
+    Example:
+        >>> runtime = ProcessRuntime(max_workers=4)
+        >>> agent_processes = [runtime.spawn(make_agent) for _ in range(8)]
+        >>> futures = [p.ask(event, block=False) for p in agent_processes]
+        >>> results = [future.get() for future in futures]
+        >>> runtime.stop()
+    """
+
+    def __init__(
+        self, max_workers: Optional[int] = None, start_method: Optional[str] = None
+    ):
+        """Start the worker processes.
+
+        Args:
+            max_workers (Optional[int]): Number of worker processes. Defaults to
+                the number of CPUs.
+            start_method (Optional[str]): The multiprocessing start method.
+                Defaults to the platform default.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        context = multiprocessing.get_context(start_method)
+
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        self._agent_ids = itertools.count()
+        # Future, whether to log its error and worker of each pending request
+        self._pending: Dict[int, Tuple[concurrent.futures.Future, bool, int]] = {}
+        self._dead_workers: Set[int] = set()
+        self._shared_memories: Dict[int, SharedMemory] = {}
+        self._inboxes: List[multiprocessing.Queue] = []
+        self._processes: List[multiprocessing.Process] = []
+        self._readers: List[threading.Thread] = []
+
+        for worker in range(self.max_workers):
+            inbox, outbox = context.Queue(), context.Queue()
+            process = context.Process(
+                target=_worker_main, args=(inbox, outbox), daemon=True
+            )
+            process.start()
+            reader = threading.Thread(
+                target=self._read_replies,
+                args=(worker, process, outbox),
+                name=f"ProcessRuntime-{worker}",
+                daemon=True,
+            )
+            reader.start()
+            self._inboxes.append(inbox)
+            self._processes.append(process)
+            self._readers.append(reader)
+
+    def spawn(
+        self,
+        factory: Callable[[], BaseAgent],
+        shared_memory: Optional[SharedMemory] = None,
+        timeout: Optional[float] = None,
+    ) -> AgentProcess:
+        """Create an agent in one of the worker processes.
+
+        Args:
+            factory (Callable[[], BaseAgent]): Picklable callable creating the
+                agent, such as a module-level function or an agent class.
+            shared_memory (Optional[SharedMemory]): Shared memory receiving the
+                events the agent adds to its own shared memory.
+            timeout (Optional[float]): Seconds to wait for the agent to be created
+                before raising ``TimeoutError``. Waits forever if None.
+
+        Returns:
+            AgentProcess: Handle used to send events to the agent.
+
+        Raises:
+            RuntimeError: If the worker process has died.
+            Exception: Any exception raised by the factory.
+        """
+        with self._lock:
+            agent_id = next(self._agent_ids)
+            worker = agent_id % self.max_workers
+            request_id, future = self._add_pending(worker, False)
+            if shared_memory is not None:
+                self._shared_memories[agent_id] = shared_memory
+
+        objective = shared_memory.objective if shared_memory is not None else None
+        if not future.done():
+            self._inboxes[worker].put(
+                ("spawn", request_id, agent_id, factory, objective)
+            )
+        future.result(timeout)
+        return AgentProcess(self, agent_id, worker)
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the worker processes once the events already sent are handled.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for each worker.
+        """
+        for inbox in self._inboxes:
+            inbox.put(("stop",))
+        for process, reader in zip(self._processes, self._readers):
+            reader.join(timeout)
+            process.join(timeout)
+
+    def _send(
+        self, agent_process: AgentProcess, event: Event, log_errors: bool = False
+    ) -> RuntimeFuture:
+        worker = agent_process.worker
+        with self._lock:
+            request_id, future = self._add_pending(worker, log_errors)
+
+        if not future.done():
+            self._inboxes[worker].put(
+                ("event", agent_process.agent_id, request_id, dump_event(event))
+            )
+        return RuntimeFuture(future)
+
+    def _add_pending(
+        self, worker: int, log_errors: bool
+    ) -> Tuple[int, concurrent.futures.Future]:
+        # Must be called with the lock held
+        request_id = next(self._ids)
+        future = concurrent.futures.Future()
+        if worker in self._dead_workers:
+            future.set_exception(self._worker_died_error(worker))
+        else:
+            self._pending[request_id] = (future, log_errors, worker)
+        return request_id, future
+
+    def _worker_died_error(self, worker: int) -> RuntimeError:
+        exitcode = self._processes[worker].exitcode
+        return RuntimeError(f"Worker process {worker} died with exit code {exitcode}")
+
+    def _fail_worker(self, worker: int):
+        error = self._worker_died_error(worker)
+        with self._lock:
+            self._dead_workers.add(worker)
+            request_ids = [
+                request_id
+                for request_id, (_, _, pending_worker) in self._pending.items()
+                if pending_worker == worker
+            ]
+            failed = [self._pending.pop(request_id) for request_id in request_ids]
+
+        logger.error(str(error))
+        for future, _, _ in failed:
+            future.set_exception(error)
+
+    def _read_replies(
+        self,
+        worker: int,
+        process: multiprocessing.Process,
+        outbox: multiprocessing.Queue,
+    ):
+        while True:
+            try:
+                message = outbox.get(timeout=LIVENESS_INTERVAL)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._fail_worker(worker)
+                    return
+                continue
+
+            kind = message[0]
+            if kind == "stopped":
+                return
+
+            if kind == "event":
+                # Forward events added by agents to the shared memory of the parent
+                _, agent_id, data = message
+                shared_memory = self._shared_memories.get(agent_id)
+                if shared_memory is not None:
+                    asyncio.run(shared_memory.add_event(load_event(data)))
+                continue
+
+            if kind == "spawned":
+                _, request_id, error = message
+                result = None
+            else:
+                _, request_id, data, error = message
+                result = load_task_result(data)
+
+            with self._lock:
+                future, log_errors, _ = self._pending.pop(request_id)
+            if error is None:
+                future.set_result(result)
+            else:
+                if log_errors:
+                    logger.error(f"Error in agent process: {error!r}")
+                future.set_exception(error)
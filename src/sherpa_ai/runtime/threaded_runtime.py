@@ -30,8 +30,12 @@ class ThreadedRuntime(ThreadingActor):
         Returns:
             Any: The (future of) result of the event handling.
         """
-        asyncio.run(self.agent.async_handle_event(event))
-        return self.agent.run()
+        return asyncio.run(self._handle(event))
+
+    async def _handle(self, event: Event) -> Any:
+        # Handle the event and run the agent on a single event loop
+        await self.agent.async_handle_event(event)
+        return await self.agent.async_run()
 
     def wait(self) -> bool:
         """Wait for the agent to finish anything it is currently doing
@@ -228,17 +228,8 @@ class QuestionWithFileHandler:
                 title=file_info["title"],
                 text_data=data,
                 llm=self.llm,
+                max_summary_tokens=3000,
             )
-
-            while count_string_tokens(chunk_summary, "gpt-3.5-turbo") > 3000:
-                chunk_summary = chunk_and_summarize_file(
-                    file_format=file_info["filetype"],
-                    file_name=file_info["name"],
-                    question=self.question,
-                    title=file_info["title"],
-                    text_data=chunk_summary,
-                    llm=self.llm,
-                )
         result = question_with_file_reconstructor(
             file_format=file_info["filetype"],
             data=chunk_summary,
@@ -120,7 +120,9 @@ def get_llm(external_api: bool):
     """
     if external_api:
         # initialize the configuration loading
-        import sherpa_ai.config  # noqa: F401
+        import sherpa_ai.config
+
+        sherpa_ai.config.load_settings()
 
     def get(
         filename: str,
@@ -0,0 +1,225 @@
+"""Token counting service for Sherpa AI.
+
+This module provides a shared, cached way of counting tokens. Encoders are loaded
+once per model, recently counted strings are remembered in an LRU cache, and a
+batch API counts many strings in one call. Policies and belief truncation use it
+instead of asking the language model to count tokens every time.
+
+Example:
+    >>> from sherpa_ai.token_counter import get_token_counter
+    >>> counter = get_token_counter("gpt-4o-mini")
+    >>> counter("Hello world")
+    2
+    >>> counter.count_many(["Hello", "Hello world"])
+    [1, 2]
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import tiktoken
+
+# Encoding used for models tiktoken does not know, such as non-OpenAI models
+FALLBACK_ENCODING = "cl100k_base"
+
+# Number of string to token count results remembered by each counter
+DEFAULT_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model_name: str) -> tiktoken.Encoding:
+    """Get the tiktoken encoding of a model, loading it only once.
+
+    Args:
+        model_name (str): Name of the model (e.g., "gpt-3.5-turbo").
+
+    Returns:
+        tiktoken.Encoding: Encoding of the model, or the cl100k_base encoding for
+            models tiktoken does not recognize.
+    """
+    try:
+        encoding_name = tiktoken.encoding_name_for_model(model_name)
+    except KeyError:
+        encoding_name = FALLBACK_ENCODING
+    return tiktoken.get_encoding(encoding_name)
+
+
+def is_tiktoken_model(model_name: str) -> bool:
+    """Check whether tiktoken knows the encoding of a model."""
+    try:
+        tiktoken.encoding_name_for_model(model_name)
+        return True
+    except KeyError:
+        return False
+
+
+class TokenCounter:
+    """Count tokens with an LRU cache of recent results.
+
+    Instances are callable, so they can be passed wherever a
+    ``Callable[[str], int]`` token counter is expected, such as
+    ``Belief.get_context``. They are safe to share between threads.
+
+    Attributes:
+        count_fn (Callable[[str], int]): Counts the tokens of one string.
+        count_batch_fn (Optional[Callable[[List[str]], List[int]]]): Counts the tokens
+            of several strings at once. Defaults to calling ``count_fn`` on each.
+        cache_size (int): Maximum number of results kept in the cache.
+
+    Example:
+        >>> counter = TokenCounter(lambda text: len(text.split()))
+        >>> counter("one two three")
+        3
+    """
+
+    def __init__(
+        self,
+        count_fn: Callable[[str], int],
+        count_batch_fn: Optional[Callable[[List[str]], List[int]]] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ):
+        self.count_fn = count_fn
+        self.count_batch_fn = count_batch_fn
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, text: str) -> int:
+        return self.count(text)
+
+    def count(self, text: str) -> int:
+        """Count the tokens of a string.
+
+        Args:
+            text (str): Text to count the tokens of.
+
+        Returns:
+            int: Number of tokens in the text.
+        """
+        with self._lock:
+            count = self._cache.get(text)
+            if count is not None:
+                self._cache.move_to_end(text)
+                return count
+
+        count = self.count_fn(text)
+        self._remember([(text, count)])
+        return count
+
+    def count_many(self, texts: Iterable[str]) -> List[int]:
+        """Count the tokens of several strings.
+
+        Strings that are not cached are counted together in a single batch.
+
+        Args:
+            texts (Iterable[str]): Texts to count the tokens of.
+
+        Returns:
+            List[int]: Number of tokens of each text, in the same order.
+        """
+        texts = list(texts)
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                count = self._cache.get(text)
+                if count is None:
+                    missing.setdefault(text, []).append(i)
+                else:
+                    self._cache.move_to_end(text)
+                    counts[i] = count
+
+        if missing:
+            missing_texts = list(missing)
+            if self.count_batch_fn is not None:
+                missing_counts = self.count_batch_fn(missing_texts)
+            else:
+                missing_counts = [self.count_fn(text) for text in missing_texts]
+
+            for text, count in zip(missing_texts, missing_counts):
+                for i in missing[text]:
+                    counts[i] = count
+            self._remember(zip(missing_texts, missing_counts))
+
+        return counts
+
+    def clear_cache(self):
+        """Forget all cached results."""
+        with self._lock:
+            self._cache.clear()
+
+    def _remember(self, results: Iterable[Tuple[str, int]]):
+        with self._lock:
+            for text, count in results:
+                self._cache[text] = count
+                self._cache.move_to_end(text)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+
+@lru_cache(maxsize=None)
+def get_token_counter(model_name: str) -> TokenCounter:
+    """Get the shared token counter of a model.
+
+    The encoding of the model is loaded the first time a string is counted.
+
+    Args:
+        model_name (str): Name of the model (e.g., "gpt-3.5-turbo"). Models tiktoken
+            does not recognize are counted with the cl100k_base encoding.
+
+    Returns:
+        TokenCounter: Token counter shared by all callers using this model.
+    """
+
+    def count(text: str) -> int:
+        return len(get_encoding(model_name).encode(text))
+
+    def count_batch(texts: List[str]) -> List[int]:
+        return [len(tokens) for tokens in get_encoding(model_name).encode_batch(texts)]
+
+    return TokenCounter(count, count_batch)
+
+
+# Token counters of language models tiktoken has no encoding for, by id of the model
+_llm_counters: Dict[int, Tuple[Any, TokenCounter]] = {}
+_llm_counters_lock = threading.Lock()
+
+
+def get_llm_token_counter(llm: Any) -> TokenCounter:
+    """Get the shared token counter of a language model.
+
+    Models whose name tiktoken recognizes are counted locally with the shared
+    counter of that model. Other models keep using their own ``get_num_tokens``,
+    with its results cached by a counter shared for as long as the model lives.
+
+    Args:
+        llm (BaseLanguageModel): The language model whose tokens are counted.
+
+    Returns:
+        TokenCounter: Token counter for the language model.
+
+    Example:
+        >>> counter = get_llm_token_counter(ChatOpenAI(model="gpt-4o-mini"))
+        >>> context = belief.get_context(counter)
+    """
+    model_name = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    if isinstance(model_name, str) and is_tiktoken_model(model_name):
+        return get_token_counter(model_name)
+
+    key = id(llm)
+    with _llm_counters_lock:
+        entry = _llm_counters.get(key)
+        if entry is not None and entry[0]() is llm:
+            return entry[1]
+
+        counter = TokenCounter(llm.get_num_tokens)
+        try:
+            ref = weakref.ref(llm, lambda _: _llm_counters.pop(key, None))
+        except TypeError:
+            # Models that cannot be weakly referenced get a counter of their own
+            return counter
+        _llm_counters[key] = (ref, counter)
+        return counter
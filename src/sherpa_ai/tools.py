@@ -693,20 +693,9 @@ class LinkScraperTool(BaseTool):
                         # TODO_ user id is not going to be needed here in the future
                         # user_id="",
                         llm=llm,
+                        max_summary_tokens=per_scrape_token_size,
                     )
 
-                    while (
-                        count_string_tokens(chunk_summary, "gpt-3.5-turbo")
-                        > per_scrape_token_size
-                    ):
-                        chunk_summary = chunk_and_summarize(
-                            link=link,
-                            question=query,
-                            text_data=chunk_summary,
-                            # user_id="",
-                            llm=llm,
-                        )
-
                     final_summary.append({"data": chunk_summary, "link": link})
                 else:
                     final_summary.append({"data": "Scraping failed", "link": link})
@@ -6,13 +6,15 @@ import ipaddress
 import json
 import re
 import socket
-from typing import TYPE_CHECKING, Any, List, Optional, Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Union
 from urllib.parse import urljoin, urlparse
 
 import requests
-import tiktoken
 from loguru import logger
 
+from sherpa_ai.token_counter import get_token_counter
+
 if TYPE_CHECKING:
     from langchain_core.documents import Document
     from langchain_core.language_models import BaseLanguageModel
@@ -278,14 +280,123 @@ def markdown_to_text(markdown: str) -> str:
     return text
 
 
-def load_files(files: List[str]) -> List[Document]:
+def _check_file_type(f: str):
+    if not f.endswith((".pdf", ".md", ".gitkeep")):
+        raise NotImplementedError(f"File type {f} not supported")
+
+
+def _load_file(f: str, start_page: Optional[int] = None, end_page: Optional[int] = None):
+    logger.info(f"Loading file {f}")
+    if f.endswith(".pdf"):
+        return extract_text_from_pdf(f, start_page, end_page)
+    elif f.endswith(".md"):
+        with open(f, encoding="utf-8", errors="replace") as md_file:
+            return markdown_to_text(md_file.read())
+    return None
+
+
+# Minimum number of files or PDF page ranges for which ``iter_load_files`` starts
+# a process pool by default. Below this, starting the processes costs more than
+# loading the files one after the other.
+LOAD_FILES_MIN_PARALLEL_TASKS = 8
+
+
+def _file_tasks(files: List[str], pages_per_task: Optional[int]) -> List[tuple]:
+    # Split large PDFs into page ranges so one file can use several processes
+    tasks = []
+    for f in files:
+        _check_file_type(f)
+        if f.endswith(".gitkeep"):
+            continue
+        if pages_per_task is not None and f.endswith(".pdf"):
+            num_pages = count_pdf_pages(f)
+            for start in range(0, max(num_pages, 1), pages_per_task):
+                tasks.append((f, start, min(start + pages_per_task, num_pages)))
+        else:
+            tasks.append((f, None, None))
+    return tasks
+
+
+def iter_load_files(
+    files: List[str],
+    max_workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+) -> Iterator[Document]:
+    """Load files, yielding each document as soon as it is ready.
+
+    Files are loaded one after the other in the current process, unless there are
+    enough of them for a process pool to pay off. With a pool, documents are
+    yielded in the order their files finish loading, so they can be split and
+    embedded while other files are still being parsed.
+
+    Args:
+        files (List[str]): A list of file paths to load.
+        max_workers (Optional[int]): Number of processes loading files. If None, a
+            pool with one process per CPU is only used when there are at least
+            ``LOAD_FILES_MIN_PARALLEL_TASKS`` files or PDF page ranges to load.
+            Files are loaded in the current process if it is 1.
+        pages_per_task (Optional[int]): If set, PDFs are extracted in ranges of this
+            many pages, each in its own task when a process pool is used.
+
+    Yields:
+        Document: The document of each loaded file.
+
+    Raises:
+        NotImplementedError: If the type of a file is not supported.
+
+    Example:
+        >>> from sherpa_ai.utils import iter_load_files
+        >>> for document in iter_load_files(["file1.pdf", "file2.md"]):
+        ...     print(document.metadata["source"])
+    """
+    from langchain_core.documents import Document
+
+    tasks = _file_tasks(files, pages_per_task if max_workers != 1 else None)
+    if max_workers is None:
+        parallel = len(tasks) >= LOAD_FILES_MIN_PARALLEL_TASKS
+    else:
+        parallel = max_workers > 1 and len(tasks) > 1
+    if not parallel:
+        # Load whole files, page ranges only help when spread over processes
+        for f in dict.fromkeys(f for f, _, _ in tasks):
+            yield Document(page_content=_load_file(f), metadata={"source": f})
+        return
+
+    remaining = {}
+    for f, _, _ in tasks:
+        remaining[f] = remaining.get(f, 0) + 1
+    parts: dict = {f: {} for f in remaining}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_load_file, *task): task for task in tasks}
+        for future in as_completed(futures):
+            f, start_page, _ = futures[future]
+            parts[f][start_page or 0] = future.result()
+            remaining[f] -= 1
+            if remaining[f] == 0:
+                file_parts = parts.pop(f)
+                text = "".join(file_parts[page] for page in sorted(file_parts))
+                yield Document(page_content=text, metadata={"source": f})
+
+
+def load_files(
+    files: List[str],
+    max_workers: Optional[int] = None,
+    pages_per_task: Optional[int] = None,
+) -> List[Document]:
     """Load files from a list of file paths.
 
+    Many files are loaded in parallel, see :func:`iter_load_files`.
+
     Args:
         files (List[str]): A list of file paths to load.
+        max_workers (Optional[int]): Number of processes loading files. If None, a
+            process pool is only used for many files, see :func:`iter_load_files`.
+        pages_per_task (Optional[int]): If set, PDFs are extracted in ranges of this
+            many pages, each in its own task.
 
     Returns:
-        List[Document]: A list of loaded documents.
+        List[Document]: A list of loaded documents, in the order of the files.
 
     Example:
         >>> from langchain_core.documents import Document
@@ -295,22 +406,11 @@ def load_files(files: List[str]) -> List[Document]:
         >>> print(len(documents))
         2
     """
-    from langchain_core.documents import Document
-
-    documents = []
-    for f in files:
-        logger.info(f"Loading file {f}")
-        if f.endswith(".pdf"):
-            text = extract_text_from_pdf(f)
-            documents.append(Document(page_content=text, metadata={"source": f}))
-        elif f.endswith(".md"):
-            with open(f, encoding="utf-8", errors="replace") as md_file:
-                text = markdown_to_text(md_file.read())
-            documents.append(Document(page_content=text, metadata={"source": f}))
-        elif f.endswith(".gitkeep"):
-            pass
-        else:
-            raise NotImplementedError(f"File type {f} not supported")
+    order = {f: i for i, f in enumerate(files)}
+    documents = sorted(
+        iter_load_files(files, max_workers, pages_per_task),
+        key=lambda document: order[document.metadata["source"]],
+    )
     logger.info(documents)
     return documents
 
@@ -437,6 +537,9 @@ def count_string_tokens(string: str, model_name: str) -> int:
     """
     Returns the number of tokens in a text string.
 
+    The encoding of each model is loaded once and recent results are cached, see
+    :func:`sherpa_ai.token_counter.get_token_counter`.
+
     Args:
         string (str): The text string.
         model_name (str): The name of the encoding to use. (e.g., "gpt-3.5-turbo")
@@ -444,17 +547,180 @@ def count_string_tokens(string: str, model_name: str) -> int:
     Returns:
         int: The number of tokens in the text string.
     """
+    return get_token_counter(model_name).count(string)
+
+
+# Maximum number of chunk summaries requested from the LLM at the same time
+SUMMARY_MAX_CONCURRENCY = 5
+
+# Token size of the chunks text is split into before being summarized
+SUMMARY_CHUNK_SIZE = 3000
+
+# Maximum number of times a text is summarized to fit ``max_summary_tokens``
+SUMMARY_MAX_ROUNDS = 3
+
+
+def _summary_prompt(instruction: str, text: str) -> str:
+    return f"""Write a concise summary of the following text
+            {instruction}:
+            "\n\n\n
+            f'LITERAL TEXT: {text}
+            \n\n\n
+            CONCISE SUMMARY: The text is best summarized as"""
+
+
+def _summary_text(summarized: Any) -> str:
+    # Chat models return a message object; completion models return a str.
+    # Use .text (not .content) since langchain-core 1.x content can be a
+    # list of content blocks rather than a plain string.
+    return summarized.text if hasattr(summarized, "text") else str(summarized)
+
+
+def _split_summary_chunks(text_data: str) -> List[str]:
+    from langchain_text_splitters import TokenTextSplitter
+
+    text_splitter = TokenTextSplitter(chunk_size=SUMMARY_CHUNK_SIZE, chunk_overlap=0)
+    return text_splitter.split_text(text_data)
+
+
+def _needs_reduce(summary: str, max_summary_tokens: Optional[int]) -> bool:
+    return (
+        max_summary_tokens is not None
+        and count_string_tokens(summary, "gpt-3.5-turbo") > max_summary_tokens
+    )
+
+
+def _warn_summary_too_long(max_rounds: int, max_summary_tokens: Optional[int]):
+    logger.warning(
+        f"Summary still longer than {max_summary_tokens} tokens after "
+        f"{max_rounds} rounds, returning it as is"
+    )
+
+
+def summarize_chunks(
+    text_data: str,
+    instruction: str,
+    llm: BaseLanguageModel,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
+    max_rounds: int = SUMMARY_MAX_ROUNDS,
+) -> str:
+    """Summarize a text chunk by chunk, with the chunks summarized concurrently.
+
+    The text is split into chunks of ``SUMMARY_CHUNK_SIZE`` tokens whose summaries
+    are requested together with ``llm.batch``. The summaries are joined in the
+    order of the chunks.
+
+    Args:
+        text_data (str): The text to summarize.
+        instruction (str): Instruction describing what the summary should contain.
+        llm (BaseLanguageModel): The language model to use for summarization.
+        max_concurrency (int): Maximum number of chunks summarized at the same time.
+        max_summary_tokens (Optional[int]): If set, the joined summary is summarized
+            again until it is at most this many tokens.
+        max_rounds (int): Maximum number of times the text is summarized. The last
+            summary is returned if it is still longer than ``max_summary_tokens``.
+
+    Returns:
+        str: The summarized text.
+
+    Example:
+        >>> from sherpa_ai.utils import summarize_chunks
+        >>> llm = ChatOpenAI(model="gpt-3.5-turbo")
+        >>> summary = summarize_chunks(long_text, "focus on pricing", llm)
+    """
+    summary = text_data
+    for _ in range(max_rounds):
+        prompts = [
+            _summary_prompt(instruction, text)
+            for text in _split_summary_chunks(summary)
+        ]
+        results = llm.batch(prompts, config={"max_concurrency": max_concurrency})
+        summary = " ".join(_summary_text(result) for result in results)
+        if not _needs_reduce(summary, max_summary_tokens):
+            return summary
+
+    _warn_summary_too_long(max_rounds, max_summary_tokens)
+    return summary
+
+
+async def async_summarize_chunks(
+    text_data: str,
+    instruction: str,
+    llm: BaseLanguageModel,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
+    max_rounds: int = SUMMARY_MAX_ROUNDS,
+) -> str:
+    """Asynchronously summarize a text chunk by chunk.
+
+    Same as :func:`summarize_chunks`, with the chunks summarized by ``llm.ainvoke``
+    and at most ``max_concurrency`` requests in flight at once.
+
+    Args:
+        text_data (str): The text to summarize.
+        instruction (str): Instruction describing what the summary should contain.
+        llm (BaseLanguageModel): The language model to use for summarization.
+        max_concurrency (int): Maximum number of chunks summarized at the same time.
+        max_summary_tokens (Optional[int]): If set, the joined summary is summarized
+            again until it is at most this many tokens.
+        max_rounds (int): Maximum number of times the text is summarized. The last
+            summary is returned if it is still longer than ``max_summary_tokens``.
+
+    Returns:
+        str: The summarized text.
+
+    Example:
+        >>> summary = await async_summarize_chunks(long_text, "focus on pricing", llm)
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize(text: str) -> str:
+        async with semaphore:
+            return _summary_text(await llm.ainvoke(_summary_prompt(instruction, text)))
+
+    summary = text_data
+    for _ in range(max_rounds):
+        results = await asyncio.gather(
+            *[summarize(text) for text in _split_summary_chunks(summary)]
+        )
+        summary = " ".join(results)
+        if not _needs_reduce(summary, max_summary_tokens):
+            return summary
+
+    _warn_summary_too_long(max_rounds, max_summary_tokens)
+    return summary
 
-    try: 
-        encoding = tiktoken.encoding_for_model(model_name)
-        return len(encoding.encode(string))
-    except KeyError: 
-        # Fall back to cl100k_base encoding for non-OpenAI models that tiktoken doesn't recognize
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return len(encoding.encode(string))
 
+def _link_summary_instruction(question: str, link: str) -> str:
+    return (
+        "include any information that can be used to answer the "
+        f"question '{question}' the given literal text is a data "
+        f"from the link {link}. Do not directly answer the question itself"
+    )
 
-def chunk_and_summarize(text_data: str, question: str, link: str, llm):
+
+def _file_summary_instruction(
+    question: str, file_name: str, file_format: str, title: Optional[str]
+) -> str:
+    title = f",title {title} " if title is not None else ""
+    return (
+        f"include any information that can be used to answer the "
+        f"question '{question}' the given literal text is a data "
+        f"from the file named {file_name}"
+        f"{title} and file format {file_format}."
+        f"Do not directly answer the question itself"
+    )
+
+
+def chunk_and_summarize(
+    text_data: str,
+    question: str,
+    link: str,
+    llm,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
+):
     """Chunk and summarize text.
 
     Args:
@@ -462,6 +728,9 @@ def chunk_and_summarize(text_data: str, question: str, link: str, llm):
         question (str): The question to answer.
         link (str): The link to the text.
         llm (BaseLanguageModel): The language model to use for summarization.
+        max_concurrency (int): Maximum number of chunks summarized at the same time.
+        max_summary_tokens (Optional[int]): If set, the summary is summarized again
+            until it is at most this many tokens.
 
     Returns:
         str: The summarized text.
@@ -476,35 +745,37 @@ def chunk_and_summarize(text_data: str, question: str, link: str, llm):
         >>> print(result)
         "This is a test text."
     """
-    from langchain_text_splitters import TokenTextSplitter
-
-    instruction = (
-        "include any information that can be used to answer the "
-        f"question '{question}' the given literal text is a data "
-        f"from the link {link}. Do not directly answer the question itself"
+    return summarize_chunks(
+        text_data,
+        _link_summary_instruction(question, link),
+        llm,
+        max_concurrency=max_concurrency,
+        max_summary_tokens=max_summary_tokens,
     )
 
-    text_splitter = TokenTextSplitter(chunk_size=3000, chunk_overlap=0)
-    chunked_text = text_splitter.split_text(text_data)
-    chunk_summary = []
-    for text in chunked_text:
-        summarized = llm.invoke(
-            f"""Write a concise summary of the following text
-            {instruction}:
-            "\n\n\n
-            f'LITERAL TEXT: {text}
-            \n\n\n
-            CONCISE SUMMARY: The text is best summarized as"""
-        )
-        # Chat models return a message object; completion models return a str.
-        # Use .text (not .content) since langchain-core 1.x content can be a
-        # list of content blocks rather than a plain string.
-        summarized = (
-            summarized.text if hasattr(summarized, "text") else str(summarized)
-        )
-        chunk_summary.append(summarized)
 
-    return " ".join(chunk_summary)
+async def async_chunk_and_summarize(
+    text_data: str,
+    question: str,
+    link: str,
+    llm,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
+):
+    """Asynchronously chunk and summarize text.
+
+    See :func:`chunk_and_summarize` for the arguments.
+
+    Returns:
+        str: The summarized text.
+    """
+    return await async_summarize_chunks(
+        text_data,
+        _link_summary_instruction(question, link),
+        llm,
+        max_concurrency=max_concurrency,
+        max_summary_tokens=max_summary_tokens,
+    )
 
 
 def chunk_and_summarize_file(
@@ -514,6 +785,8 @@ def chunk_and_summarize_file(
     file_format: str,
     llm,
     title: str = None,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
 ):
     """Chunk and summarize a file.
 
@@ -524,6 +797,9 @@ def chunk_and_summarize_file(
         file_format (str): The format of the file.
         llm (BaseLanguageModel): The language model to use for summarization.
         title (str): The title of the file.
+        max_concurrency (int): Maximum number of chunks summarized at the same time.
+        max_summary_tokens (Optional[int]): If set, the summary is summarized again
+            until it is at most this many tokens.
 
     Returns:
         str: The summarized text.
@@ -539,37 +815,39 @@ def chunk_and_summarize_file(
         >>> print(result)
         "This is a test text."
     """
-    from langchain_text_splitters import TokenTextSplitter
+    return summarize_chunks(
+        text_data,
+        _file_summary_instruction(question, file_name, file_format, title),
+        llm,
+        max_concurrency=max_concurrency,
+        max_summary_tokens=max_summary_tokens,
+    )
 
-    title = f",title {title} " if title is not None else ""
 
-    instruction = (
-        f"include any information that can be used to answer the "
-        f"question '{question}' the given literal text is a data "
-        f"from the file named {file_name}"
-        f"{title} and file format {file_format}."
-        f"Do not directly answer the question itself"
+async def async_chunk_and_summarize_file(
+    text_data: str,
+    question: str,
+    file_name: str,
+    file_format: str,
+    llm,
+    title: str = None,
+    max_concurrency: int = SUMMARY_MAX_CONCURRENCY,
+    max_summary_tokens: Optional[int] = None,
+):
+    """Asynchronously chunk and summarize a file.
+
+    See :func:`chunk_and_summarize_file` for the arguments.
+
+    Returns:
+        str: The summarized text.
+    """
+    return await async_summarize_chunks(
+        text_data,
+        _file_summary_instruction(question, file_name, file_format, title),
+        llm,
+        max_concurrency=max_concurrency,
+        max_summary_tokens=max_summary_tokens,
     )
-    text_splitter = TokenTextSplitter(chunk_size=3000, chunk_overlap=0)
-    chunked_text = text_splitter.split_text(text_data)
-    chunk_summary = []
-    for text in chunked_text:
-        summarized = llm.invoke(
-            f"""Write a concise summary of the following text
-            {instruction}:
-            "\n\n\n
-            f'LITERAL TEXT: {text}
-            \n\n\n
-            CONCISE SUMMARY: The text is best summarized as"""
-        )
-        # Chat models return a message object; completion models return a str.
-        # Use .text (not .content) since langchain-core 1.x content can be a
-        # list of content blocks rather than a plain string.
-        summarized = (
-            summarized.text if hasattr(summarized, "text") else str(summarized)
-        )
-        chunk_summary.append(summarized)
-    return " ".join(chunk_summary)
 
 
 def question_with_file_reconstructor(
@@ -674,7 +952,7 @@ def show_commands_only(logs):
     return log_string
 
 
-def extract_text_from_pdf(pdf_path):
+def _pdf_reader():
     try:
         from pypdf import PdfReader
     except ImportError:
@@ -683,25 +961,45 @@ def extract_text_from_pdf(pdf_path):
             "This is needed in order to to use extract_text_from_pdf. "
             "Please install it with `pip install pypdf`"
         )
+    return PdfReader
+
+
+def count_pdf_pages(pdf_path: str) -> int:
+    """Count the pages of a PDF file.
+
+    Args:
+        pdf_path (str): The path to the PDF file.
+
+    Returns:
+        int: The number of pages in the PDF file.
+    """
+    PdfReader = _pdf_reader()
+    with open(pdf_path, "rb") as pdf_file:
+        return len(PdfReader(pdf_file).pages)
+
+
+def extract_text_from_pdf(
+    pdf_path, start_page: Optional[int] = None, end_page: Optional[int] = None
+):
     """Extract text from a PDF file.
 
     Args:
         pdf_path (str): The path to the PDF file.
+        start_page (Optional[int]): Index of the first page to extract. Defaults to
+            the first page.
+        end_page (Optional[int]): Index after the last page to extract. Defaults to
+            the end of the file.
 
     Returns:
         str: The extracted text from the PDF file.
     """
-    text = ""
-    # Extract text from a PDF using PdfReader
-    pdf_file = open(pdf_path, "rb")
-    pdf_reader = PdfReader(pdf_file)
-
-    text = ""
-    for page in pdf_reader.pages:
-        text += page.extract_text()
+    PdfReader = _pdf_reader()
 
-    pdf_file.close()
-    return text
+    # Extract text from a PDF using PdfReader
+    with open(pdf_path, "rb") as pdf_file:
+        pdf_reader = PdfReader(pdf_file)
+        pages = pdf_reader.pages[start_page:end_page]
+        return "".join(page.extract_text() for page in pages)
 
 
 def extract_urls(text):
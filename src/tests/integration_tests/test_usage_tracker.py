@@ -4,14 +4,16 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 
 import sherpa_ai.config as cfg
 from sherpa_ai.database.user_usage_tracker import (
     UsageTracker,
+    UsageWindow,
     UserUsageTracker,
     Whitelist,
+    update_usage_windows,
 )
 from sherpa_ai.verbose_loggers.base import BaseVerboseLogger
 
@@ -48,6 +50,7 @@ def session(connection):
 def delete_table_data(db):
     db.session.query(Whitelist).delete()
     db.session.query(UsageTracker).delete()
+    db.session.query(UsageWindow).delete()
     db.session.commit()
 
 
@@ -523,3 +526,249 @@ def test_cost_tracking_with_different_models(tracker, mock_s3_client):
     for model, _, expected_cost in models_and_expected_costs:
         assert model in summary["model_breakdown"]
         assert abs(summary["model_breakdown"][model] - expected_cost) < 0.000001
+
+
+# Batched usage writer tests
+
+def test_usage_writer_batches_records_until_flush(tmp_path):
+    from sherpa_ai.database.usage_writer import UsageWriter
+
+    writer_url = f"sqlite:///{tmp_path / 'writer.db'}"
+    writer_engine = create_engine(writer_url)
+    db = UserUsageTracker(db_name="writer.db", db_url=writer_url, engine=writer_engine)
+    flushed = []
+    writer = UsageWriter(
+        writer_engine,
+        UsageTracker,
+        batch_size=100,
+        flush_interval=60,
+        on_flush=lambda batch: flushed.append(len(batch)),
+    )
+
+    for i in range(5):
+        writer.submit({"user_id": USER_ID, "cost": 0.1, "timestamp": i})
+
+    # Nothing is written before the interval elapses or the batch fills up
+    assert db.session.query(UsageTracker).count() == 0
+
+    assert writer.flush(timeout=5)
+    assert db.session.query(UsageTracker).count() == 5
+    # All queued records are written with a single insert
+    assert flushed == [5]
+
+    writer.submit({"user_id": USER_ID, "cost": 0.1})
+    writer.close(timeout=5)
+    db.session.expire_all()
+    assert db.session.query(UsageTracker).count() == 6
+    with pytest.raises(RuntimeError):
+        writer.submit({"user_id": USER_ID})
+
+
+def test_usage_writer_flushes_when_batch_is_full(tmp_path):
+    from sherpa_ai.database.usage_writer import UsageWriter
+
+    writer_url = f"sqlite:///{tmp_path / 'writer.db'}"
+    writer_engine = create_engine(writer_url)
+    UserUsageTracker(db_name="writer.db", db_url=writer_url, engine=writer_engine)
+    flushed = []
+    writer = UsageWriter(
+        writer_engine,
+        UsageTracker,
+        batch_size=2,
+        flush_interval=60,
+        on_flush=lambda batch: flushed.append(len(batch)),
+    )
+
+    for _ in range(4):
+        writer.submit({"user_id": USER_ID, "cost": 0.1})
+    writer.close(timeout=5)
+
+    assert flushed == [2, 2]
+
+
+def test_usage_writer_keeps_records_that_fail_to_be_written(tmp_path):
+    from sherpa_ai.database.usage_writer import UsageWriter
+
+    writer_url = f"sqlite:///{tmp_path / 'writer.db'}"
+    writer_engine = create_engine(writer_url)
+    db = UserUsageTracker(db_name="writer.db", db_url=writer_url, engine=writer_engine)
+    failing_users = {"bad_user"}
+
+    def on_write(session, records):
+        if any(record["user_id"] in failing_users for record in records):
+            raise RuntimeError("insert failed")
+
+    flushed = []
+    writer = UsageWriter(
+        writer_engine,
+        UsageTracker,
+        flush_interval=60,
+        on_write=on_write,
+        on_flush=lambda batch: flushed.append(len(batch)),
+    )
+
+    for user_id in [USER_ID, "bad_user", USER_ID]:
+        writer.submit({"user_id": user_id, "cost": 0.1})
+    assert writer.flush(timeout=5)
+
+    # The other records of the failed batch are written one at a time
+    assert db.session.query(UsageTracker).count() == 2
+    assert flushed == [2]
+
+    # The failed record is retried with the next flush
+    failing_users.clear()
+    assert writer.flush(timeout=5)
+    db.session.expire_all()
+    assert db.session.query(UsageTracker).filter_by(user_id="bad_user").count() == 1
+    writer.close(timeout=5)
+
+
+def test_usage_writer_drops_records_after_max_retries(tmp_path):
+    from sherpa_ai.database.usage_writer import UsageWriter
+
+    writer_url = f"sqlite:///{tmp_path / 'writer.db'}"
+    writer_engine = create_engine(writer_url)
+    db = UserUsageTracker(db_name="writer.db", db_url=writer_url, engine=writer_engine)
+    attempts = []
+
+    def on_write(session, records):
+        attempts.append(len(records))
+        raise RuntimeError("insert failed")
+
+    writer = UsageWriter(
+        writer_engine,
+        UsageTracker,
+        flush_interval=60,
+        max_retries=1,
+        on_write=on_write,
+    )
+
+    writer.submit({"user_id": USER_ID, "cost": 0.1})
+    for _ in range(3):
+        assert writer.flush(timeout=5)
+    writer.close(timeout=5)
+
+    # Written once, retried once and then dropped
+    assert attempts == [1, 1]
+    assert db.session.query(UsageTracker).count() == 0
+
+
+def test_shared_usage_tracker_queues_usage(tmp_path, mock_s3_client):
+    from sherpa_ai.database.user_usage_tracker import get_usage_tracker
+
+    class TestLogger(BaseVerboseLogger):
+        def __init__(self) -> None:
+            self.message = ""
+
+        def log(self, message):
+            self.message = message
+
+    db_url = f"sqlite:///{tmp_path / 'shared.db'}"
+    shared = get_usage_tracker(db_url)
+    assert get_usage_tracker(db_url) is shared
+
+    shared.max_daily_token = 1000
+    logger = TestLogger()
+    try:
+        result = shared.add_usage(
+            user_id="jack",
+            input_tokens=400,
+            output_tokens=400,
+            check_limits=False,
+            verbose_logger=logger,
+        )
+        assert result is None
+
+        assert shared.writer.flush(timeout=5)
+        assert shared.get_user_cost("jack") == 0.0
+        assert len(shared._get_data_since_last_reset("jack")) == 1
+        # The reminder is sent once the batch is written, to the caller's logger
+        assert logger.message.startswith("Hi friend")
+    finally:
+        shared.writer.close(timeout=5)
+        shared.close_connection()
+
+
+# Windowed usage aggregate tests
+
+def test_check_usage_only_counts_tokens_inside_the_limit_window(tracker, mock_s3_client):
+    tracker.max_daily_token = 2000
+    tracker.limit_time_size_in_hours = 1
+
+    with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=1_000_000):
+        tracker.add_usage(user_id="jack", input_tokens=500, output_tokens=500)
+    # Usage two hours later no longer sees the first record
+    with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=1_007_200):
+        tracker.add_usage(user_id="jack", input_tokens=100, output_tokens=100)
+        assert tracker._get_sum_of_tokens_since_last_reset("jack") == 200
+        check_usage = tracker.check_usage(
+            user_id="jack", input_tokens=500, output_tokens=500
+        )
+    assert check_usage["can_execute"] is True and check_usage["token-left"] == 1800
+
+    # Promoted columns and the window bucket are maintained on write
+    rows = tracker._get_data_since_last_reset("jack")
+    assert sorted(row.total_tokens for row in rows) == [200, 1000]
+    windows = tracker.session.query(UsageWindow).filter_by(user_id="jack").all()
+    assert sum(window.total_tokens for window in windows) == 1200
+    assert sum(window.calls for window in windows) == 2
+
+
+def test_check_usage_counts_the_partial_bucket_at_the_window_start(
+    tracker, mock_s3_client
+):
+    tracker.limit_time_size_in_hours = 1
+
+    # Both records share a bucket, but only the second is inside the window
+    with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=999_960):
+        tracker.add_usage(user_id="jack", input_tokens=10, output_tokens=10)
+    with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=999_990):
+        tracker.add_usage(user_id="jack", input_tokens=20, output_tokens=20)
+    with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=1_003_570):
+        assert tracker._get_sum_of_tokens_since_last_reset("jack") == 40
+
+
+def test_usage_windows_are_upserted_by_concurrent_writers(tmp_path, mock_s3_client):
+    db_url = f"sqlite:///{tmp_path / 'windows.db'}"
+    db_engine = create_engine(db_url)
+    UserUsageTracker(db_name="windows.db", db_url=db_url, engine=db_engine)
+    record = {"user_id": "jack", "timestamp": 60, "total_tokens": 10, "cost": 0.5}
+
+    # Each writer adds the first record of the bucket from its own session
+    for _ in range(2):
+        with sessionmaker(bind=db_engine)() as writer_session:
+            update_usage_windows(writer_session, [record, record])
+            writer_session.commit()
+
+    with sessionmaker(bind=db_engine)() as session:
+        window = session.query(UsageWindow).one()
+    assert (window.bucket_start, window.total_tokens, window.calls) == (60, 40, 4)
+    assert window.cost == pytest.approx(2.0)
+
+
+def test_existing_database_is_upgraded_with_token_columns(tmp_path, mock_s3_client):
+    legacy_url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    legacy_engine = create_engine(legacy_url)
+    with legacy_engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE usage_tracker (id INTEGER PRIMARY KEY, user_id VARCHAR "
+            "NOT NULL, cost FLOAT, model_name VARCHAR, session_id VARCHAR, "
+            "agent_name VARCHAR, timestamp INTEGER, reset_timestamp BOOLEAN, "
+            "reminded_timestamp BOOLEAN, usage_metadata_json TEXT)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO usage_tracker (user_id, cost, timestamp, usage_metadata_json) "
+            "VALUES ('jack', 0.5, strftime('%s', 'now'), "
+            "'{\"input_tokens\": 30, \"output_tokens\": 12, \"total_tokens\": 42}')"
+        )
+
+    db = UserUsageTracker(db_name="legacy.db", db_url=legacy_url, engine=legacy_engine)
+
+    row = db._get_data_since_last_reset("jack")[0]
+    assert (row.input_tokens, row.output_tokens, row.total_tokens) == (30, 12, 42)
+    assert db._get_sum_of_tokens_since_last_reset("jack") == 42
+    indexes = inspect(legacy_engine).get_indexes("usage_tracker")
+    assert [index["name"] for index in indexes] == [
+        "ix_usage_tracker_user_id_timestamp"
+    ]
+    db.close_connection()
@@ -1,6 +1,8 @@
+import asyncio
 from unittest.mock import MagicMock, patch
 
 import pytest
+from langchain_core.language_models import FakeListLLM
 from loguru import logger
 from nltk import tokenize
 
@@ -69,3 +71,66 @@ def test_bullet_point_refinement(get_llm):
         res_check = tokenize.sent_tokenize(output_refined[i])
         for result in res_check:
             assert result in documents[i]
+
+
+def test_refinement_batches_documents():
+    llm = FakeListLLM(responses=[])
+    responses = ["market sentence", "not relevant.", "shop sentence"]
+
+    rfiner = RefinementByQuery(llm=llm, max_concurrency=2)
+    with patch.object(FakeListLLM, "batch", return_value=responses) as batch:
+        output_refined = rfiner.refinement(documents, query)
+
+    assert output_refined == ["market sentence", "shop sentence"]
+    prompts = batch.call_args.args[0]
+    assert len(prompts) == len(documents)
+    assert batch.call_args.kwargs["config"] == {"max_concurrency": 2}
+
+
+def test_refinement_single_call():
+    llm = FakeListLLM(
+        responses=['{"1": "market sentence", "2": "not relevant.", "3": "shop"}']
+    )
+
+    rfiner = RefinementByQuery(llm=llm, single_call=True)
+    output_refined = rfiner.refinement(documents, query)
+
+    assert output_refined == ["market sentence", "shop"]
+
+
+def test_refinement_single_call_falls_back_on_invalid_output():
+    llm = FakeListLLM(responses=["no json here", "first", "second", "third"])
+
+    rfiner = RefinementByQuery(llm=llm, single_call=True)
+    output_refined = rfiner.refinement(documents, query)
+
+    assert output_refined == ["first", "second", "third"]
+
+
+def test_bullet_point_refinement_single_call():
+    docs = ["First sentence. Second sentence.", "Third sentence. Fourth sentence."]
+    llm = FakeListLLM(responses=["1, 2"])
+
+    rfiner = RefinementBySentence(llm=llm, single_call=True)
+    output_refined = rfiner.refinement(docs, query)
+
+    assert output_refined == ["Second sentence.", "Third sentence."]
+
+
+def test_bullet_point_refinement_single_call_falls_back_on_invalid_output():
+    docs = ["First sentence. Second sentence.", "Third sentence. Fourth sentence."]
+    llm = FakeListLLM(responses=["Sentences 1 and 2", "1", "0"])
+
+    rfiner = RefinementBySentence(llm=llm, single_call=True)
+    output_refined = rfiner.refinement(docs, query)
+
+    assert output_refined == ["Second sentence.", "Third sentence."]
+
+
+def test_async_refinement_uses_abatch():
+    llm = FakeListLLM(responses=["first", "not relevant.", "third"])
+
+    rfiner = RefinementByQuery(llm=llm)
+    output_refined = asyncio.run(rfiner.arefinement(documents, query))
+
+    assert output_refined == ["first", "third"]
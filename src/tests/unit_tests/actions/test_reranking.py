@@ -60,3 +60,18 @@ def test_default_reranker(mock_google_search, mock_embeddings):
     assert resources[0] == "1"
     assert resources[1] == "2"
     assert resources[2] == "0"
+
+
+def test_reranker_caches_document_embeddings(mock_embeddings):
+    reranker = RerankingByQuery(embeddings=mock_embeddings)
+
+    assert reranker.rerank(["0", "1", "2"], "1") == ["1", "2", "0"]
+    assert reranker.rerank(["2", "0"], "0") == ["0", "2"]
+
+    mock_embeddings.embed_documents.assert_called_once_with(["0", "1", "2"])
+
+
+def test_reranker_top_k(mock_embeddings):
+    reranker = RerankingByQuery(embeddings=mock_embeddings, top_k=2)
+
+    assert reranker.rerank(["2", "1", "0"], "0") == ["0", "2"]
@@ -6,7 +6,7 @@ from sherpa_ai.connectors.vectorstores import ConversationStore
 def test_from_texts_creates_store_and_adds_texts():
     fake_db = MagicMock()
     embedding = MagicMock()
-    embedding.embed_query.side_effect = [[0.1], [0.2]]
+    embedding.embed_documents.return_value = [[0.1], [0.2]]
 
     store = ConversationStore.from_texts(
         ["hello", "world"],
@@ -17,4 +17,34 @@ def test_from_texts_creates_store_and_adds_texts():
     )
 
     assert isinstance(store, ConversationStore)
-    assert fake_db.upsert.call_count == 2
+    fake_db.upsert.assert_called_once()
+    vectors = fake_db.upsert.call_args.kwargs["vectors"]
+    assert [vector["values"] for vector in vectors] == [[0.1], [0.2]]
+    assert [vector["metadata"] for vector in vectors] == [
+        {"a": 1, "text": "hello"},
+        {"b": 2, "text": "world"},
+    ]
+
+
+def test_add_texts_batches_embeddings_and_upserts():
+    fake_db = MagicMock()
+    embedding = MagicMock()
+    embedding.embed_documents.side_effect = lambda texts: [[0.1] for _ in texts]
+    store = ConversationStore("ns", fake_db, embedding, "text")
+
+    texts = [f"text {i}" for i in range(25)]
+    ids = store.add_texts(
+        texts, embedding_batch_size=10, upsert_batch_size=4, max_workers=3
+    )
+
+    assert len(set(ids)) == 25
+    assert embedding.embed_documents.call_count == 3
+    embedding.embed_query.assert_not_called()
+    # 10 and 10 texts are upserted in chunks of 4, 4, 2 and the last 5 in 4, 1
+    assert fake_db.upsert.call_count == 8
+    upserted = [
+        vector["metadata"]["text"]
+        for call in fake_db.upsert.call_args_list
+        for vector in call.kwargs["vectors"]
+    ]
+    assert sorted(upserted) == sorted(texts)
@@ -0,0 +1,117 @@
+import multiprocessing
+from unittest.mock import MagicMock
+
+from sherpa_ai.connectors.embedding_cache import (
+    CachedEmbeddings,
+    InMemoryEmbeddingStore,
+    LocalEmbeddingStore,
+    embedding_model_name,
+)
+
+
+def fake_embeddings():
+    embeddings = MagicMock()
+    embeddings.model = "fake-model"
+    embeddings.dimensions = None
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(text)), 1.0] for text in texts
+    ]
+    embeddings.embed_query.side_effect = lambda text: [0.0, float(len(text))]
+    return embeddings
+
+
+def test_cached_embeddings_only_embed_new_texts():
+    embeddings = fake_embeddings()
+    cached = CachedEmbeddings(embeddings, store=InMemoryEmbeddingStore())
+
+    assert cached.embed_documents(["a", "bb", "a"]) == [
+        [1.0, 1.0],
+        [2.0, 1.0],
+        [1.0, 1.0],
+    ]
+    assert cached.embed_documents(["bb", "ccc"]) == [[2.0, 1.0], [3.0, 1.0]]
+
+    assert embeddings.embed_documents.call_count == 2
+    embeddings.embed_documents.assert_any_call(["a", "bb"])
+    embeddings.embed_documents.assert_called_with(["ccc"])
+
+
+def test_cached_embeddings_keep_queries_apart_from_documents():
+    embeddings = fake_embeddings()
+    cached = CachedEmbeddings(embeddings, store=InMemoryEmbeddingStore())
+
+    assert cached.embed_documents(["hello"]) == [[5.0, 1.0]]
+    assert cached.embed_query("hello") == [0.0, 5.0]
+    assert cached.embed_query("hello") == [0.0, 5.0]
+    embeddings.embed_query.assert_called_once_with("hello")
+
+
+def test_in_memory_store_evicts_least_recently_used():
+    embeddings = fake_embeddings()
+    cached = CachedEmbeddings(embeddings, store=InMemoryEmbeddingStore(max_size=2))
+
+    cached.embed_documents(["a", "bb"])
+    # Reading "a" makes "bb" the least recently used embedding
+    cached.embed_documents(["a"])
+    cached.embed_documents(["ccc"])
+    cached.embed_documents(["a", "bb"])
+
+    embeddings.embed_documents.assert_called_with(["bb"])
+    assert len(cached.store._embeddings) == 2
+
+
+def test_local_store_persists_between_instances(tmp_path):
+    embeddings = fake_embeddings()
+    store = LocalEmbeddingStore(str(tmp_path))
+    CachedEmbeddings(embeddings, store=store).embed_documents(["a", "bb"])
+    store.close()
+
+    store = LocalEmbeddingStore(str(tmp_path))
+    cached = CachedEmbeddings(embeddings, store=store)
+    assert cached.embed_documents(["bb", "a", "ccc"]) == [
+        [2.0, 1.0],
+        [1.0, 1.0],
+        [3.0, 1.0],
+    ]
+    embeddings.embed_documents.assert_called_with(["ccc"])
+
+    # Embeddings of another model are not reused
+    other = fake_embeddings()
+    other.model = "other-model"
+    CachedEmbeddings(other, store=store).embed_documents(["a"])
+    other.embed_documents.assert_called_once_with(["a"])
+    store.close()
+
+
+def write_embeddings(path, prefix):
+    store = LocalEmbeddingStore(path)
+    for i in range(200):
+        text = f"{prefix}-{i}"
+        store.embed("fake-model", [text], lambda texts: [[float(len(texts[0])), i]])
+    store.close()
+
+
+def test_local_store_is_shared_by_processes(tmp_path):
+    processes = [
+        multiprocessing.Process(target=write_embeddings, args=(str(tmp_path), prefix))
+        for prefix in ["a", "bb", "ccc"]
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    store = LocalEmbeddingStore(str(tmp_path))
+    texts = [f"{prefix}-{i}" for prefix in ["a", "bb", "ccc"] for i in range(200)]
+    vectors = store.embed("fake-model", texts, lambda texts: [])
+    assert vectors == [[float(len(text)), float(text.split("-")[1])] for text in texts]
+    store.close()
+
+
+def test_model_name_includes_dimensions():
+    embeddings = fake_embeddings()
+    assert embedding_model_name(embeddings) == "MagicMock:fake-model"
+
+    embeddings.dimensions = 256
+    assert embedding_model_name(embeddings) == "MagicMock:fake-model;dimensions=256"
@@ -60,3 +60,76 @@ def test_from_texts_builds_a_queryable_store():
 
     assert len(results) == 1
     assert results[0].page_content == "bananas are yellow"
+
+
+class CountingEmbeddings(FakeEmbeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+def test_index_folder_only_reindexes_changed_files(tmp_path):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    (folder / "a.md").write_text("sherpa helps you climb mountains")
+    (folder / "b.md").write_text("bananas are yellow")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    embeddings = CountingEmbeddings()
+    store = LocalChromaStore(
+        collection_name="test_index_folder", embedding_function=embeddings
+    )
+    store.index_folder(str(folder), manifest_path)
+    assert sorted(embeddings.embedded) == [
+        "bananas are yellow",
+        "sherpa helps you climb mountains",
+    ]
+
+    # Nothing changed, so nothing is embedded again
+    embeddings.embedded.clear()
+    store.index_folder(str(folder), manifest_path)
+    assert embeddings.embedded == []
+
+    (folder / "a.md").write_text("sherpa guides climbers up mountains")
+    (folder / "b.md").unlink()
+    store.index_folder(str(folder), manifest_path)
+
+    assert embeddings.embedded == ["sherpa guides climbers up mountains"]
+    assert store._collection.count() == 1
+    results = store.similarity_search("sherpa guides climbers up mountains", k=1)
+    assert results[0].page_content == "sherpa guides climbers up mountains"
+
+
+def test_index_folder_keeps_files_added_before_a_failure(tmp_path):
+    folder = tmp_path / "files"
+    folder.mkdir()
+    (folder / "a.md").write_text("sherpa helps you climb mountains")
+    (folder / "b.md").write_text("bananas are yellow")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    class FailingEmbeddings(CountingEmbeddings):
+        def embed_documents(self, texts):
+            if self.embedded:
+                raise RuntimeError("embedding service unavailable")
+            return super().embed_documents(texts)
+
+    embeddings = FailingEmbeddings()
+    store = LocalChromaStore(
+        collection_name="test_index_folder_failure", embedding_function=embeddings
+    )
+    with pytest.raises(RuntimeError):
+        store.index_folder(str(folder), manifest_path)
+    assert store._collection.count() == 1
+    indexed = embeddings.embedded[0]
+
+    # Only the file that was not added is indexed again
+    embeddings = CountingEmbeddings()
+    store._embedding_function = embeddings
+    store.index_folder(str(folder), manifest_path)
+
+    assert len(embeddings.embedded) == 1
+    assert embeddings.embedded[0] != indexed
+    assert store._collection.count() == 2
@@ -1,5 +1,6 @@
 """Comprehensive tests for the cost tracking system."""
 
+import gzip
 import json
 import os
 import tempfile
@@ -683,6 +684,38 @@ class TestCostReporter:
         finally:
             os.unlink(temp_db)
 
+    def test_export_data_jsonl_gzip_with_filters(self):
+        """Test streaming a filtered export to gzipped JSON Lines."""
+        tracker, temp_db = self._create_isolated_tracker()
+        reporter = CostReporter(tracker)
+        
+        try:
+            with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=1000):
+                tracker.add_usage("user1", input_tokens=1000, output_tokens=500, model_name="gpt-4o")
+            with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=2000):
+                for _ in range(3):
+                    tracker.add_usage("user1", input_tokens=100, output_tokens=50, model_name="gpt-4o")
+                tracker.add_usage("user2", input_tokens=100, output_tokens=50, model_name="gpt-4o")
+            
+            with tempfile.NamedTemporaryFile(suffix='.jsonl.gz', delete=False) as f:
+                temp_file = f.name
+            
+            try:
+                success = reporter.export_data(
+                    temp_file, format="jsonl", user_id="user1", since=1500, chunk_size=2
+                )
+                assert success
+                
+                with gzip.open(temp_file, 'rt') as f:
+                    rows = [json.loads(line) for line in f]
+                assert len(rows) == 3
+                assert {row["user_id"] for row in rows} == {"user1"}
+                assert all(row["timestamp"] >= 1500 for row in rows)
+            finally:
+                os.unlink(temp_file)
+        finally:
+            os.unlink(temp_db)
+
     def test_export_data_invalid_format(self):
         """Test exporting data with invalid format."""
         tracker = UserUsageTracker()
@@ -717,6 +750,67 @@ class TestCostReporter:
         finally:
             os.unlink(temp_db)
 
+    def test_reports_filter_by_time_range(self):
+        """Test that the SQL-side reports honour since/until filters."""
+        tracker, temp_db = self._create_isolated_tracker()
+        reporter = CostReporter(tracker)
+        
+        try:
+            with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=1000):
+                tracker.add_usage("user1", input_tokens=1000, output_tokens=500, model_name="gpt-4o", agent_name="agent1")
+            with patch("sherpa_ai.database.user_usage_tracker.time.time", return_value=2000):
+                tracker.add_usage("user2", input_tokens=200, output_tokens=100, model_name="gpt-4o-mini", agent_name="agent2")
+            
+            top_users = reporter.get_top_users_by_cost(since=1500)
+            assert [user["user_id"] for user in top_users] == ["user2"]
+            assert top_users[0]["total_tokens"] == 300
+            assert top_users[0]["models_used"] == ["gpt-4o-mini"]
+            
+            top_agents = reporter.get_top_agents_by_cost(until=1500)
+            assert [agent["agent_name"] for agent in top_agents] == ["agent1"]
+            
+            model_stats = reporter.get_model_statistics(since=1000, until=2000)
+            assert list(model_stats) == ["gpt-4o"]
+            assert model_stats["gpt-4o"]["total_tokens"] == 1500
+            
+            stats = reporter.get_usage_metadata_statistics(since=1500)
+            assert stats["total_records"] == 1
+            assert stats["total_tokens"] == 300
+            
+            summary = tracker.get_cost_summary(until=1500)
+            assert summary["total_calls"] == 1
+            assert summary["total_tokens"] == 1500
+            assert summary["user_costs"].keys() == {"user1"}
+        finally:
+            os.unlink(temp_db)
+
+    def test_usage_metadata_statistics_sums_token_details(self):
+        """Test that token details are aggregated from their promoted columns."""
+        tracker, temp_db = self._create_isolated_tracker()
+        reporter = CostReporter(tracker)
+        
+        try:
+            usage_metadata = {
+                "input_tokens": 100,
+                "output_tokens": 50,
+                "total_tokens": 150,
+                "input_token_details": {"cache_read": 40, "audio": 5},
+                "output_token_details": {"reasoning": 20},
+            }
+            tracker.add_usage("user1", usage_metadata=usage_metadata, model_name="gpt-4o")
+            tracker.add_usage("user1", usage_metadata=usage_metadata, model_name="gpt-4o")
+            
+            stats = reporter.get_usage_metadata_statistics()
+            assert stats["total_tokens"] == 300
+            assert stats["token_details"] == {
+                "reasoning_tokens": 40,
+                "cache_creation": 0,
+                "cache_read": 80,
+                "audio_tokens": 10,
+            }
+        finally:
+            os.unlink(temp_db)
+
     def test_usage_metadata_with_missing_fields(self):
         """Test handling of usage metadata with missing fields."""
         reporter = CostReporter()
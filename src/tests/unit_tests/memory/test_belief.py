@@ -0,0 +1,145 @@
+from sherpa_ai.events import build_event
+from sherpa_ai.memory.belief import Belief
+from sherpa_ai.memory.context import PriorityTruncation, SummarizeOldestTruncation
+
+
+def test_update_skips_duplicate_events():
+    belief = Belief()
+    belief.update(build_event("task", "task1", content="do something"))
+    belief.update(build_event("task", "task1", content="do something"))
+    belief.update(build_event("task", "task1", content="do something else"))
+
+    assert len(belief.events) == 2
+
+
+def test_update_dedups_events_appended_directly():
+    belief = Belief()
+    event = build_event("result", "result1", content={"answer": 42})
+    belief.events.append(event)
+
+    belief.update(build_event("result", "result1", content={"answer": 42}))
+    assert len(belief.events) == 1
+
+    belief.events = []
+    belief.update(event)
+    assert belief.events == [event]
+
+
+def test_type_lookups_follow_internal_events():
+    belief = Belief()
+    belief.update_internal("action_start", "action1", args={"x": 1})
+    belief.update_internal("feedback", "feedback1", content="good")
+    belief.update_internal("action_start", "action2", args={})
+
+    assert [e.name for e in belief.get_by_type("action_start")] == [
+        "action1",
+        "action2",
+    ]
+    assert [e["name"] for e in belief.get_events_by_type("feedback")] == ["feedback1"]
+
+    # Events added without going through update_internal are indexed too
+    belief.internal_events.append(build_event("feedback", "feedback2", content=""))
+    assert [e["name"] for e in belief.get_events_excluding_types(["action_start"])] == [
+        "feedback1",
+        "feedback2",
+    ]
+
+    belief.clear_short_term_memory()
+    assert belief.get_by_type("action_start") == []
+
+    belief.internal_events = [build_event("action_start", "action3", args={})]
+    assert [e["name"] for e in belief.get_events_excluding_types([])] == ["action3"]
+
+
+def test_event_dumps_are_not_shared_with_callers():
+    belief = Belief()
+    belief.update_internal("action_start", "action1", args={})
+
+    belief.get_events_by_type("action_start")[0]["name"] = "changed"
+
+    assert belief.get_events_by_type("action_start")[0]["name"] == "action1"
+
+
+def test_internal_history_counts_each_event_once():
+    belief = Belief(max_tokens=6)
+    counted = []
+
+    def token_counter(text):
+        counted.append(text)
+        return len(text.split())
+
+    for i in range(10):
+        belief.update_internal("action_start", f"action{i}", args={})
+    first = belief.get_internal_history(token_counter)
+    calls = len(counted)
+
+    # Only the most recent events needed to fill the budget are visited
+    assert calls < 10
+    assert first.splitlines()[-1] == str(belief.get_events_by_type("action_start")[-1])
+
+    assert belief.get_internal_history(token_counter) == first
+    assert len(counted) == calls
+
+    belief.update_internal("action_finish", "action9", outputs="done")
+    history = belief.get_internal_history(token_counter)
+    assert len(counted) == calls + 1
+    assert "action_finish" in history.splitlines()[-1]
+
+
+def test_histories_excluding_types_matches_event_dumps():
+    belief = Belief()
+    belief.update_internal("action_start", "action1", args={})
+    belief.update_internal("feedback", "feedback1", content="good")
+    belief.update_internal("action_finish", "action1", outputs="result")
+
+    history = belief.get_histories_excluding_types(["feedback"])
+
+    assert history == "\n".join(
+        str(event) for event in belief.get_events_excluding_types(["feedback"])
+    )
+
+
+def _context_belief():
+    belief = Belief(max_tokens=5)
+    belief.update(build_event("task", "task", content="one two"))
+    belief.update(build_event("action_start", "ignored", args={}))
+    belief.update(build_event("user_input", "doc", content="three four five"))
+    belief.update(build_event("result", "result", content="six"))
+    return belief
+
+
+def test_get_context_keeps_most_recent_events():
+    belief = _context_belief()
+    counted = []
+
+    def token_counter(text):
+        counted.append(text)
+        return len(text.split())
+
+    context = belief.get_context(token_counter)
+
+    assert context == "doc: three four five(user_input)\nresult: six(result)\n"
+    assert belief.get_context(token_counter) == context
+    # Each line is counted once and the joined context is never counted
+    assert sorted(counted) == sorted(context.splitlines())
+
+
+def test_get_context_priority_truncation():
+    belief = _context_belief()
+
+    context = belief.get_context(
+        lambda text: len(text.split()), PriorityTruncation({"task": 1})
+    )
+
+    assert context == "task: one two(task)\nresult: six(result)\n"
+
+
+def test_get_context_summarize_oldest_truncation():
+    belief = _context_belief()
+
+    context = belief.get_context(
+        lambda text: len(text.split()),
+        SummarizeOldestTruncation(lambda lines: f"summary of {len(lines)} events"),
+    )
+
+    assert context.splitlines() == ["summary of 2 events", "result: six(result)"]
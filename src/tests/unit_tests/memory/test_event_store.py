@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from sherpa_ai.events import build_event
+from sherpa_ai.memory.event_store import EventStore
+from sherpa_ai.memory.shared_memory import SharedMemory
+
+
+def add_events(store, count, event_type="task", sender=""):
+    for i in range(count):
+        name = f"{event_type}_{i}"
+        store.append(build_event(event_type, name, sender=sender, content=name))
+
+
+def names(events):
+    return [event.name for event in events]
+
+
+def test_event_store_indexes_events():
+    store = EventStore()
+    store.append(build_event("task", "task_0", sender="user", content=""))
+    store.append(build_event("result", "result_0", sender="agent", content=""))
+    store.append(build_event("task", "task_1", sender="agent", content=""))
+
+    assert names(store.get_by_type("task")) == ["task_0", "task_1"]
+    assert names(store.get_by_types(["result", "task"])) == [
+        "task_0",
+        "result_0",
+        "task_1",
+    ]
+    assert names(store.get_by_sender("agent")) == ["result_0", "task_1"]
+    assert store.get_by_type("missing") == []
+    assert len(store) == 3
+    assert store[-1].name == "task_1"
+    assert names(store[:2]) == ["task_0", "result_0"]
+
+
+def test_event_store_cursor_reads_only_new_events():
+    store = EventStore()
+    add_events(store, 3)
+
+    events, cursor = store.since(0)
+    assert names(events) == ["task_0", "task_1", "task_2"]
+    assert cursor == 3
+
+    store.append(build_event("result", "result_0", content=""))
+    store.append(build_event("task", "task_3", content=""))
+    events, cursor = store.since(cursor, event_types=["task"])
+    assert names(events) == ["task_3"]
+    assert store.since(cursor) == ([], 5)
+
+
+def test_event_store_retention_by_count_and_bytes():
+    store = EventStore(max_events=3)
+    add_events(store, 5)
+
+    assert names(store) == ["task_2", "task_3", "task_4"]
+    assert (store.first_offset, store.next_offset) == (2, 5)
+    assert names(store.get_by_type("task")) == ["task_2", "task_3", "task_4"]
+    assert store.get(1) is None
+    assert store.get(2).name == "task_2"
+
+    event = build_event("task", "task_0", content="task_0")
+    store = EventStore(max_bytes=len(event.model_dump_json()) * 2)
+    add_events(store, 4)
+    assert names(store) == ["task_2", "task_3"]
+
+
+def test_event_store_retention_by_age():
+    store = EventStore(max_age=10)
+    with patch("sherpa_ai.memory.event_store.time.time", return_value=100.0):
+        add_events(store, 2)
+    with patch("sherpa_ai.memory.event_store.time.time", return_value=105.0):
+        store.append(build_event("task", "task_2", content=""))
+    with patch("sherpa_ai.memory.event_store.time.time", return_value=112.0):
+        assert names(store.get_by_type("task")) == ["task_2"]
+
+
+def test_event_store_compacts_evicted_events():
+    store = EventStore(max_events=10)
+    add_events(store, 5000)
+
+    assert names(store.get_by_type("task")) == [f"task_{i}" for i in range(4990, 5000)]
+    assert len(store._events) < 2100
+    events, cursor = store.since(4995)
+    assert names(events) == [f"task_{i}" for i in range(4995, 5000)]
+
+
+def test_event_store_spills_evicted_events(tmp_path):
+    store = EventStore(max_events=2, spill_path=str(tmp_path / "events.jsonl"))
+    add_events(store, 3)
+    store.append(build_event("trigger", "start", args={"x": 1}))
+
+    events, cursor = store.since(0)
+    assert names(events) == ["task_0", "task_1", "task_2", "start"]
+    assert events[3].args == {"x": 1}
+    assert cursor == 4
+
+    events, _ = store.since(0, event_types=["task"])
+    assert names(events) == ["task_0", "task_1", "task_2"]
+
+
+def test_shared_memory_reads_events_since_cursor():
+    memory = SharedMemory("Complete the task")
+    memory.add("task", "task_0", sender="user", content="")
+    events, cursor = memory.get_since(0)
+    memory.add("result", "result_0", sender="agent", content="")
+
+    events, cursor = memory.get_since(cursor)
+    assert names(events) == ["result_0"]
+    assert names(memory.get_by_sender("user")) == ["task_0"]
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 from sherpa_ai.agents import QAAgent
@@ -56,3 +59,106 @@ async def test_shared_memory(agents):
     assert len(agent_b.belief.internal_events) == 2
     assert agent_b.belief.internal_events[0].name == "task_1"
     assert agent_b.belief.internal_events[1].name == "task_2"
+
+
+class SlowSubscriber:
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.received = []
+
+    def ask(self, event, block=True):
+        if self.gate is not None:
+            self.gate.wait(timeout=10)
+        time.sleep(self.delay)
+        self.received.append(event.name)
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_fans_out_concurrently():
+    memory = SharedMemory("Complete the task")
+    subscribers = [SlowSubscriber(delay=0.2) for _ in range(4)]
+    for subscriber in subscribers:
+        memory.subscribe_event_type("task", subscriber)
+
+    start = time.perf_counter()
+    await memory.async_add("task", "task_1", content="Task 1", wait=True)
+    elapsed = time.perf_counter() - start
+
+    assert all(subscriber.received == ["task_1"] for subscriber in subscribers)
+    assert elapsed < 0.6
+    stats = memory.get_delivery_stats()
+    assert [s.delivered for s in stats] == [1, 1, 1, 1]
+    assert all(s.lag == 0 and s.max_latency >= 0.2 for s in stats)
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_delivers_in_order():
+    memory = SharedMemory("Complete the task")
+    subscriber = SlowSubscriber()
+    memory.subscribe_sender("agent_a", subscriber)
+
+    for i in range(20):
+        await memory.async_add("dummy", f"event_{i}", sender="agent_a", content="")
+    await memory.async_add("dummy", "last", sender="agent_a", wait=True, content="")
+
+    assert subscriber.received == [f"event_{i}" for i in range(20)] + ["last"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [
+        ("drop_newest", ["event_0", "event_1", "event_2"]),
+        ("drop_oldest", ["event_0", "event_3", "event_4"]),
+    ],
+)
+async def test_shared_memory_drops_events_when_queue_is_full(overflow, expected):
+    memory = SharedMemory(
+        "Complete the task", subscriber_capacity=2, overflow=overflow
+    )
+    gate = threading.Event()
+    subscriber = SlowSubscriber(gate=gate)
+    memory.subscribe_event_type("task", subscriber)
+
+    await memory.async_add("task", "event_0", content="")
+    # Wait until the first event is being delivered, so the next ones are queued
+    while memory.get_delivery_stats()[0].lag != 1 or len(
+        memory._channels[subscriber]._queue
+    ):
+        time.sleep(0.01)
+    for i in range(1, 5):
+        await memory.async_add("task", f"event_{i}", content="")
+
+    stats = memory.get_delivery_stats()[0]
+    assert stats.dropped == 2
+    assert stats.lag == 3
+
+    gate.set()
+    await memory.async_add("dummy", "unrelated", wait=True, content="")
+    while memory.get_delivery_stats()[0].lag:
+        time.sleep(0.01)
+    assert subscriber.received == expected
+
+
+@pytest.mark.asyncio
+async def test_shared_memory_blocks_publisher_when_queue_is_full():
+    memory = SharedMemory("Complete the task", subscriber_capacity=1)
+    subscriber = SlowSubscriber(delay=0.05)
+    memory.subscribe_event_type("task", subscriber)
+
+    for i in range(5):
+        await memory.async_add("task", f"event_{i}", content="")
+        assert memory.get_delivery_stats()[0].lag <= 2
+    await memory.async_add("task", "last", wait=True, content="")
+
+    assert subscriber.received == [f"event_{i}" for i in range(5)] + ["last"]
+    assert memory.get_delivery_stats()[0].dropped == 0
+
+
+def test_shared_memory_retains_latest_events():
+    memory = SharedMemory("Complete the task", max_events=3)
+    for i in range(5):
+        memory.add("task", f"task_{i}", content="")
+
+    assert [event.name for event in memory.events] == ["task_2", "task_3", "task_4"]
@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock, patch
+
+from langchain_core.documents import Document
+
+from sherpa_ai.memory.belief import Belief
+from sherpa_ai.memory.shared_memory_with_vectordb import SharedMemoryWithVectorDB
+
+
+def make_memory(results):
+    vector_storage = MagicMock()
+    vector_storage.similarity_search.side_effect = lambda query, **kwargs: [
+        Document(page_content=chunk) for chunk in results[query]
+    ]
+    memory = SharedMemoryWithVectorDB(
+        "Complete the task", "session", vectorStorage=vector_storage
+    )
+    return memory, vector_storage
+
+
+def contents(events, event_type):
+    return [event.content for event in events if event.event_type == event_type]
+
+
+def test_observe_searches_once_per_task():
+    memory, vector_storage = make_memory(
+        {"task 1": ["chunk a", "chunk b", "chunk a"], "task 2": ["chunk b", "chunk c"]}
+    )
+    memory.add("task", "planner", content="task 1")
+    belief = Belief()
+
+    memory.observe(belief)
+    memory.observe(belief)
+
+    assert vector_storage.similarity_search.call_count == 1
+    assert contents(memory.events, "user_input") == ["chunk a", "chunk b"]
+    assert contents(belief.events, "user_input") == ["chunk a", "chunk b"]
+    assert belief.current_task.content == "task 1"
+
+    memory.add("task", "planner", content="task 2")
+    memory.observe(belief)
+
+    assert vector_storage.similarity_search.call_count == 2
+    assert contents(memory.events, "user_input") == ["chunk a", "chunk b", "chunk c"]
+    assert contents(belief.events, "task") == ["task 1", "task 2"]
+    assert belief.current_task.content == "task 2"
+
+
+def test_observe_only_forwards_new_events():
+    memory, _ = make_memory({"task 1": ["chunk a"]})
+    memory.add("task", "planner", content="task 1")
+    belief = Belief()
+    memory.observe(belief)
+
+    memory.add("result", "agent", content="result 1")
+    with patch.object(Belief, "update") as update:
+        memory.observe(belief)
+
+    assert [call.args[0].content for call in update.call_args_list] == ["result 1"]
+
+    # Another belief observes all the events
+    other_belief = Belief()
+    memory.observe(other_belief)
+    assert contents(other_belief.events, "result") == ["result 1"]
+    assert contents(other_belief.events, "user_input") == ["chunk a"]
@@ -62,17 +62,18 @@ def test_sherpa_base_chat_model_tracks_usage_for_user():
     model = FakeSherpaChatModel(responses=["tracked answer"], user_id="user-42")
 
     with mock.patch(
-        "sherpa_ai.models.sherpa_base_chat_model.UserUsageTracker"
+        "sherpa_ai.models.sherpa_base_chat_model.get_usage_tracker"
     ) as mock_tracker:
         result = model.invoke([HumanMessage(content="question")])
 
     assert result.content == "tracked answer"
-    # Usage must be recorded exactly once for the user and the DB closed
+    # Usage must be recorded exactly once for the user, queued on the shared
+    # tracker without a blocking limit check
     mock_tracker.return_value.add_usage.assert_called_once()
     assert (
         mock_tracker.return_value.add_usage.call_args.kwargs["user_id"] == "user-42"
     )
-    mock_tracker.return_value.close_connection.assert_called_once()
+    assert mock_tracker.return_value.add_usage.call_args.kwargs["check_limits"] is False
 
 
 def test_sherpa_base_chat_model_tracks_usage_from_populated_metadata():
@@ -97,7 +98,7 @@ def test_sherpa_base_chat_model_tracks_usage_from_populated_metadata():
         "langchain_core.language_models.fake_chat_models.FakeListChatModel._generate",
         return_value=canned,
     ), mock.patch(
-        "sherpa_ai.models.sherpa_base_chat_model.UserUsageTracker"
+        "sherpa_ai.models.sherpa_base_chat_model.get_usage_tracker"
     ) as mock_tracker:
         model.invoke([HumanMessage(content="question")])
 
@@ -146,7 +147,7 @@ def test_sherpa_chat_openai_generate_tracks_usage():
         "sherpa_ai.models.sherpa_base_chat_model.ChatOpenAI._generate",
         return_value=canned,
     ), mock.patch(
-        "sherpa_ai.models.sherpa_base_chat_model.UserUsageTracker"
+        "sherpa_ai.models.sherpa_base_chat_model.get_usage_tracker"
     ) as mock_tracker:
         result = model._generate([HumanMessage(content="question")])
 
@@ -157,3 +158,68 @@ def test_sherpa_chat_openai_generate_tracks_usage():
         mock_tracker.return_value.add_usage.call_args.kwargs["model_name"]
         == "gpt-4o-mini"
     )
+
+
+@pytest.mark.asyncio
+async def test_chat_model_with_logging_agenerates_and_logs():
+    inner = FakeListChatModel(responses=["async logged response"])
+    records = []
+    handler_id = loguru_logger.add(
+        lambda message: records.append(message), format="{message}", level="INFO"
+    )
+    try:
+        model = ChatModelWithLogging(llm=inner, logger=loguru_logger)
+        result = await model.ainvoke([HumanMessage(content="hello")])
+    finally:
+        loguru_logger.remove(handler_id)
+
+    assert result.content == "async logged response"
+    assert len(records) == 1
+    assert json.loads(str(records[0]))["output"] == "async logged response"
+
+
+@pytest.mark.asyncio
+async def test_sherpa_base_chat_model_async_tracks_usage_once():
+    # FakeListChatModel has no native async path and falls back to running
+    # _generate in an executor; usage must still be recorded exactly once.
+    model = FakeSherpaChatModel(responses=["async answer"], user_id="user-42")
+
+    with mock.patch(
+        "sherpa_ai.models.sherpa_base_chat_model.get_usage_tracker"
+    ) as mock_tracker:
+        result = await model.ainvoke([HumanMessage(content="question")])
+
+    assert result.content == "async answer"
+    mock_tracker.return_value.add_usage.assert_called_once()
+    assert (
+        mock_tracker.return_value.add_usage.call_args.kwargs["user_id"] == "user-42"
+    )
+
+
+@pytest.mark.asyncio
+async def test_sherpa_chat_openai_agenerate_tracks_usage():
+    model = SherpaChatOpenAI(
+        model_name="gpt-4o-mini",
+        temperature=0,
+        openai_api_key="dummy",
+        user_id="user-7",
+    )
+
+    canned = ChatResult(
+        generations=[ChatGeneration(message=AIMessage(content="openai answer"))]
+    )
+
+    with mock.patch(
+        "sherpa_ai.models.sherpa_base_chat_model.ChatOpenAI._agenerate",
+        new=mock.AsyncMock(return_value=canned),
+    ), mock.patch(
+        "sherpa_ai.models.sherpa_base_chat_model.get_usage_tracker"
+    ) as mock_tracker:
+        result = await model._agenerate([HumanMessage(content="question")])
+
+    assert result.generations[0].message.content == "openai answer"
+    mock_tracker.return_value.add_usage.assert_called_once()
+    assert (
+        mock_tracker.return_value.add_usage.call_args.kwargs["model_name"]
+        == "gpt-4o-mini"
+    )
@@ -6,7 +6,10 @@ from pytest import mark
 from sherpa_ai.actions.base import ActionResource
 from sherpa_ai.agents import QAAgent
 from sherpa_ai.memory import SharedMemory
-from sherpa_ai.output_parsers.citation_validation import CitationValidation
+from sherpa_ai.output_parsers.citation_validation import (
+    CitationValidation,
+    ResourceLineIndex,
+)
 from sherpa_ai.test_utils.llms import get_llm  # noqa: F401
 
 
@@ -28,9 +31,76 @@ def test_citation_validation():
     assert data_1.source in result.result
 
 
-@mark.skip("Placeholder for test we should implement")
+def test_longest_common_subsequence():
+    module = CitationValidation()
+    assert module.longest_common_subsequence("hello world", "hello there") == 7
+    assert module.longest_common_subsequence("ABCBDAB", "BDCABA") == 4
+    assert module.longest_common_subsequence("abc", "") == 0
+    assert module.longest_common_subsequence("same text", "same text") == 9
+
+
 def test_citation_succeeds_for_longest_common_subsequence():
-    pass
+    # Word tokens differ too much for the Jaccard index, but characters line up
+    resource = ActionResource(
+        source="www.wiki_1.com",
+        content="Biden moved with his family to Delaware in 1953",
+    )
+    module = CitationValidation(jaccard_threshold=1.0)
+    ids, links = module.add_citation_to_sentence(
+        "Biden moved w/ his famly to Delawre in 1953.", [resource]
+    )
+    assert ids == [1]
+    assert links == ["www.wiki_1.com"]
+
+
+def test_citation_only_compares_candidate_lines():
+    resources = [
+        ActionResource(
+            source=f"www.source_{i}.com",
+            content=f"Filler sentence number {i} about nothing in particular",
+        )
+        for i in range(50)
+    ]
+    resources.insert(
+        30,
+        ActionResource(
+            source="www.wiki_1.com",
+            content="Biden moved with his family to Delaware in 1953",
+        ),
+    )
+    module = CitationValidation(max_candidates=3)
+
+    with mock.patch.object(
+        CitationValidation, "is_match", autospec=True, side_effect=CitationValidation.is_match
+    ) as is_match:
+        ids, links = module.add_citation_to_sentence(
+            "Biden moved with his family to Delaware in 1953.", resources
+        )
+
+    assert ids == [31]
+    assert links == ["www.wiki_1.com"]
+    assert is_match.call_count <= 3
+
+
+def test_short_matching_line_is_a_candidate_among_long_lines():
+    # Long lines share more n-grams with the sentence than the short line does
+    noise = " ".join(
+        f"the cattle sat beside the mattress on day {i} while a cat ran to the "
+        "matador today"
+        for i in range(5)
+    )
+    resources = [
+        ActionResource(source=f"www.noise_{i}.com", content=noise) for i in range(25)
+    ]
+    resources.append(
+        ActionResource(source="www.cat.com", content="the cat sat on the mat")
+    )
+
+    index = ResourceLineIndex(resources)
+    candidates = index.candidates("the cat sat on the mat today", 20)
+
+    assert len(candidates) == 20
+    assert (25, "the cat sat on the mat") in candidates
 
 
 @mark.skip("Placeholder for test we should implement")
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models import FakeListLLM
+
+from sherpa_ai.actions.base import AsyncBaseAction
+from sherpa_ai.agents.base import BaseAgent
+from sherpa_ai.config.task_result import TaskResult
+from sherpa_ai.events import build_event
+from sherpa_ai.memory import Belief
+from sherpa_ai.policies.base import BasePolicy
+from sherpa_ai.policies.react_policy import ReactPolicy
+from sherpa_ai.runtime import AsyncioRuntime
+
+handled = []
+
+
+class RecordingAction(AsyncBaseAction):
+    name: str = "recording_action"
+    args: list = []
+    usage: str = "Record the content of the last event"
+
+    async def execute(self, **kwargs):
+        # The last internal event is the start of this action, not the message
+        messages = [
+            event
+            for event in self.belief.internal_events
+            if event.event_type == "message"
+        ]
+        content = messages[-1].content
+        # Yield to the loop so that other agents can interleave
+        await asyncio.sleep(0)
+        handled.append(content)
+        return content
+
+
+class MockPolicy(BasePolicy):
+    def select_action(self, belief):
+        return type(
+            "obj", (object,), {"action": RecordingAction(belief=belief), "args": {}}
+        )
+
+    async def async_select_action(self, belief):
+        return self.select_action(belief)
+
+
+class MockAgent(BaseAgent):
+    name: str = "mock_agent"
+    description: str = "A mock agent for testing"
+
+    def create_actions(self):
+        return [RecordingAction(belief=self.belief)]
+
+    def synthesize_output(self):
+        return self.belief.get("recording_action")
+
+    async def async_handle_event(self, event):
+        if event.content == "fail":
+            raise ValueError("failed")
+        await super().async_handle_event(event)
+
+
+def make_agent(name="mock_agent"):
+    return MockAgent(name=name, belief=Belief(), policy=MockPolicy())
+
+
+class SlowLLM(FakeListLLM):
+    delay: float = 0.0
+
+    async def _acall(self, *args, **kwargs):
+        await asyncio.sleep(self.delay)
+        return await super()._acall(*args, **kwargs)
+
+    def get_num_tokens(self, text):
+        return len(text.split())
+
+
+class ReactAgent(MockAgent):
+    def create_actions(self):
+        return [
+            RecordingAction(belief=self.belief),
+            RecordingAction(name="other_action", belief=self.belief),
+        ]
+
+    async def async_handle_event(self, event):
+        self.belief.set_current_task(event.content)
+        await super().async_handle_event(event)
+
+
+def make_react_agent(name, delay):
+    llm = SlowLLM(
+        responses=['{"command": {"name": "recording_action", "args": {}}}'],
+        delay=delay,
+    )
+    policy = ReactPolicy(role_description="", output_instruction="", llm=llm)
+    return ReactAgent(name=name, belief=Belief(), policy=policy)
+
+
+@pytest.fixture()
+def runtime():
+    handled.clear()
+    runtime = AsyncioRuntime(mailbox_size=2)
+    yield runtime
+    runtime.stop()
+
+
+def test_sending_event(runtime):
+    agent_task = runtime.spawn(make_agent())
+    event = build_event("message", "input_message", content="test input message")
+    result = agent_task.ask(event, block=False).get(timeout=10)
+
+    assert isinstance(result, TaskResult)
+    assert result.status == "success"
+    assert result.content == "test input message"
+
+
+def test_events_are_handled_in_order(runtime):
+    agent_task = runtime.spawn(make_agent())
+    for i in range(10):
+        agent_task.tell(build_event("message", "input_message", content=str(i)))
+    agent_task.stop().get(timeout=10)
+
+    assert handled == [str(i) for i in range(10)]
+
+
+def test_agent_errors_are_raised_to_sender(runtime):
+    agent_task = runtime.spawn(make_agent())
+    with pytest.raises(ValueError):
+        agent_task.ask(build_event("message", "input_message", content="fail"))
+
+    # The agent keeps handling events after an error
+    result = agent_task.ask(build_event("message", "input_message", content="ok"))
+    assert result.content == "ok"
+
+
+@pytest.mark.asyncio
+async def test_many_agents_on_running_loop():
+    handled.clear()
+    runtime = AsyncioRuntime(loop=asyncio.get_running_loop(), mailbox_size=1)
+    agent_tasks = [runtime.spawn(make_agent(f"agent_{i}")) for i in range(200)]
+
+    results = await asyncio.gather(
+        *(
+            agent_task.async_ask(
+                build_event("message", "input_message", content=f"message_{i}")
+            )
+            for i, agent_task in enumerate(agent_tasks)
+        )
+    )
+    await runtime.async_stop()
+
+    assert [result.content for result in results] == [
+        f"message_{i}" for i in range(200)
+    ]
+    assert sorted(handled) == sorted(f"message_{i}" for i in range(200))
+    with pytest.raises(RuntimeError):
+        agent_tasks[0].ask(build_event("message", "input_message", content="late"))
+
+
+def test_slow_llm_call_does_not_delay_other_agents(runtime):
+    slow_task = runtime.spawn(make_react_agent("slow_agent", delay=2))
+    fast_task = runtime.spawn(make_react_agent("fast_agent", delay=0))
+
+    slow_future = slow_task.ask(
+        build_event("message", "input_message", content="slow"), block=False
+    )
+    fast_result = fast_task.ask(
+        build_event("message", "input_message", content="fast"), block=False
+    ).get(timeout=1)
+
+    assert fast_result.content == "fast"
+    assert not slow_future.done()
+    assert slow_future.get(timeout=10).content == "slow"
@@ -0,0 +1,128 @@
+import os
+import time
+
+import pytest
+
+from sherpa_ai.actions.base import AsyncBaseAction
+from sherpa_ai.agents.base import BaseAgent
+from sherpa_ai.config.task_result import TaskResult
+from sherpa_ai.events import GenericEvent, build_event, dump_event, load_event
+from sherpa_ai.memory import Belief, SharedMemory
+from sherpa_ai.policies.base import BasePolicy
+from sherpa_ai.runtime import ProcessRuntime
+
+
+class PidAction(AsyncBaseAction):
+    name: str = "pid_action"
+    args: list = []
+    usage: str = "Report the content of the last event and the process id"
+
+    async def execute(self, **kwargs):
+        # The last internal event is the start of this action, not the one
+        # that triggered the run
+        received = [
+            event
+            for event in self.belief.internal_events
+            if isinstance(event, GenericEvent)
+        ]
+        content = received[-1].content
+        if content == "fail":
+            raise ValueError("failed")
+        return f"{content}:{os.getpid()}"
+
+
+class MockPolicy(BasePolicy):
+    def select_action(self, belief):
+        return type("obj", (object,), {"action": PidAction(belief=belief), "args": {}})
+
+    async def async_select_action(self, belief):
+        return self.select_action(belief)
+
+
+class MockAgent(BaseAgent):
+    name: str = "mock_agent"
+    description: str = "A mock agent for testing"
+
+    def create_actions(self):
+        return [PidAction(belief=self.belief)]
+
+    def synthesize_output(self):
+        return self.belief.get("pid_action")
+
+
+def make_agent():
+    return MockAgent(belief=Belief(), policy=MockPolicy())
+
+
+@pytest.fixture()
+def runtime():
+    runtime = ProcessRuntime(max_workers=2)
+    yield runtime
+    runtime.stop(timeout=10)
+
+
+def test_event_serialization_round_trip():
+    events = [
+        build_event("message", "question", sender="user", content={"text": "Hi"}),
+        build_event("trigger", "start", args={"x": 1}),
+        build_event("action_start", "search", args={"query": "q"}),
+        build_event("action_finish", "search", outputs=[1, 2]),
+    ]
+
+    for event in events:
+        assert load_event(dump_event(event)) == event
+
+
+def test_agents_run_in_worker_processes(runtime):
+    agent_processes = [runtime.spawn(make_agent) for _ in range(4)]
+    futures = [
+        agent_process.ask(
+            build_event("message", "input_message", content=str(i)), block=False
+        )
+        for i, agent_process in enumerate(agent_processes)
+    ]
+    results = [future.get(timeout=30) for future in futures]
+
+    assert all(isinstance(result, TaskResult) for result in results)
+    contents = [result.content.split(":") for result in results]
+    assert [content for content, _ in contents] == ["0", "1", "2", "3"]
+    pids = {pid for _, pid in contents}
+    assert len(pids) == 2
+    assert str(os.getpid()) not in pids
+
+
+def test_agent_errors_are_raised_to_sender(runtime):
+    agent_process = runtime.spawn(make_agent)
+
+    with pytest.raises(Exception, match="failed"):
+        agent_process.ask(build_event("message", "input_message", content="fail"))
+
+
+def test_calls_fail_when_worker_dies(runtime):
+    agent_process = runtime.spawn(make_agent)
+    process = runtime._processes[agent_process.worker]
+    process.terminate()
+    process.join(timeout=10)
+
+    with pytest.raises(RuntimeError, match="died"):
+        agent_process.ask(
+            build_event("message", "input_message", content="hi"), timeout=30
+        )
+    with pytest.raises(RuntimeError, match="died"):
+        agent_process.ask(build_event("message", "input_message", content="hi"))
+
+
+def test_shared_memory_subscriptions_work_across_processes(runtime):
+    shared_memory = SharedMemory("objective")
+    agent_process = runtime.spawn(make_agent, shared_memory=shared_memory)
+    shared_memory.subscribe_event_type("task", agent_process)
+
+    shared_memory.add("task", "input_message", content="hi")
+
+    deadline = time.monotonic() + 30
+    while not shared_memory.get_by_type("result") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    result_events = shared_memory.get_by_type("result")
+    assert len(result_events) == 1
+    assert result_events[0].name == "mock_agent"
+    assert result_events[0].content.startswith("hi:")
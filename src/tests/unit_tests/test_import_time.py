@@ -0,0 +1,119 @@
+"""Guards against network, disk and heavy work creeping back into import time."""
+
+import json
+import os
+import subprocess
+import sys
+
+
+def imported_modules(statement: str, tmp_path) -> dict:
+    """Run an import statement in a fresh interpreter and report what it loaded."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'modules': sorted(sys.modules), 'seconds': elapsed}))\n"
+    )
+    env = {**os.environ, "NLTK_DATA": str(tmp_path / "nltk_data")}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_sherpa_ai_is_lightweight(tmp_path):
+    result = imported_modules("import sherpa_ai", tmp_path)
+
+    assert "sherpa_ai.config.settings" not in result["modules"]
+    assert "nltk" not in result["modules"]
+    assert "dotenv" not in result["modules"]
+
+
+def test_import_config_does_not_load_settings(tmp_path):
+    (tmp_path / ".env").write_text("LOG_LEVEL=DEBUG\n")
+    result = imported_modules(
+        "import sherpa_ai.config\n"
+        "from loguru import logger\n"
+        "assert 0 in logger._core.handlers",
+        tmp_path,
+    )
+
+    assert "sherpa_ai.config.settings" not in result["modules"]
+
+
+def test_settings_are_loaded_on_first_access(tmp_path):
+    (tmp_path / ".env").write_text("LOG_LEVEL=DEBUG\n")
+    imported_modules(
+        "import sherpa_ai.config as cfg\nassert cfg.LOG_LEVEL == 'DEBUG'",
+        tmp_path,
+    )
+
+
+def test_log_level_is_applied_when_settings_load(tmp_path):
+    (tmp_path / ".env").write_text("LOG_LEVEL=WARNING\n")
+    imported_modules(
+        "import sherpa_ai.config as cfg\n"
+        "from loguru import logger\n"
+        "cfg.load_settings()\n"
+        "assert 0 not in logger._core.handlers\n"
+        "levels = [h.levelno for h in logger._core.handlers.values()]\n"
+        "assert levels == [logger.level('WARNING').no]",
+        tmp_path,
+    )
+
+
+def test_citation_validation_import_does_not_download(tmp_path):
+    imported_modules(
+        "import sherpa_ai.output_parsers.citation_validation", tmp_path
+    )
+
+    assert not (tmp_path / "nltk_data").exists()
+
+
+def test_vector_store_imports_defer_heavy_dependencies(tmp_path):
+    result = imported_modules(
+        "import sherpa_ai.connectors.chroma_vector_store\n"
+        "import sherpa_ai.connectors.vectorstores",
+        tmp_path,
+    )
+
+    assert "chromadb" not in result["modules"]
+    assert "langchain_openai" not in result["modules"]
+    assert "pinecone" not in result["modules"]
+    assert "sherpa_ai.config.settings" not in result["modules"]
+
+
+def test_package_imports_defer_submodules(tmp_path):
+    result = imported_modules(
+        "import sherpa_ai.actions\n"
+        "import sherpa_ai.agents\n"
+        "import sherpa_ai.memory\n"
+        "import sherpa_ai.output_parsers\n"
+        "from sherpa_ai.actions.base import BaseAction",
+        tmp_path,
+    )
+
+    assert "sherpa_ai.actions.arxiv_search" not in result["modules"]
+    assert "sherpa_ai.actions.google_search" not in result["modules"]
+    assert "sherpa_ai.agents.qa_agent" not in result["modules"]
+    assert "sherpa_ai.output_parsers.citation_validation" not in result["modules"]
+    assert "langchain_openai" not in result["modules"]
+    assert "nltk" not in result["modules"]
+
+
+def test_package_exports_load_on_access(tmp_path):
+    imported_modules(
+        "import sherpa_ai.memory as memory\n"
+        "from sherpa_ai.memory.shared_memory import SharedMemory\n"
+        "assert 'SharedMemory' in dir(memory)\n"
+        "assert memory.SharedMemory is SharedMemory\n"
+        "from sherpa_ai.output_parsers import *\n"
+        "assert LinkParser.__module__ == 'sherpa_ai.output_parsers.link_parse'",
+        tmp_path,
+    )
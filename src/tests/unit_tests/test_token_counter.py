@@ -0,0 +1,74 @@
+from unittest.mock import Mock, patch
+
+from langchain_core.language_models import FakeListLLM
+
+from sherpa_ai.token_counter import (
+    TokenCounter,
+    get_encoding,
+    get_llm_token_counter,
+    get_token_counter,
+)
+from sherpa_ai.utils import count_string_tokens
+
+
+def test_token_counter_caches_recent_results():
+    count_fn = Mock(side_effect=lambda text: len(text.split()))
+    counter = TokenCounter(count_fn, cache_size=2)
+
+    assert counter("one two") == 2
+    assert counter("one two") == 2
+    assert count_fn.call_count == 1
+
+    counter("three")
+    counter("four five")
+    # "one two" was the least recently used result and has been evicted
+    assert counter("one two") == 2
+    assert count_fn.call_count == 4
+
+
+def test_count_many_batches_uncached_texts():
+    count_batch_fn = Mock(side_effect=lambda texts: [len(t.split()) for t in texts])
+    counter = TokenCounter(Mock(side_effect=AssertionError), count_batch_fn)
+
+    assert counter.count_many(["a b", "c", "a b"]) == [2, 1, 2]
+    count_batch_fn.assert_called_once_with(["a b", "c"])
+
+    assert counter.count_many(["c", "d e f"]) == [1, 3]
+    count_batch_fn.assert_called_with(["d e f"])
+    assert counter("a b") == 2
+
+
+def test_count_string_tokens_loads_encoding_once():
+    encoding = Mock()
+    encoding.encode.side_effect = lambda text: text.split()
+    get_encoding.cache_clear()
+    get_token_counter.cache_clear()
+    try:
+        with patch(
+            "sherpa_ai.token_counter.tiktoken.get_encoding", return_value=encoding
+        ) as mock_get_encoding:
+            assert count_string_tokens("a b c", "gpt-3.5-turbo") == 3
+            assert count_string_tokens("a b c d", "gpt-3.5-turbo") == 4
+            assert count_string_tokens("a b", "not-an-openai-model") == 2
+
+        assert mock_get_encoding.call_count == 2
+        mock_get_encoding.assert_called_with("cl100k_base")
+    finally:
+        get_encoding.cache_clear()
+        get_token_counter.cache_clear()
+
+
+def test_llm_token_counter_is_shared_per_model():
+    llm = FakeListLLM(responses=[])
+
+    with patch.object(FakeListLLM, "get_num_tokens", return_value=7) as get_num_tokens:
+        counter = get_llm_token_counter(llm)
+        assert get_llm_token_counter(llm) is counter
+        assert counter("some text") == 7
+        assert counter("some text") == 7
+        get_num_tokens.assert_called_once_with("some text")
+
+    assert get_llm_token_counter(FakeListLLM(responses=[])) is not counter
+    assert get_llm_token_counter(Mock(model_name="gpt-4o")) is get_token_counter(
+        "gpt-4o"
+    )
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import Mock, patch
 
 import pytest
@@ -10,6 +11,7 @@ from sherpa_ai.utils import (
     assert_safe_url,
     check_if_number_exist,
     check_url,
+    async_chunk_and_summarize,
     chunk_and_summarize,
     chunk_and_summarize_file,
     combined_number_extractor,
@@ -18,6 +20,7 @@ from sherpa_ai.utils import (
     extract_word_numbers,
     get_base_url,
     get_links_from_string,
+    iter_load_files,
     json_from_text,
     load_files,
     log_formatter,
@@ -26,6 +29,7 @@ from sherpa_ai.utils import (
     scrape_with_url,
     show_commands_only,
     string_comparison_with_jaccard_and_levenshtein,
+    summarize_chunks,
     text_similarity,
     text_similarity_by_metrics,
     verify_numbers_against_source,
@@ -138,6 +142,46 @@ def test_load_files_strips_markdown_syntax(tmp_path):
     assert documents[0].metadata == {"source": str(md_file)}
 
 
+def test_load_files_in_parallel_keeps_file_order(tmp_path):
+    files = []
+    for i in range(4):
+        md_file = tmp_path / f"doc{i}.md"
+        md_file.write_text(f"# Title {i}\n")
+        files.append(str(md_file))
+
+    documents = load_files(files, max_workers=2)
+
+    assert [document.metadata["source"] for document in documents] == files
+    assert [document.page_content for document in documents] == [
+        f"Title {i}\n" for i in range(4)
+    ]
+
+
+def test_load_files_loads_few_files_without_a_process_pool(tmp_path):
+    files = []
+    for i in range(2):
+        md_file = tmp_path / f"doc{i}.md"
+        md_file.write_text(f"# Title {i}\n")
+        files.append(str(md_file))
+
+    with patch("sherpa_ai.utils.ProcessPoolExecutor") as mock_executor:
+        documents = load_files(files)
+
+    mock_executor.assert_not_called()
+    assert [document.page_content for document in documents] == [
+        "Title 0\n",
+        "Title 1\n",
+    ]
+
+
+def test_iter_load_files_rejects_unsupported_files_before_loading(tmp_path):
+    md_file = tmp_path / "doc.md"
+    md_file.write_text("text")
+
+    with pytest.raises(NotImplementedError):
+        next(iter_load_files([str(md_file), str(tmp_path / "data.csv")]))
+
+
 def test_get_links_from_string_succeeds():
     text_with_link = "this is the link for ui/ux <https://ui8.net/artpaperdsgn/products/e-commerce-shopping-and-marketing-3d> , <http://codepen.io/trending> "
     return_data = get_links_from_string(text_with_link)
@@ -898,3 +942,80 @@ def test_chunk_and_summarize_file_with_chat_llm():
     )
     assert isinstance(result, str)
     assert result == "file summary"
+
+
+def test_chunk_and_summarize_keeps_chunk_order():
+    chunks = ["first chunk", "second chunk", "third chunk"]
+    llm = Mock()
+    llm.batch.side_effect = lambda prompts, config: [
+        f"summary {i}" for i, _ in enumerate(prompts)
+    ]
+    with patch("sherpa_ai.utils._split_summary_chunks", return_value=chunks):
+        result = chunk_and_summarize(
+            text_data="long text",
+            question="What is it?",
+            link="https://example.com",
+            llm=llm,
+            max_concurrency=2,
+        )
+
+    assert result == "summary 0 summary 1 summary 2"
+    prompts, = llm.batch.call_args.args
+    assert [chunk in prompt for chunk, prompt in zip(chunks, prompts)] == [True] * 3
+    assert llm.batch.call_args.kwargs["config"] == {"max_concurrency": 2}
+
+
+def test_chunk_and_summarize_reduces_until_within_budget():
+    llm = FakeListLLM(responses=["a long summary " * 20, "short summary"])
+    result = chunk_and_summarize(
+        text_data="Some short text about the weather.",
+        question="What is the weather?",
+        link="https://example.com",
+        llm=llm,
+        max_summary_tokens=10,
+    )
+    assert result == "short summary"
+
+
+def test_summarize_chunks_stops_after_max_rounds():
+    llm = Mock()
+    llm.batch.side_effect = lambda prompts, config: ["still too long"]
+    with patch("sherpa_ai.utils._split_summary_chunks", return_value=["text"]), patch(
+        "sherpa_ai.utils._needs_reduce", return_value=True
+    ):
+        result = summarize_chunks(
+            "long text", "focus on the weather", llm, max_summary_tokens=1, max_rounds=2
+        )
+
+    assert result == "still too long"
+    assert llm.batch.call_count == 2
+
+
+def test_async_chunk_and_summarize_bounds_concurrency():
+    chunks = [f"chunk {i}" for i in range(6)]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def ainvoke(prompt):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return next(chunk for chunk in chunks if chunk in prompt)
+
+    llm = Mock()
+    llm.ainvoke = ainvoke
+    with patch("sherpa_ai.utils._split_summary_chunks", return_value=chunks):
+        result = asyncio.run(
+            async_chunk_and_summarize(
+                text_data="long text",
+                question="What is it?",
+                link="https://example.com",
+                llm=llm,
+                max_concurrency=2,
+            )
+        )
+
+    assert result == " ".join(chunks)
+    assert max_in_flight == 2